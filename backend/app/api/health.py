@@ -1,12 +1,22 @@
 """Health check endpoints."""
 
+import logging
+from typing import Awaitable, Callable, List
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-import redis.asyncio as aioredis
 
+from app.core.circuit_breaker import circuit_breaker
 from app.core.database import get_db
 from app.core.config import settings
+from app.core.http_client import PROVIDER_DEFAULTS
+from app.core.redis import get_redis
+from app.core.speed_to_lead import speed_to_lead
+from app.services.webhook_queue import webhook_queue
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -16,7 +26,7 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     """
     Health check endpoint.
 
-    Checks database and Redis connectivity.
+    Checks database and Redis connectivity and provider circuit breakers.
     Returns status of all dependencies.
     """
     status = {
@@ -25,6 +35,7 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "environment": settings.environment,
         "database": "unknown",
         "redis": "unknown",
+        "providers": {},
     }
 
     # Check database
@@ -38,21 +49,69 @@ async def health_check(db: AsyncSession = Depends(get_db)):
 
     # Check Redis
     try:
-        redis_client = aioredis.from_url(
-            settings.redis_url_str,
-            encoding="utf-8",
-            decode_responses=True
-        )
-        await redis_client.ping()
-        await redis_client.close()
+        await get_redis().ping()
         status["redis"] = "connected"
     except Exception as e:
         status["redis"] = f"error: {str(e)}"
         status["status"] = "degraded"  # Redis is not critical for basic operation
 
+    # Check provider circuit breakers (sends are deferred while open)
+    try:
+        status["providers"] = await circuit_breaker.get_states(PROVIDER_DEFAULTS)
+        if status["status"] == "healthy" and any(
+            provider["state"] != "closed" for provider in status["providers"].values()
+        ):
+            status["status"] = "degraded"
+    except Exception as e:
+        status["providers"] = f"error: {str(e)}"
+
     return status
 
 
+@router.get("/health/providers")
+async def providers_health():
+    """
+    Circuit breaker state of channel providers.
+
+    A provider is "open" while its sends fail fast and are deferred,
+    "half_open" while a probe call decides whether it recovered.
+    """
+    return await circuit_breaker.get_states(PROVIDER_DEFAULTS)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics.
+
+    Time-to-first-contact histogram per channel, recent p95 against the
+    first contact SLO, bulk tasks deferred while it is breached, and the
+    webhook queue backlog and dead letters. A section that cannot be read
+    (Redis unavailable) is left out and its ``*_up`` gauge is 0.
+    """
+    lines = await _render_section("speed_to_lead", speed_to_lead.render_metrics)
+    lines += await _render_section("webhook_queue", webhook_queue.render_metrics)
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+
+async def _render_section(section: str, render: Callable[[], Awaitable[List[str]]]) -> List[str]:
+    """Render a metrics section followed by its ``fast_lead_<section>_up`` gauge."""
+    try:
+        lines = await render()
+        up = 1
+    except Exception as e:
+        logger.warning(f"Failed to render {section} metrics: {e}")
+        lines = []
+        up = 0
+
+    name = f"fast_lead_{section}_up"
+    return lines + [
+        f"# HELP {name} 1 if the {section} metrics could be read.",
+        f"# TYPE {name} gauge",
+        f"{name} {up}",
+    ]
+
+
 @router.get("/health/live")
 async def liveness():
     """
@@ -1,41 +1,92 @@
 """Booking API endpoints - Appointment booking via Cal.com."""
 
+import json
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.lead import Lead, LeadStatus
 from app.schemas.booking import (
     CreateBookingRequest,
     BookingResponse,
+    BookingRequestStatus,
     CancelBookingRequest,
     RescheduleBookingRequest,
     AvailabilityRequest,
     AvailabilitySlot,
 )
-from app.services.calcom_service import CalcomService, CalcomServiceError
+from app.services.availability_cache import availability_cache
+from app.services.booking_requests import PENDING, booking_requests
+from app.services.booking_service import BookingError, BookingService
+from app.services.calcom_service import CalcomService, CalcomServiceError, CalcomUnavailable
+from app.services.outbox_service import OutboxService
+from app.services.slot_index import SlotHold, SlotUnavailable, slot_index
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+# Comment lines sent on open booking request streams (seconds)
+SSE_KEEPALIVE_INTERVAL = 15.0
 
-@router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+
+async def _hold_slot(start_time: Optional[str]) -> Optional[SlotHold]:
+    """Hold a slot of the default event type, or raise 409 if it is taken."""
+    if not start_time:
+        return None
+
+    try:
+        return await slot_index.hold(settings.calcom_event_type_id, start_time)
+    except SlotUnavailable as e:
+        logger.info(f"Rejected booking locally: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Slot {e.slot} is not available",
+        )
+
+
+def _calcom_error(e: CalcomServiceError, action: str) -> HTTPException:
+    """Map a Cal.com error to 503 while its circuit is open, 500 otherwise."""
+    if isinstance(e, CalcomUnavailable):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"{action}: {str(e)}",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"{action}: {str(e)}"
+    )
+
+
+@router.post(
+    "",
+    response_model=BookingResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": BookingRequestStatus}},
+)
 async def create_booking(
     data: CreateBookingRequest,
     db: AsyncSession = Depends(get_db),
-) -> BookingResponse:
+    prefer: Optional[str] = Header(None),
+):
     """
     Create a new appointment booking for a lead.
 
     This endpoint:
     1. Validates the lead exists
-    2. Creates a booking in Cal.com
-    3. Updates the lead with booking information
-    4. Returns booking details
+    2. Holds the requested slot (409 if it is booked, not offered or being
+       booked by another request)
+    3. Creates a booking in Cal.com
+    4. Updates the lead with booking information
+    5. Returns booking details
 
     **Required fields:**
     - lead_id: ID of the lead to book for
@@ -46,79 +97,152 @@ async def create_booking(
     - start_time: Specific time (if not provided, Cal.com will suggest times)
     - timezone: Timezone (default: Europe/Moscow)
     - metadata: Additional booking metadata
+
+    **Headers:**
+    - `Idempotency-Key`: Unique key of this booking attempt (optional). A retry
+      with the same key returns the stored response instead of booking again.
+    - `Prefer: respond-async`: Book in a worker (optional, default with
+      BOOKING_ASYNC_DEFAULT). Steps 1-2 run in the request, which returns
+      `202` with a booking request; its `Location` is polled (or
+      `.../events` streamed) for the booking. Without Redis the booking is
+      made synchronously.
     """
-    # Get lead
-    result = await db.execute(
-        select(Lead).where(Lead.id == data.lead_id)
-    )
-    lead = result.scalar_one_or_none()
+    service = BookingService(db)
 
-    if not lead:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Lead {data.lead_id} not found"
-        )
+    try:
+        lead = await service.get_bookable_lead(data.lead_id)
+    except BookingError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
 
-    # Check if lead already has a booking
-    if lead.booking_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Lead {data.lead_id} already has a booking"
-        )
+    # Reserve the slot before calling Cal.com
+    hold = await _hold_slot(data.start_time)
 
-    # Create booking via Cal.com
-    calcom = CalcomService()
+    if settings.booking_async_default or "respond-async" in (prefer or "").lower():
+        request = await booking_requests.create(lead.id)
+        if request is not None:
+            return await _enqueue_booking(db, request, data, hold)
 
     try:
-        booking_result = await calcom.create_booking(
-            name=data.name,
-            email=data.email,
-            start_time=data.start_time,
-            timezone=data.timezone,
-            metadata={
-                **(data.metadata or {}),
-                "lead_id": lead.id,
-                "tenant_id": lead.tenant_id,
-            },
+        return await service.create_booking(lead, data, hold)
+    except BookingError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+async def _enqueue_booking(
+    db: AsyncSession,
+    request: dict,
+    data: CreateBookingRequest,
+    hold: Optional[SlotHold],
+) -> JSONResponse:
+    """Hand a booking to the booking task and answer 202 with its request."""
+    request_id = request["request_id"]
+
+    try:
+        await OutboxService(db).enqueue(
+            "create_booking",
+            args=[request_id, data.model_dump(mode="json"), list(hold) if hold else None],
         )
-    except CalcomServiceError as e:
-        logger.error(f"Failed to create booking for lead {lead.id}: {e}")
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        await slot_index.release(hold)
+        await booking_requests.finish(request_id, error="Failed to enqueue booking", error_status=500)
+        logger.error(f"Failed to enqueue booking request {request_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create booking: {str(e)}"
+            detail="Failed to enqueue booking"
         )
 
-    # Update lead with booking information
-    try:
-        lead.booking_id = str(booking_result["booking_id"])
-        lead.booking_url = booking_result["booking_url"]
-        lead.booked_at = booking_result["start_time"]
-        lead.status = LeadStatus.BOOKED
+    logger.info(f"Booking request {request_id} accepted for lead {data.lead_id}")
 
-        await db.commit()
-        await db.refresh(lead)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=BookingRequestStatus(**request).model_dump(),
+        headers={
+            "Location": f"{settings.api_v1_prefix}/bookings/requests/{request_id}",
+            "Preference-Applied": "respond-async",
+        },
+    )
 
-        logger.info(f"Booking created for lead {lead.id}: {booking_result['booking_id']}")
 
+async def _get_booking_request(request_id: str) -> dict:
+    """Get a booking request, or raise 404 (unknown/expired) or 503."""
+    try:
+        request = await booking_requests.get(request_id)
     except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to update lead with booking info: {e}")
+        logger.error(f"Failed to get booking request {request_id}: {e}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Booking created but failed to update lead"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Booking requests unavailable"
+        )
+
+    if request is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking request {request_id} not found"
         )
+    return request
+
+
+@router.get("/requests/{request_id}", response_model=BookingRequestStatus)
+async def get_booking_request(request_id: str, response: Response):
+    """
+    Get the status of an asynchronous booking request.
+
+    `status` is `pending` until the worker has booked (`succeeded`, with
+    `booking`) or failed (`failed`, with `error` and the `error_status` a
+    synchronous request would have returned). Pending responses carry
+    `Retry-After`.
+    """
+    request = await _get_booking_request(request_id)
+    if request["status"] == PENDING:
+        response.headers["Retry-After"] = "1"
+    return request
+
+
+@router.get("/requests/{request_id}/events")
+async def stream_booking_request(request_id: str):
+    """
+    Stream the status of an asynchronous booking request (Server-Sent Events).
 
-    return BookingResponse(
-        booking_id=booking_result["booking_id"],
-        booking_uid=booking_result["booking_uid"],
-        booking_url=booking_result["booking_url"],
-        start_time=booking_result["start_time"],
-        end_time=booking_result["end_time"],
-        status=booking_result["status"],
-        lead_id=lead.id,
+    Sends a `status` event right away and another when the booking is
+    finished, then closes. Streams of requests still pending after
+    BOOKING_EVENTS_TIMEOUT seconds are closed; clients reconnect.
+    """
+    request = await _get_booking_request(request_id)
+
+    async def events():
+        current = request
+        yield _status_event(current)
+
+        deadline = time.monotonic() + settings.booking_events_timeout
+        while current["status"] == PENDING:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                current = await booking_requests.wait(request_id, min(remaining, SSE_KEEPALIVE_INTERVAL))
+            except Exception as e:
+                logger.warning(f"Stopped streaming booking request {request_id}: {e}")
+                break
+
+            if current is None:
+                break
+            yield _status_event(current) if current["status"] != PENDING else ": keepalive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+def _status_event(request: dict) -> str:
+    """Format a booking request as an SSE status event."""
+    return f"event: status\ndata: {json.dumps(request)}\n\n"
+
+
 @router.delete("/{booking_id}", status_code=status.HTTP_200_OK)
 async def cancel_booking(
     booking_id: int,
@@ -155,10 +279,11 @@ async def cancel_booking(
         )
     except CalcomServiceError as e:
         logger.error(f"Failed to cancel booking {booking_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to cancel booking: {str(e)}"
-        )
+        raise _calcom_error(e, "Failed to cancel booking")
+
+    if lead.booked_at:
+        await slot_index.mark_free(settings.calcom_event_type_id, lead.booked_at.isoformat())
+    await availability_cache.invalidate()
 
     # Update lead
     try:
@@ -196,8 +321,9 @@ async def reschedule_booking(
 
     This endpoint:
     1. Finds the lead with this booking
-    2. Reschedules the booking in Cal.com
-    3. Updates lead with new time
+    2. Holds the new slot (409 if it is not available)
+    3. Reschedules the booking in Cal.com
+    4. Updates lead with new time
     """
     # Find lead with this booking
     result = await db.execute(
@@ -211,6 +337,8 @@ async def reschedule_booking(
             detail=f"Booking {booking_id} not found"
         )
 
+    hold = await _hold_slot(data.new_start_time)
+
     # Reschedule booking in Cal.com
     calcom = CalcomService()
 
@@ -221,11 +349,14 @@ async def reschedule_booking(
             cancellation_reason=data.reschedule_reason,
         )
     except CalcomServiceError as e:
+        await slot_index.release(hold)
         logger.error(f"Failed to reschedule booking {booking_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to reschedule booking: {str(e)}"
-        )
+        raise _calcom_error(e, "Failed to reschedule booking")
+
+    await slot_index.confirm(hold)
+    if lead.booked_at:
+        await slot_index.mark_free(settings.calcom_event_type_id, lead.booked_at.isoformat())
+    await availability_cache.invalidate()
 
     # Update lead with new time
     try:
@@ -270,12 +401,11 @@ async def get_availability(
     - date_from: Start date in YYYY-MM-DD format (optional)
     - date_to: End date in YYYY-MM-DD format (optional)
 
-    Returns a list of available time slots.
+    Returns a list of available time slots. Slots are cached (see
+    AVAILABILITY_CACHE_TTL) and refreshed on booking webhooks.
     """
-    calcom = CalcomService()
-
     try:
-        slots = await calcom.get_availability(
+        slots = await availability_cache.get(
             date_from=date_from,
             date_to=date_to,
         )
@@ -291,7 +421,4 @@ async def get_availability(
 
     except CalcomServiceError as e:
         logger.error(f"Failed to get availability: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get availability: {str(e)}"
-        )
+        raise _calcom_error(e, "Failed to get availability")
@@ -1,39 +1,128 @@
 """Leads API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Header
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.schemas.lead import CreateLeadRequest, CreateLeadResponse, LeadResponse
+from app.schemas.lead import (
+    CreateLeadRequest,
+    CreateLeadResponse,
+    LeadResponse,
+    BatchCreateLeadRequest,
+    BatchLeadResult,
+    BatchCreateLeadResponse,
+)
 from app.services.lead_service import LeadService
+from app.services.tenant_service import TenantContext, tenant_resolver
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 
 
-async def get_tenant_id_from_header(
-    x_tenant_id: int = Header(..., description="Tenant ID from widget configuration")
-) -> int:
+async def get_tenant_context(
+    x_tenant_id: Optional[int] = Header(None, description="Tenant ID from widget configuration"),
+    x_widget_key: Optional[str] = Header(None, description="Widget public key"),
+) -> TenantContext:
     """
-    Extract tenant ID from request header.
+    Resolve the tenant of a widget request.
 
-    In production, this would validate the tenant ID against a token or API key.
-    For MVP, we accept the tenant ID directly from the header.
+    The tenant is identified by the widget public key (X-Widget-Key) or by
+    ID (X-Tenant-Id). Lookups go through the tenant cache, so this normally
+    costs no database round-trip.
 
     Args:
         x_tenant_id: Tenant ID from X-Tenant-Id header
+        x_widget_key: Public key from X-Widget-Key header
 
     Returns:
-        Validated tenant ID
+        Tenant context
 
     Raises:
-        HTTPException: If tenant ID is invalid
+        HTTPException: If the header is missing or invalid, the tenant does
+            not exist, is inactive, or its trial has expired
     """
-    if x_tenant_id <= 0:
+    if x_widget_key:
+        tenant = await tenant_resolver.get_by_public_key(x_widget_key)
+    elif x_tenant_id is not None:
+        if x_tenant_id <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid tenant ID"
+            )
+        tenant = await tenant_resolver.get_by_id(x_tenant_id)
+    else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid tenant ID"
+            detail="X-Widget-Key or X-Tenant-Id header is required"
         )
-    return x_tenant_id
+
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tenant not found"
+        )
+
+    if not tenant.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Tenant is inactive"
+        )
+
+    if tenant.trial_expired:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Tenant trial has expired"
+        )
+
+    return tenant
+
+
+async def get_tenant_id_from_header(
+    tenant: TenantContext = Depends(get_tenant_context),
+) -> int:
+    """
+    Get ID of the validated request tenant.
+
+    Args:
+        tenant: Resolved tenant context
+
+    Returns:
+        Validated tenant ID
+    """
+    return tenant.id
+
+
+def validate_lead_request(data: CreateLeadRequest) -> Optional[str]:
+    """
+    Apply contact and channel-specific validation rules to a lead.
+
+    Args:
+        data: Lead creation request data
+
+    Returns:
+        Error message if the lead is invalid, None otherwise
+    """
+    # Validate that at least one contact method is provided
+    if not any([data.phone, data.email, data.vk_id]):
+        return "At least one contact method (phone, email, or vk_id) is required"
+
+    # Channel-specific validation
+    if data.channel == "sms" and not data.phone:
+        return "Phone number is required for SMS channel"
+
+    if data.channel == "email" and not data.email:
+        return "Email is required for Email channel"
+
+    if data.channel == "vk" and not data.vk_id:
+        return "VK ID is required for VK channel"
+
+    if data.channel == "whatsapp" and not data.consent.marketing:
+        return "Marketing consent is required for WhatsApp channel"
+
+    return None
 
 
 @router.post(
@@ -46,9 +135,13 @@ async def get_tenant_id_from_header(
 
     This endpoint is called by the widget when a user submits their contact information.
     The lead is created with status 'new' and can be processed by the orchestrator.
+    The orchestrator task is stored in the outbox with the lead, so the request
+    never waits on the message broker.
 
     **Headers:**
     - `X-Tenant-Id`: Tenant ID from widget configuration (required)
+    - `Idempotency-Key`: Unique key of this submission (optional). A retry
+      with the same key returns the stored response without creating a lead.
 
     **Request Body:**
     - `name`: Contact name (required)
@@ -62,6 +155,9 @@ async def get_tenant_id_from_header(
     **Response:**
     - `lead`: Created lead object
     - `next_action`: Recommended next action for the orchestrator
+    - `duplicate`: `true` if the same phone, email or VK ID submitted a lead
+      within `LEAD_DEDUP_WINDOW`; the existing lead is returned with
+      status 200 and no new messages are sent
 
     **Example:**
     ```bash
@@ -79,56 +175,111 @@ async def get_tenant_id_from_header(
 )
 async def create_lead(
     data: CreateLeadRequest,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     tenant_id: int = Depends(get_tenant_id_from_header),
 ):
     """Create a new lead from widget submission."""
-    # Validate that at least one contact method is provided
-    if not any([data.phone, data.email, data.vk_id]):
+    error = validate_lead_request(data)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one contact method (phone, email, or vk_id) is required"
+            detail=error
         )
 
-    # Channel-specific validation
-    if data.channel == "sms" and not data.phone:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Phone number is required for SMS channel"
-        )
+    # Create lead
+    service = LeadService(db)
+    lead, duplicate = await service.create_lead(data, tenant_id)
 
-    if data.channel == "email" and not data.email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email is required for Email channel"
-        )
+    if duplicate:
+        response.status_code = status.HTTP_200_OK
 
-    if data.channel == "vk" and not data.vk_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="VK ID is required for VK channel"
-        )
+    # Get next action
+    next_action = await service.get_next_action(lead)
 
-    if data.channel == "whatsapp" and not data.consent.marketing:
+    return CreateLeadResponse(
+        lead=LeadResponse.model_validate(lead),
+        next_action=next_action,
+        duplicate=duplicate,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=BatchCreateLeadResponse,
+    status_code=status.HTTP_207_MULTI_STATUS,
+    summary="Create leads in batch",
+    description="""
+    Create many leads at once, e.g. when importing from partner CRMs or
+    ad platform lead forms (VK Ads, Yandex Direct).
+
+    Each lead is validated with the same rules as `POST /api/v1/leads`.
+    Valid leads are inserted with a single multi-row INSERT; their
+    orchestrator tasks are written to the outbox in the same transaction
+    and published by the outbox relay. Invalid leads are skipped and
+    reported individually.
+
+    **Headers:**
+    - `X-Tenant-Id`: Tenant ID (required)
+
+    **Request Body:**
+    - `leads`: List of leads in the `POST /api/v1/leads` format
+      (up to `LEAD_BATCH_MAX_SIZE` items)
+
+    **Response:**
+    - `created`, `failed`: Counters
+    - `results`: Per-item result with `index`, `success`, `lead` or `error`
+    """,
+)
+async def create_leads_batch(
+    data: BatchCreateLeadRequest,
+    db: AsyncSession = Depends(get_db),
+    tenant_id: int = Depends(get_tenant_id_from_header),
+):
+    """Create leads in batch."""
+    if len(data.leads) > settings.lead_batch_max_size:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Marketing consent is required for WhatsApp channel"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch size exceeds limit of {settings.lead_batch_max_size} leads"
         )
 
-    # Create lead
-    service = LeadService(db)
-    lead = await service.create_lead(data, tenant_id)
+    results = [None] * len(data.leads)
+    valid = []
 
-    # Get next action
-    next_action = await service.get_next_action(lead)
+    # Validate each lead separately so one bad item doesn't reject the batch
+    for index, item in enumerate(data.leads):
+        try:
+            lead_data = CreateLeadRequest.model_validate(item)
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            results[index] = BatchLeadResult(index=index, success=False, error=error)
+            continue
 
-    # Trigger orchestrator task to process the lead asynchronously
-    from app.tasks.lead_tasks import process_new_lead_task
-    process_new_lead_task.delay(lead.id)
+        error = validate_lead_request(lead_data)
+        if error:
+            results[index] = BatchLeadResult(index=index, success=False, error=error)
+            continue
 
-    return CreateLeadResponse(
-        lead=LeadResponse.model_validate(lead),
-        next_action=next_action
+        valid.append((index, lead_data))
+
+    # Create all valid leads in one round-trip
+    service = LeadService(db)
+    leads = await service.create_leads([lead_data for _, lead_data in valid], tenant_id)
+
+    for (index, _), lead in zip(valid, leads):
+        results[index] = BatchLeadResult(
+            index=index,
+            success=True,
+            lead=LeadResponse.model_validate(lead),
+        )
+
+    return BatchCreateLeadResponse(
+        created=len(leads),
+        failed=len(data.leads) - len(leads),
+        results=results,
     )
 
 
@@ -1,16 +1,16 @@
 """Webhook API endpoints - Handlers for external service webhooks."""
 
+import json
 import logging
 import hmac
 import hashlib
-from typing import Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.lead import Lead, LeadStatus
+from app.services.webhook_handlers import calcom_event_key, handle_calcom_event
+from app.services.webhook_queue import webhook_queue
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +58,10 @@ async def calcom_webhook(
     - booking.cancelled: Booking cancelled
     - booking.completed: Meeting completed
 
+    Verified events are queued (see ``app.services.webhook_queue``) and
+    acknowledged right away; the webhook consumer applies them in order per
+    booking, with retries. Without the queue they are applied inline.
+
     **Security:**
     Webhook payload is verified using HMAC SHA256 signature.
     """
@@ -77,7 +81,9 @@ async def calcom_webhook(
 
     # Parse JSON payload
     try:
-        payload = await request.json()
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("payload is not an object")
     except Exception as e:
         logger.error(f"Failed to parse webhook payload: {e}")
         raise HTTPException(
@@ -85,154 +91,15 @@ async def calcom_webhook(
             detail="Invalid JSON payload"
         )
 
-    # Extract event type
     event_type = payload.get("triggerEvent")
-    booking_data = payload.get("payload", {})
-
     logger.info(f"Received Cal.com webhook: {event_type}")
 
-    # Get booking ID and lead ID
-    booking_id = booking_data.get("id")
-    metadata = booking_data.get("metadata", {})
-    lead_id = metadata.get("lead_id")
+    if await webhook_queue.publish("calcom", calcom_event_key(payload), body.decode()):
+        return {"success": True, "event_type": event_type, "queued": True}
 
-    if not booking_id:
-        logger.warning("Webhook payload missing booking ID")
-        return {"success": True, "message": "No booking ID found"}
-
-    # Handle different event types
     try:
-        if event_type == "BOOKING_CREATED":
-            await handle_booking_created(db, booking_id, lead_id, booking_data)
-
-        elif event_type == "BOOKING_RESCHEDULED":
-            await handle_booking_rescheduled(db, booking_id, lead_id, booking_data)
-
-        elif event_type == "BOOKING_CANCELLED":
-            await handle_booking_cancelled(db, booking_id, lead_id, booking_data)
-
-        elif event_type == "BOOKING_COMPLETED":
-            await handle_booking_completed(db, booking_id, lead_id, booking_data)
-
-        else:
-            logger.info(f"Unhandled webhook event type: {event_type}")
-
+        return await handle_calcom_event(db, payload)
     except Exception as e:
         logger.error(f"Error handling webhook event {event_type}: {e}")
         # Don't raise exception - we don't want to cause retries
         return {"success": False, "error": str(e)}
-
-    return {"success": True, "event_type": event_type}
-
-
-async def handle_booking_created(
-    db: AsyncSession,
-    booking_id: int,
-    lead_id: int,
-    booking_data: Dict[str, Any],
-):
-    """Handle booking.created event."""
-    logger.info(f"Handling BOOKING_CREATED: booking={booking_id}, lead={lead_id}")
-
-    if not lead_id:
-        logger.warning("No lead_id in booking metadata")
-        return
-
-    # Find lead
-    result = await db.execute(
-        select(Lead).where(Lead.id == lead_id)
-    )
-    lead = result.scalar_one_or_none()
-
-    if not lead:
-        logger.warning(f"Lead {lead_id} not found for booking {booking_id}")
-        return
-
-    # Update lead if not already updated
-    if not lead.booking_id:
-        lead.booking_id = str(booking_id)
-        lead.booking_url = booking_data.get("meetingUrl") or booking_data.get("url")
-        lead.booked_at = booking_data.get("startTime")
-        lead.status = LeadStatus.BOOKED
-
-        await db.commit()
-        logger.info(f"Lead {lead_id} updated with booking {booking_id}")
-
-
-async def handle_booking_rescheduled(
-    db: AsyncSession,
-    booking_id: int,
-    lead_id: int,
-    booking_data: Dict[str, Any],
-):
-    """Handle booking.rescheduled event."""
-    logger.info(f"Handling BOOKING_RESCHEDULED: booking={booking_id}, lead={lead_id}")
-
-    # Find lead by booking_id
-    result = await db.execute(
-        select(Lead).where(Lead.booking_id == str(booking_id))
-    )
-    lead = result.scalar_one_or_none()
-
-    if not lead:
-        logger.warning(f"Lead not found for booking {booking_id}")
-        return
-
-    # Update booking time
-    lead.booked_at = booking_data.get("startTime")
-
-    await db.commit()
-    logger.info(f"Lead {lead.id} booking rescheduled")
-
-
-async def handle_booking_cancelled(
-    db: AsyncSession,
-    booking_id: int,
-    lead_id: int,
-    booking_data: Dict[str, Any],
-):
-    """Handle booking.cancelled event."""
-    logger.info(f"Handling BOOKING_CANCELLED: booking={booking_id}, lead={lead_id}")
-
-    # Find lead by booking_id
-    result = await db.execute(
-        select(Lead).where(Lead.booking_id == str(booking_id))
-    )
-    lead = result.scalar_one_or_none()
-
-    if not lead:
-        logger.warning(f"Lead not found for booking {booking_id}")
-        return
-
-    # Update lead status
-    lead.status = LeadStatus.QUALIFIED  # Move back to qualified
-    # Keep booking_id and booking_url for history
-
-    await db.commit()
-    logger.info(f"Lead {lead.id} booking cancelled")
-
-
-async def handle_booking_completed(
-    db: AsyncSession,
-    booking_id: int,
-    lead_id: int,
-    booking_data: Dict[str, Any],
-):
-    """Handle booking.completed event."""
-    logger.info(f"Handling BOOKING_COMPLETED: booking={booking_id}, lead={lead_id}")
-
-    # Find lead by booking_id
-    result = await db.execute(
-        select(Lead).where(Lead.booking_id == str(booking_id))
-    )
-    lead = result.scalar_one_or_none()
-
-    if not lead:
-        logger.warning(f"Lead not found for booking {booking_id}")
-        return
-
-    # Update lead status to completed
-    lead.status = LeadStatus.COMPLETED
-
-    await db.commit()
-    logger.info(f"Lead {lead.id} marked as completed")
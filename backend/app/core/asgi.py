@@ -0,0 +1,70 @@
+"""Helpers for pure ASGI middleware."""
+
+import json
+from typing import List, Optional, Tuple
+
+
+async def read_body(receive) -> Tuple[bytes, object]:
+    """
+    Read the whole request body.
+
+    Args:
+        receive: ASGI receive callable
+
+    Returns:
+        Tuple of (body, receive callable replaying the body to the app)
+    """
+    chunks = []
+    more_body = True
+
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client disconnected: let the app see it
+            async def replay_disconnect():
+                return message
+            return b"", replay_disconnect
+
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
+
+
+async def send_json(
+    send,
+    status: int,
+    content: dict,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None,
+) -> None:
+    """
+    Send a JSON response.
+
+    Args:
+        send: ASGI send callable
+        status: HTTP status code
+        content: JSON body
+        headers: Extra headers
+    """
+    body = json.dumps(content).encode()
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *(headers or []),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,131 @@
+"""Worker-level async runtime.
+
+Celery tasks are synchronous, but the database layer and channel services are
+async. Instead of building a new event loop with ``asyncio.run()`` for every
+call, each worker process owns one long-lived event loop running in a
+background thread. Tasks submit coroutines to that loop with ``run_async()``,
+so the SQLAlchemy engine pool (and its asyncpg connections) is reused across
+tasks.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+# Async callbacks executed on the runtime loop before it is stopped
+_shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+
+def start_runtime() -> asyncio.AbstractEventLoop:
+    """
+    Start the runtime event loop for the current process.
+
+    Called from the ``worker_process_init`` signal. Safe to call more than
+    once; a loop inherited from a parent process through fork is discarded.
+
+    Returns:
+        The running event loop
+    """
+    global _loop, _thread, _pid
+
+    with _lock:
+        if _loop is not None and _pid == os.getpid():
+            return _loop
+
+        # Connections inherited from the parent process must not be reused
+        engine.sync_engine.dispose(close=False)
+
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, name="async-runtime", daemon=True)
+        thread.start()
+        ready.wait()
+
+        _loop, _thread, _pid = loop, thread, os.getpid()
+        logger.info(f"Async runtime started (pid={_pid})")
+        return loop
+
+
+def get_runtime_loop() -> asyncio.AbstractEventLoop:
+    """Get the runtime event loop, starting it if needed."""
+    if _loop is None or _pid != os.getpid():
+        return start_runtime()
+    return _loop
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the worker runtime loop and wait for the result.
+
+    Args:
+        coro: Coroutine to execute
+        timeout: Maximum time to wait in seconds (optional)
+
+    Returns:
+        Coroutine result
+    """
+    loop = get_runtime_loop()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
+
+
+def on_shutdown(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Register an async callback to run when the runtime shuts down."""
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+def shutdown_runtime() -> None:
+    """
+    Stop the runtime event loop of the current process.
+
+    Runs registered shutdown hooks, disposes the database engine pool and
+    stops the loop thread. Called from the ``worker_process_shutdown`` signal.
+    """
+    global _loop, _thread, _pid
+
+    with _lock:
+        if _loop is None or _pid != os.getpid():
+            return
+
+        loop, thread = _loop, _thread
+
+        async def _close() -> None:
+            for hook in reversed(_shutdown_hooks):
+                try:
+                    await hook()
+                except Exception as e:
+                    logger.error(f"Async runtime shutdown hook failed: {e}")
+            await engine.dispose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout=10)
+        except Exception as e:
+            logger.error(f"Failed to shut down async runtime cleanly: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+        _loop, _thread, _pid = None, None, None
+        logger.info("Async runtime stopped")
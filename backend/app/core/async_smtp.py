@@ -0,0 +1,255 @@
+"""Asyncio-native SMTP delivery for the email channel.
+
+``smtplib`` blocks the calling thread for the whole SMTP exchange, so a
+Celery slot sits idle during every handshake and DATA phase. This engine
+sends with ``aiosmtplib`` on the worker async runtime: each SMTP host gets
+its own pool of authenticated sessions, and at most
+``SMTP_ASYNC_MAX_CONNECTIONS_PER_HOST`` messages are in flight per host.
+Everything above that waits for a free session instead of opening more
+connections than the server allows.
+
+Sessions dropped by the server (``421``, disconnect, timeout) are replaced
+and the message is resent once, as in the blocking ``smtp_pool``.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from email.message import Message
+from typing import Dict, List, Optional, Tuple
+
+import aiosmtplib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the session is unusable and the send can be repeated
+RECONNECT_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+
+def is_reconnect_error(error: Exception) -> bool:
+    """Check whether an SMTP error means the session must be reopened."""
+    if isinstance(error, RECONNECT_ERRORS):
+        return True
+
+    # 421: service not available, closing transmission channel
+    return getattr(error, "code", None) == 421
+
+
+@dataclass(frozen=True)
+class SMTPHostConfig:
+    """Connection settings of one SMTP host."""
+
+    host: str
+    port: int
+    user: str = ""
+    password: str = ""
+    use_tls: bool = True
+    timeout: float = 30.0
+
+    @classmethod
+    def from_settings(cls) -> "SMTPHostConfig":
+        """Build config from SMTP_* settings."""
+        return cls(
+            host=settings.smtp_host,
+            port=settings.smtp_port,
+            user=settings.smtp_user,
+            password=settings.smtp_password,
+            use_tls=settings.smtp_use_tls,
+            timeout=settings.smtp_timeout,
+        )
+
+
+class AsyncSMTPSession:
+    """aiosmtplib session with bookkeeping for the pool."""
+
+    def __init__(self, client: aiosmtplib.SMTP):
+        self.client = client
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+
+    async def close(self) -> None:
+        """Close the session, ignoring errors (the server may be gone)."""
+        try:
+            await self.client.quit()
+        except Exception:
+            self.client.close()
+
+
+class AsyncSMTPHostPool:
+    """Sessions and concurrency limit for one SMTP host."""
+
+    def __init__(self, config: SMTPHostConfig, max_connections: int):
+        self.config = config
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: List[AsyncSMTPSession] = []
+
+    async def _open(self) -> AsyncSMTPSession:
+        """Open and authenticate a new session."""
+        client = aiosmtplib.SMTP(
+            hostname=self.config.host,
+            port=self.config.port,
+            timeout=self.config.timeout,
+            start_tls=self.config.use_tls,
+        )
+        await client.connect()
+
+        try:
+            if self.config.user and self.config.password:
+                await client.login(self.config.user, self.config.password)
+        except Exception:
+            client.close()
+            raise
+
+        return AsyncSMTPSession(client)
+
+    async def _take_idle(self) -> Optional[AsyncSMTPSession]:
+        """Get a reusable idle session, closing stale ones."""
+        while self._idle:
+            session = self._idle.pop()
+            if (
+                session.client.is_connected
+                and time.monotonic() - session.last_used < settings.smtp_pool_idle_timeout
+            ):
+                return session
+            await session.close()
+
+        return None
+
+    async def _release(self, session: AsyncSMTPSession, broken: bool) -> None:
+        """Return session to the pool, or close it if unusable or used up."""
+        if broken or session.messages_sent >= settings.smtp_max_messages_per_connection:
+            await session.close()
+        else:
+            session.last_used = time.monotonic()
+            self._idle.append(session)
+
+    async def send(self, msg: Message) -> None:
+        """
+        Send one message, reconnecting once if the session was dropped.
+
+        Raises:
+            aiosmtplib.SMTPException: If sending fails
+        """
+        async with self._slots:
+            for attempt in range(2):
+                session = await self._take_idle() or await self._open()
+                try:
+                    await session.client.send_message(msg)
+                except Exception as e:
+                    await self._release(session, broken=True)
+                    if attempt == 0 and is_reconnect_error(e):
+                        logger.warning(f"SMTP session to {self.config.host} dropped ({e}), reconnecting")
+                        continue
+                    raise
+
+                session.messages_sent += 1
+                await self._release(session, broken=False)
+                return
+
+    async def aclose(self) -> None:
+        """Close idle sessions."""
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await session.close()
+
+
+class AsyncSMTPEngine:
+    """
+    Process-wide async SMTP engine, one session pool per SMTP host.
+
+    Pools are bound to the event loop they were created on and are replaced
+    when used from another loop, like the shared HTTP clients.
+    """
+
+    def __init__(self, max_connections_per_host: Optional[int] = None):
+        """Initialize engine."""
+        self.max_connections_per_host = (
+            max_connections_per_host or settings.smtp_async_max_connections_per_host
+        )
+        self._pools: Dict[SMTPHostConfig, Tuple[AsyncSMTPHostPool, asyncio.AbstractEventLoop]] = {}
+
+    def get_pool(self, config: Optional[SMTPHostConfig] = None) -> AsyncSMTPHostPool:
+        """
+        Get the session pool of an SMTP host.
+
+        Args:
+            config: Host settings (default: SMTP_* settings)
+
+        Returns:
+            Host pool bound to the running event loop
+        """
+        config = config or SMTPHostConfig.from_settings()
+        loop = asyncio.get_running_loop()
+
+        entry = self._pools.get(config)
+        if entry is not None and entry[1] is loop:
+            return entry[0]
+
+        pool = AsyncSMTPHostPool(config, self.max_connections_per_host)
+        self._pools[config] = (pool, loop)
+        return pool
+
+    async def send(self, msg: Message, config: Optional[SMTPHostConfig] = None) -> None:
+        """
+        Send one message.
+
+        Args:
+            msg: Message to send
+            config: Host settings (default: SMTP_* settings)
+
+        Raises:
+            aiosmtplib.SMTPException: If sending fails
+        """
+        await self.get_pool(config).send(msg)
+
+    async def send_many(
+        self,
+        messages: List[Message],
+        config: Optional[SMTPHostConfig] = None,
+    ) -> List[Optional[Exception]]:
+        """
+        Send messages concurrently (bounded by the per-host limit).
+
+        Args:
+            messages: Messages to send
+            config: Host settings (default: SMTP_* settings)
+
+        Returns:
+            One entry per message: None if sent, otherwise the error
+        """
+        pool = self.get_pool(config)
+        results = await asyncio.gather(
+            *(pool.send(msg) for msg in messages),
+            return_exceptions=True,
+        )
+
+        errors = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"SMTP error: {result}")
+                errors.append(result)
+            else:
+                errors.append(None)
+
+        return errors
+
+    async def aclose(self) -> None:
+        """Close idle sessions of all hosts."""
+        pools, self._pools = self._pools, {}
+        for config, (pool, _) in pools.items():
+            try:
+                await pool.aclose()
+            except Exception as e:
+                logger.error(f"Failed to close SMTP sessions to {config.host}: {e}")
+
+
+# Global engine instance
+async_smtp = AsyncSMTPEngine()
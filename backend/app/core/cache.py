@@ -0,0 +1,85 @@
+"""In-process caches."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Iterator, NamedTuple, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class CacheEntry(NamedTuple):
+    """Cached value with its expiry time (time.monotonic())."""
+
+    value: Any
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class TTLCache(Generic[V]):
+    """
+    Thread-safe LRU cache with per-entry TTL.
+
+    ``get`` only returns fresh values. ``peek`` also returns expired entries,
+    for callers that revalidate a stale value instead of rebuilding it.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Max number of entries (least recently used are evicted)
+            ttl: Default time to live in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get a fresh value, or None if missing or expired."""
+        entry = self.peek(key)
+        if entry is None or entry.expired:
+            return None
+        return entry.value
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """Get the entry even if expired (marks it recently used)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = CacheEntry(value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self) -> Iterator[Hashable]:
+        """Snapshot of cached keys."""
+        with self._lock:
+            return iter(list(self._entries))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,15 +1,95 @@
-"""Celery application configuration."""
+"""Celery application configuration.
+
+Queue topology:
+
+* ``contact``  - first contact with a new lead (orchestrator, welcome
+  messages, verification codes). Served by its own workers so reminders and
+  batches never delay a lead's first message.
+* ``whatsapp``, ``telegram``, ``vk`` - first contact through messengers:
+  contact attempts for these channels are handed to the channel's queue
+  (``CHANNEL_QUEUES``), so a slow messenger provider does not hold up SMS
+  and email first contact. Telegram and VK leads are handled manually for
+  now, so only WhatsApp attempts use their queue yet.
+* ``sms``, ``email``, ``calcom`` - other sends per channel (reminders,
+  confirmations, batches), so one slow provider only backs up its own
+  queue.
+* ``default``  - maintenance tasks.
+
+Tasks are routed by name (``TASK_ROUTES``) with a message priority: first
+contact is served before everything else waiting in a queue, bulk and
+reminder traffic last (and is deferred while first contact misses its SLO,
+see ``app.core.speed_to_lead``). Worker pools (queues, pool type,
+concurrency, prefetch) are defined in ``WORKER_POOLS`` and started by
+``python -m app.worker_launcher``.
+"""
+
+from typing import Any, Dict
 
 from celery import Celery
+from celery.concurrency import get_implementation
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from kombu import Queue
 
 from app.core.config import settings
 
+QUEUES = ["contact", "whatsapp", "telegram", "vk", "sms", "email", "calcom", "default"]
+
+# Message priorities (0 is served first)
+PRIORITY_FIRST_CONTACT = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BULK = 9
+
+# Lead channel -> queue of its contact attempts (other channels: "contact")
+CHANNEL_QUEUES = {
+    "whatsapp": "whatsapp",
+    "telegram": "telegram",
+    "vk": "vk",
+}
+
+# Task name -> (queue, priority); tasks not listed go to "default"
+TASK_ROUTES = {
+    # First contact
+    "process_new_lead": ("contact", PRIORITY_FIRST_CONTACT),
+    "attempt_contact": ("contact", PRIORITY_FIRST_CONTACT),
+    "send_welcome_email": ("contact", PRIORITY_FIRST_CONTACT),
+    "send_verification_code": ("contact", PRIORITY_FIRST_CONTACT),
+    # SMS
+    "send_sms": ("sms", PRIORITY_DEFAULT),
+    "send_sms_batch": ("sms", PRIORITY_BULK),
+    "send_appointment_reminder": ("sms", PRIORITY_BULK),
+    "check_sms_status": ("sms", PRIORITY_BULK),
+    # Email
+    "send_email": ("email", PRIORITY_DEFAULT),
+    "send_email_batch": ("email", PRIORITY_BULK),
+    "send_booking_confirmation_email": ("email", PRIORITY_DEFAULT),
+    # Cal.com
+    "create_booking": ("calcom", PRIORITY_DEFAULT),
+}
+
+# Worker pools started by the launcher. Sends are IO-bound: the "threads"
+# pool runs many tasks per process, all sharing the process's async runtime
+# loop (DB pool, HTTP/2 clients). Prefork is kept for CPU-bound work.
+# Prefetch 1 keeps workers from hoarding messages, so priorities hold.
+WORKER_POOLS: Dict[str, Dict[str, Any]] = {
+    "contact": {"queues": ["contact"], "pool": "threads", "concurrency": 50, "prefetch": 1},
+    "sms": {"queues": ["sms"], "pool": "threads", "concurrency": 20, "prefetch": 1},
+    "email": {"queues": ["email"], "pool": "threads", "concurrency": 20, "prefetch": 1},
+    "messengers": {"queues": ["whatsapp", "telegram", "vk"], "pool": "threads", "concurrency": 20, "prefetch": 1},
+    "calcom": {"queues": ["calcom"], "pool": "threads", "concurrency": 10, "prefetch": 1},
+    "default": {"queues": ["default"], "pool": "prefork", "concurrency": 2, "prefetch": 4},
+}
+
 # Create Celery app
 celery_app = Celery(
     "fast_lead",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.tasks.sms_tasks", "app.tasks.email_tasks", "app.tasks.lead_tasks"],
+    include=[
+        "app.tasks.sms_tasks",
+        "app.tasks.email_tasks",
+        "app.tasks.lead_tasks",
+        "app.tasks.booking_tasks",
+    ],
 )
 
 # Configure Celery
@@ -31,7 +111,7 @@ celery_app.conf.update(
     result_extended=True,
 
     # Worker settings
-    worker_prefetch_multiplier=4,
+    worker_prefetch_multiplier=1,  # don't hoard messages past higher-priority ones
     worker_max_tasks_per_child=1000,
 
     # Retry settings
@@ -41,13 +121,22 @@ celery_app.conf.update(
     # Monitoring
     worker_send_task_events=True,
     task_send_sent_event=True,
-)
 
-# Task routes (optional - for task-specific queues)
-celery_app.conf.task_routes = {
-    "app.tasks.sms_tasks.*": {"queue": "sms"},
-    "app.tasks.lead_tasks.*": {"queue": "leads"},
-}
+    # Queues
+    task_queues=[Queue(name) for name in QUEUES],
+    task_default_queue="default",
+    task_routes={
+        name: {"queue": queue, "priority": priority}
+        for name, (queue, priority) in TASK_ROUTES.items()
+    },
+
+    # Priorities (Redis broker: one list per priority step, served in order)
+    task_default_priority=PRIORITY_DEFAULT,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "queue_order_strategy": "priority",
+    },
+)
 
 # Beat schedule for periodic tasks (optional)
 celery_app.conf.beat_schedule = {
@@ -57,3 +146,60 @@ celery_app.conf.beat_schedule = {
     #     "schedule": 300.0,  # 5 minutes
     # },
 }
+
+
+def get_worker_pools() -> Dict[str, Dict[str, Any]]:
+    """
+    Get worker pool definitions with CELERY_WORKER_POOLS overrides applied.
+
+    Returns:
+        Dict of pool name -> queues/pool/concurrency/prefetch
+    """
+    pools = {name: dict(pool) for name, pool in WORKER_POOLS.items()}
+    for name, overrides in settings.celery_worker_pools.items():
+        pools[name] = {**pools.get(name, {}), **overrides}
+    return pools
+
+
+def _runs_in_worker_process(worker) -> bool:
+    """Check if a worker's pool executes tasks in the worker process itself."""
+    return "prefork" not in get_implementation(worker.pool_cls).__module__
+
+
+@worker_init.connect
+def init_worker(sender=None, **kwargs):
+    """Start the async runtime in the worker process for non-prefork pools."""
+    if sender is not None and _runs_in_worker_process(sender):
+        init_worker_process()
+
+
+@worker_shutdown.connect
+def shutdown_worker(sender=None, **kwargs):
+    """Close the async runtime of non-prefork pools."""
+    shutdown_worker_process()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Start the per-process async runtime (event loop, DB pool, HTTP clients)."""
+    from app.core.async_runtime import on_shutdown, run_async, start_runtime
+    from app.core.http_client import http_clients
+    from app.core.redis import close_redis
+    from app.core.async_smtp import async_smtp
+    from app.core.smtp_pool import smtp_pool
+    from app.services.lead_status_buffer import lead_status_buffer
+
+    start_runtime()
+    run_async(http_clients.start())
+    on_shutdown(http_clients.aclose)
+    on_shutdown(lead_status_buffer.flush)
+    on_shutdown(smtp_pool.aclose)
+    on_shutdown(async_smtp.aclose)
+    on_shutdown(close_redis)
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Close the per-process async runtime."""
+    from app.core.async_runtime import shutdown_runtime
+    shutdown_runtime()
@@ -0,0 +1,295 @@
+"""Circuit breakers for channel providers.
+
+When a provider degrades, every send would otherwise wait for a timeout and
+then be retried, so a provider outage fills the queues with slow failures.
+Breaker state is kept in Redis, so all API and worker processes see the same
+state:
+
+* closed    - calls go through; transport errors, timeouts and 5xx responses
+              are counted, and ``CIRCUIT_BREAKER_FAILURE_THRESHOLD`` failures
+              within ``CIRCUIT_BREAKER_FAILURE_WINDOW`` seconds open it.
+* open      - calls fail fast with ``CircuitOpen`` (tasks are deferred until
+              the breaker may close). Stays open ``CIRCUIT_BREAKER_OPEN_SECONDS``,
+              doubling on every consecutive trip up to
+              ``CIRCUIT_BREAKER_MAX_OPEN_SECONDS``.
+* half-open - after the open period one probe call is let through; success
+              closes the breaker, failure opens it again for longer.
+
+Outcomes are recorded by the provider HTTP clients (see ``http_client``);
+a call cancelled while waiting (e.g. by a step timeout) counts as a
+failure. ``check()`` is called by the rate governor before every outbound
+channel call, and by ``CalcomService`` before Cal.com calls.
+If Redis is unavailable, breakers stay closed.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional, Set
+
+import httpx
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+OPEN_KEY = "breaker:{}:open"
+TRIPS_KEY = "breaker:{}:trips"
+PROBE_KEY = "breaker:{}:probe"
+FAILURES_KEY = "breaker:{}:failures"
+
+# KEYS: open, trips, probe, failures. ARGV: probe TTL (ms).
+# Returns {allowed, retry_after_ms, clean}.
+CHECK_SCRIPT = """
+local open_ttl = redis.call("PTTL", KEYS[1])
+if open_ttl > 0 then
+    return {0, open_ttl, 0}
+end
+if redis.call("EXISTS", KEYS[2]) == 1 then
+    if redis.call("SET", KEYS[3], "1", "NX", "PX", ARGV[1]) then
+        return {1, 0, 0}
+    end
+    return {0, math.max(redis.call("PTTL", KEYS[3]), 1), 0}
+end
+return {1, 0, redis.call("EXISTS", KEYS[4]) == 0 and 1 or 0}
+"""
+
+# KEYS: open, trips, probe, failures. ARGV: window (ms), threshold,
+# base open time (ms), max open time (ms). Returns {opened, open_ms}.
+FAILURE_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return {0, 0}
+end
+local trips = tonumber(redis.call("GET", KEYS[2]) or "0")
+local failures = redis.call("INCR", KEYS[4])
+if failures == 1 then
+    redis.call("PEXPIRE", KEYS[4], ARGV[1])
+end
+if trips == 0 and failures < tonumber(ARGV[2]) then
+    return {0, 0}
+end
+trips = trips + 1
+local open_ms = math.floor(math.min(tonumber(ARGV[3]) * 2 ^ (trips - 1), tonumber(ARGV[4])))
+redis.call("SET", KEYS[1], "1", "PX", open_ms)
+redis.call("SET", KEYS[2], trips, "PX", open_ms + tonumber(ARGV[4]))
+redis.call("DEL", KEYS[3], KEYS[4])
+return {1, open_ms}
+"""
+
+# KEYS: open, trips, probe, failures. Returns 1 if a tripped breaker closed.
+SUCCESS_SCRIPT = """
+local closed = redis.call("DEL", KEYS[2])
+redis.call("DEL", KEYS[3], KEYS[4])
+return closed
+"""
+
+
+class CircuitOpen(Exception):
+    """Provider circuit is open; retry after ``retry_after`` seconds."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} circuit is open, retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Redis-backed circuit breakers, one per provider."""
+
+    def __init__(self):
+        """Initialize breaker."""
+        self._scripts = None
+        self._scripts_client = None
+        # Providers last seen without failures (successes then skip Redis)
+        self._clean: Dict[str, bool] = {}
+
+    def _keys(self, provider: str):
+        return [
+            OPEN_KEY.format(provider),
+            TRIPS_KEY.format(provider),
+            PROBE_KEY.format(provider),
+            FAILURES_KEY.format(provider),
+        ]
+
+    def _get_scripts(self):
+        """Get Lua scripts registered on the current Redis client."""
+        redis = get_redis()
+        if self._scripts is None or self._scripts_client is not redis:
+            self._scripts = (
+                redis.register_script(CHECK_SCRIPT),
+                redis.register_script(FAILURE_SCRIPT),
+                redis.register_script(SUCCESS_SCRIPT),
+            )
+            self._scripts_client = redis
+        return self._scripts
+
+    async def check(self, provider: str) -> None:
+        """
+        Check that a call to the provider may be made.
+
+        Args:
+            provider: Provider name
+
+        Raises:
+            CircuitOpen: If the breaker is open, or half-open with a probe
+                already in flight
+        """
+        if not settings.circuit_breaker_enabled:
+            return
+
+        try:
+            check, _, _ = self._get_scripts()
+            allowed, retry_after_ms, clean = await check(
+                keys=self._keys(provider),
+                args=[int(settings.circuit_breaker_probe_timeout * 1000)],
+            )
+        except Exception as e:
+            logger.warning(f"Circuit breaker state unavailable for {provider}: {e}")
+            return
+
+        self._clean[provider] = bool(clean)
+
+        if not allowed:
+            # While a probe is in flight, come back after a base open period
+            retry_after = min(int(retry_after_ms) / 1000, settings.circuit_breaker_open_seconds)
+            raise CircuitOpen(provider, retry_after)
+
+    async def record_success(self, provider: str) -> None:
+        """
+        Record a successful call (closes a half-open breaker).
+
+        Args:
+            provider: Provider name
+        """
+        if not settings.circuit_breaker_enabled or self._clean.get(provider):
+            return
+
+        try:
+            _, _, success = self._get_scripts()
+            closed = await success(keys=self._keys(provider))
+        except Exception as e:
+            logger.warning(f"Failed to record {provider} success in circuit breaker: {e}")
+            return
+
+        self._clean[provider] = True
+        if closed:
+            logger.info(f"Circuit for {provider} closed")
+
+    async def record_failure(self, provider: str) -> None:
+        """
+        Record a failed call (may open the breaker).
+
+        Args:
+            provider: Provider name
+        """
+        if not settings.circuit_breaker_enabled:
+            return
+
+        self._clean[provider] = False
+
+        try:
+            _, failure, _ = self._get_scripts()
+            opened, open_ms = await failure(
+                keys=self._keys(provider),
+                args=[
+                    int(settings.circuit_breaker_failure_window * 1000),
+                    settings.circuit_breaker_failure_threshold,
+                    int(settings.circuit_breaker_open_seconds * 1000),
+                    int(settings.circuit_breaker_max_open_seconds * 1000),
+                ],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record {provider} failure in circuit breaker: {e}")
+            return
+
+        if opened:
+            logger.error(f"Circuit for {provider} opened for {int(open_ms) / 1000:.1f}s")
+
+    async def get_state(self, provider: str) -> Dict[str, Any]:
+        """
+        Get breaker state of a provider.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            Dict with state ("closed", "open", "half_open"), recent failures,
+            consecutive trips and seconds until an open breaker may close
+        """
+        open_key, trips_key, _, failures_key = self._keys(provider)
+
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.pttl(open_key)
+        pipe.get(trips_key)
+        pipe.get(failures_key)
+        open_ttl, trips, failures = await pipe.execute()
+
+        if open_ttl > 0:
+            state = "open"
+        elif trips:
+            state = "half_open"
+        else:
+            state = "closed"
+
+        return {
+            "state": state,
+            "failures": int(failures or 0),
+            "trips": int(trips or 0),
+            "retry_in": round(open_ttl / 1000, 1) if open_ttl > 0 else None,
+        }
+
+    async def get_states(self, providers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get breaker state of several providers."""
+        return {provider: await self.get_state(provider) for provider in providers}
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """httpx transport recording call outcomes in a provider's breaker."""
+
+    def __init__(
+        self,
+        provider: str,
+        transport: httpx.AsyncBaseTransport,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            provider: Provider name
+            transport: Transport performing the requests
+            breaker: Circuit breaker (the global one by default)
+        """
+        self.provider = provider
+        self.transport = transport
+        self.breaker = breaker or circuit_breaker
+        self._pending: Set[asyncio.Task] = set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            # Connect/read timeouts, refused connections, protocol errors
+            await self.breaker.record_failure(self.provider)
+            raise
+        except asyncio.CancelledError:
+            # Caller gave up waiting (hanging provider); record without
+            # delaying the cancellation
+            task = asyncio.ensure_future(self.breaker.record_failure(self.provider))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+            raise
+
+        if response.status_code >= 500:
+            await self.breaker.record_failure(self.provider)
+        else:
+            await self.breaker.record_success(self.provider)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# Global circuit breaker instance
+circuit_breaker = CircuitBreaker()
@@ -1,6 +1,6 @@
 """Application configuration."""
 
-from typing import List
+from typing import Any, Dict, List
 from pydantic import Field, PostgresDsn, RedisDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -39,16 +39,90 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: RedisDsn = Field(..., alias="REDIS_URL")
+    redis_max_connections: int = Field(default=100, alias="REDIS_MAX_CONNECTIONS")
+    redis_socket_timeout: float = Field(default=0.5, alias="REDIS_SOCKET_TIMEOUT")
 
     # Celery
     celery_broker_url: str = Field(..., alias="CELERY_BROKER_URL")
     celery_result_backend: str = Field(..., alias="CELERY_RESULT_BACKEND")
+    celery_worker_pools: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        alias="CELERY_WORKER_POOLS"
+    )
+
+    # Leads
+    lead_batch_max_size: int = Field(default=500, alias="LEAD_BATCH_MAX_SIZE")
+    lead_dedup_enabled: bool = Field(default=True, alias="LEAD_DEDUP_ENABLED")
+    lead_dedup_window: int = Field(default=600, alias="LEAD_DEDUP_WINDOW")  # seconds
+
+    # Orchestrator contact chain (tenants override with widget_config["fallback_chain"])
+    contact_fallback_chain: List[str] = Field(default_factory=list, alias="CONTACT_FALLBACK_CHAIN")
+    contact_step_timeout: float = Field(default=15.0, alias="CONTACT_STEP_TIMEOUT")
+
+    # Speed to lead (p95 time-to-first-contact SLO; bulk and reminder tasks
+    # are deferred while it is breached)
+    first_contact_slo: float = Field(default=30.0, alias="FIRST_CONTACT_SLO")  # seconds
+    first_contact_slo_window: int = Field(default=60, alias="FIRST_CONTACT_SLO_WINDOW")  # seconds
+    bulk_throttle_enabled: bool = Field(default=True, alias="BULK_THROTTLE_ENABLED")
+    bulk_defer_seconds: float = Field(default=30.0, alias="BULK_DEFER_SECONDS")
+
+    # Idempotency-Key (stored responses / lock while the first request runs, seconds)
+    idempotency_ttl: int = Field(default=86400, alias="IDEMPOTENCY_TTL")
+    idempotency_lock_ttl: float = Field(default=10.0, alias="IDEMPOTENCY_LOCK_TTL")
+
+    # Tenant resolution cache
+    tenant_cache_size: int = Field(default=10000, alias="TENANT_CACHE_SIZE")
+    tenant_cache_ttl: float = Field(default=30.0, alias="TENANT_CACHE_TTL")
+    tenant_negative_cache_ttl: float = Field(default=5.0, alias="TENANT_NEGATIVE_CACHE_TTL")
+    tenant_redis_ttl: int = Field(default=300, alias="TENANT_REDIS_TTL")
+
+    # Lead status buffer (orchestrator)
+    lead_status_flush_interval: float = Field(default=0.05, alias="LEAD_STATUS_FLUSH_INTERVAL")
+    lead_status_flush_max_rows: int = Field(default=100, alias="LEAD_STATUS_FLUSH_MAX_ROWS")
+
+    # Message templates
+    template_cache_size: int = Field(default=1000, alias="TEMPLATE_CACHE_SIZE")
+    template_cache_ttl: float = Field(default=60.0, alias="TEMPLATE_CACHE_TTL")
+
+    # Outbox relay
+    outbox_batch_size: int = Field(default=100, alias="OUTBOX_BATCH_SIZE")
+    outbox_poll_interval: float = Field(default=0.2, alias="OUTBOX_POLL_INTERVAL")
+    outbox_retention_hours: int = Field(default=24, alias="OUTBOX_RETENTION_HOURS")
+    outbox_max_attempts: int = Field(default=10, alias="OUTBOX_MAX_ATTEMPTS")
+
+    # Outbound HTTP (shared provider clients)
+    http_connect_timeout: float = Field(default=5.0, alias="HTTP_CONNECT_TIMEOUT")
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=30.0, alias="HTTP_KEEPALIVE_EXPIRY")
+    http2_enabled: bool = Field(default=True, alias="HTTP2_ENABLED")
+    http_provider_overrides: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        alias="HTTP_PROVIDER_OVERRIDES"
+    )
+
+    # Provider circuit breakers (seconds)
+    circuit_breaker_enabled: bool = Field(default=True, alias="CIRCUIT_BREAKER_ENABLED")
+    circuit_breaker_failure_threshold: int = Field(default=5, alias="CIRCUIT_BREAKER_FAILURE_THRESHOLD")
+    circuit_breaker_failure_window: float = Field(default=60.0, alias="CIRCUIT_BREAKER_FAILURE_WINDOW")
+    circuit_breaker_open_seconds: float = Field(default=30.0, alias="CIRCUIT_BREAKER_OPEN_SECONDS")
+    circuit_breaker_max_open_seconds: float = Field(default=600.0, alias="CIRCUIT_BREAKER_MAX_OPEN_SECONDS")
+    circuit_breaker_probe_timeout: float = Field(default=30.0, alias="CIRCUIT_BREAKER_PROBE_TIMEOUT")
+
+    # Outbound rate governor (shared provider token buckets)
+    rate_governor_enabled: bool = Field(default=True, alias="RATE_GOVERNOR_ENABLED")
+    rate_governor_max_wait: float = Field(default=2.0, alias="RATE_GOVERNOR_MAX_WAIT")
+    provider_rate_limits: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        alias="PROVIDER_RATE_LIMITS"
+    )
 
     # SMSC.ru (SMS provider)
     smsc_login: str = Field(default="", alias="SMSC_LOGIN")
     smsc_password: str = Field(default="", alias="SMSC_PASSWORD")
     smsc_sender: str = Field(default="FastLead", alias="SMSC_SENDER")
     smsc_api_url: str = Field(default="https://smsc.ru/sys/send.php", alias="SMSC_API_URL")
+    smsc_batch_max_recipients: int = Field(default=100, alias="SMSC_BATCH_MAX_RECIPIENTS")
 
     # Cal.com (Appointment booking)
     calcom_api_key: str = Field(default="", alias="CALCOM_API_KEY")
@@ -56,6 +130,34 @@ class Settings(BaseSettings):
     calcom_event_type_id: int = Field(default=0, alias="CALCOM_EVENT_TYPE_ID")
     calcom_webhook_secret: str = Field(default="", alias="CALCOM_WEBHOOK_SECRET")
 
+    # Single-flight upstream reads (coalesce across processes via a Redis lock;
+    # lock TTL bounds the wait for another process, seconds)
+    single_flight_redis_enabled: bool = Field(default=True, alias="SINGLE_FLIGHT_REDIS_ENABLED")
+    single_flight_lock_ttl: float = Field(default=10.0, alias="SINGLE_FLIGHT_LOCK_TTL")
+    single_flight_result_ttl: float = Field(default=0.5, alias="SINGLE_FLIGHT_RESULT_TTL")
+
+    # Cal.com availability cache (seconds: fresh / served stale while refreshing / in-process)
+    availability_cache_ttl: float = Field(default=30.0, alias="AVAILABILITY_CACHE_TTL")
+    availability_stale_ttl: int = Field(default=300, alias="AVAILABILITY_STALE_TTL")
+    availability_local_ttl: float = Field(default=5.0, alias="AVAILABILITY_LOCAL_TTL")
+    availability_cache_size: int = Field(default=1000, alias="AVAILABILITY_CACHE_SIZE")
+
+    # Slot index (slots are held while being booked in Cal.com, seconds)
+    slot_index_enabled: bool = Field(default=True, alias="SLOT_INDEX_ENABLED")
+    slot_hold_ttl: float = Field(default=45.0, alias="SLOT_HOLD_TTL")
+
+    # Asynchronous booking (202 + booking request; always, or with Prefer: respond-async)
+    booking_async_default: bool = Field(default=False, alias="BOOKING_ASYNC_DEFAULT")
+    booking_request_ttl: int = Field(default=3600, alias="BOOKING_REQUEST_TTL")  # seconds
+    booking_events_timeout: float = Field(default=60.0, alias="BOOKING_EVENTS_TIMEOUT")  # seconds
+
+    # Webhook queue (events are acked right away and applied by app.webhook_consumer)
+    webhook_queue_enabled: bool = Field(default=True, alias="WEBHOOK_QUEUE_ENABLED")
+    webhook_stream_partitions: int = Field(default=8, alias="WEBHOOK_STREAM_PARTITIONS")
+    webhook_stream_maxlen: int = Field(default=100000, alias="WEBHOOK_STREAM_MAXLEN")
+    webhook_max_attempts: int = Field(default=5, alias="WEBHOOK_MAX_ATTEMPTS")
+    webhook_retry_backoff: float = Field(default=1.0, alias="WEBHOOK_RETRY_BACKOFF")  # seconds
+
     # SMTP (Email sending)
     smtp_host: str = Field(default="", alias="SMTP_HOST")
     smtp_port: int = Field(default=587, alias="SMTP_PORT")
@@ -64,6 +166,12 @@ class Settings(BaseSettings):
     smtp_from_email: str = Field(default="noreply@fast-lead.ru", alias="SMTP_FROM_EMAIL")
     smtp_from_name: str = Field(default="Fast Lead", alias="SMTP_FROM_NAME")
     smtp_use_tls: bool = Field(default=True, alias="SMTP_USE_TLS")
+    smtp_timeout: float = Field(default=30.0, alias="SMTP_TIMEOUT")
+    smtp_pool_size: int = Field(default=4, alias="SMTP_POOL_SIZE")
+    smtp_pool_idle_timeout: float = Field(default=60.0, alias="SMTP_POOL_IDLE_TIMEOUT")
+    smtp_max_messages_per_connection: int = Field(default=100, alias="SMTP_MAX_MESSAGES_PER_CONNECTION")
+    smtp_async_max_connections_per_host: int = Field(default=20, alias="SMTP_ASYNC_MAX_CONNECTIONS_PER_HOST")
+    email_async_enabled: bool = Field(default=True, alias="EMAIL_ASYNC_ENABLED")
 
     # VK API
     vk_access_token: str = Field(default="", alias="VK_ACCESS_TOKEN")
@@ -78,6 +186,7 @@ class Settings(BaseSettings):
     whatsapp_access_token: str = Field(default="", alias="WHATSAPP_ACCESS_TOKEN")
     whatsapp_phone_number_id: str = Field(default="", alias="WHATSAPP_PHONE_NUMBER_ID")
     whatsapp_api_version: str = Field(default="v18.0", alias="WHATSAPP_API_VERSION")
+    whatsapp_api_url: str = Field(default="https://graph.facebook.com", alias="WHATSAPP_API_URL")
     whatsapp_verify_token: str = Field(default="", alias="WHATSAPP_VERIFY_TOKEN")
 
     # JWT
@@ -97,7 +206,10 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
-    rate_limit_per_minute: int = Field(default=100, alias="RATE_LIMIT_PER_MINUTE")
+    rate_limit_per_minute: int = Field(default=100, alias="RATE_LIMIT_PER_MINUTE")  # per IP, 0 = off
+    rate_limit_per_phone_per_minute: int = Field(default=5, alias="RATE_LIMIT_PER_PHONE_PER_MINUTE")
+    # Proxies (IPs/CIDRs) whose X-Forwarded-For gives the client IP
+    rate_limit_trusted_proxies: List[str] = Field(default_factory=list, alias="RATE_LIMIT_TRUSTED_PROXIES")
 
     @property
     def database_url_str(self) -> str:
@@ -1,8 +1,9 @@
 """Database configuration and session management."""
 
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 from app.core.config import settings
 
 # Create async engine
@@ -25,6 +26,36 @@ async_session_maker = async_sessionmaker(
 Base = declarative_base()
 
 
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state) -> None:
+    """Mark the session as having uncommitted writes after a non-SELECT statement."""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session, flush_context) -> None:
+    """Mark the session as having uncommitted writes after a flush."""
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_writes(session) -> None:
+    """Clear the write marker once the transaction is finished."""
+    session.info.pop("has_writes", None)
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Check whether the session has changes that still need a COMMIT."""
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get("has_writes")
+    )
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting async database session.
@@ -37,7 +68,10 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            # Skip the COMMIT round-trip if the handler already committed
+            # or only read data
+            if has_pending_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
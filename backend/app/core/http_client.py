@@ -0,0 +1,144 @@
+"""Shared HTTP clients for channel providers.
+
+Every provider (SMSC, Cal.com, WhatsApp, Telegram, VK) gets one long-lived
+``httpx.AsyncClient`` per process, so TCP/TLS connections are kept alive and
+reused between messages instead of being re-established on every call.
+
+Clients are opened in the FastAPI lifespan and at Celery worker init, and
+closed on shutdown. Pool limits, timeouts and HTTP/2 can be tuned per provider
+through ``HTTP_PROVIDER_OVERRIDES``, e.g.::
+
+    HTTP_PROVIDER_OVERRIDES='{"smsc": {"timeout": 15, "max_connections": 50}}'
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.circuit_breaker import CircuitBreakerTransport
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Default settings per provider; anything not listed falls back to the
+# global HTTP_* settings
+PROVIDER_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "smsc": {"timeout": 30.0, "http2": False},
+    "calcom": {"timeout": 10.0, "http2": True},
+    "whatsapp": {"timeout": 30.0, "http2": True},
+    "telegram": {"timeout": 30.0, "http2": True},
+    "vk": {"timeout": 30.0, "http2": True},
+}
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientRegistry:
+    """Process-wide registry of pooled HTTP clients, one per provider."""
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+
+    def get_config(self, provider: str) -> Dict[str, Any]:
+        """
+        Get effective client configuration for a provider.
+
+        Args:
+            provider: Provider name (e.g., "smsc", "whatsapp")
+
+        Returns:
+            Dict with timeout, connect_timeout, pool limits and http2 flag
+        """
+        config = {
+            "timeout": 30.0,
+            "connect_timeout": settings.http_connect_timeout,
+            "max_connections": settings.http_max_connections,
+            "max_keepalive_connections": settings.http_max_keepalive_connections,
+            "keepalive_expiry": settings.http_keepalive_expiry,
+            "http2": settings.http2_enabled,
+        }
+        config.update(PROVIDER_DEFAULTS.get(provider, {}))
+        config.update(settings.http_provider_overrides.get(provider, {}))
+        config["http2"] = bool(config["http2"]) and settings.http2_enabled and HTTP2_AVAILABLE
+        return config
+
+    def _create_client(self, provider: str) -> httpx.AsyncClient:
+        """Create a pooled client for a provider (outcomes feed its circuit breaker)."""
+        config = self.get_config(provider)
+
+        transport = httpx.AsyncHTTPTransport(
+            http2=config["http2"],
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+        )
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(config["timeout"], connect=config["connect_timeout"]),
+            transport=CircuitBreakerTransport(provider, transport),
+        )
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for a provider, creating it if needed.
+
+        Connections are bound to the event loop they were opened on, so a
+        client created on another (e.g. already closed) loop is replaced.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            Pooled httpx.AsyncClient
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        entry = self._clients.get(provider)
+        if entry is not None:
+            client, client_loop = entry
+            if not client.is_closed and (client_loop is None or client_loop is loop):
+                if client_loop is None:
+                    self._clients[provider] = (client, loop)
+                return client
+
+        client = self._create_client(provider)
+        self._clients[provider] = (client, loop)
+        return client
+
+    async def start(self) -> None:
+        """Open clients for all known providers."""
+        for provider in PROVIDER_DEFAULTS:
+            self.get(provider)
+
+        if settings.http2_enabled and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 enabled but 'h2' package is not installed, using HTTP/1.1")
+
+        logger.info(f"HTTP clients started for: {', '.join(self._clients)}")
+
+    async def aclose(self) -> None:
+        """Close all clients and release their connections."""
+        clients, self._clients = self._clients, {}
+
+        for provider, (client, _) in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Failed to close HTTP client for {provider}: {e}")
+
+
+# Global registry instance
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Get the shared HTTP client for a provider."""
+    return http_clients.get(provider)
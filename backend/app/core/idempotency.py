@@ -0,0 +1,256 @@
+"""Idempotency-Key support for creating endpoints.
+
+A client sending ``Idempotency-Key: <unique value>`` with
+``POST /api/v1/leads`` or ``POST /api/v1/bookings`` can retry the request
+after a timeout without creating a second lead or Cal.com booking:
+
+* The first request takes a short lock in Redis, runs normally, and its
+  response is stored for ``IDEMPOTENCY_TTL`` seconds. The lock is renewed
+  while the request runs, however long the handler waits (e.g. on Cal.com).
+* A retry with the same key gets the stored response (with
+  ``Idempotent-Replayed: true``) without touching Postgres or Cal.com.
+* A retry arriving while the first request is still running waits for its
+  response (up to ``IDEMPOTENCY_LOCK_TTL``), then gets ``409``.
+* Reusing a key with a different body is rejected with ``422``.
+
+Keys are scoped by tenant header, method and path. Lookup and lock take a
+single Redis round-trip. 5xx and 429 responses are not stored, so those
+can be retried. If Redis is unavailable, requests run without idempotency.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from app.core.asgi import read_body, send_json
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+RESPONSE_KEY = "idem:resp:{}"
+LOCK_KEY = "idem:lock:{}"
+
+# Poll interval while waiting for a concurrent request with the same key
+WAIT_INTERVAL = 0.05
+
+# KEYS: response key, lock key. ARGV: lock token, lock TTL (ms).
+# Returns {"cached", response}, {"acquired"} or {"locked"}.
+LOOKUP_SCRIPT = """
+local cached = redis.call("GET", KEYS[1])
+if cached then
+    return {"cached", cached}
+end
+if redis.call("SET", KEYS[2], ARGV[1], "NX", "PX", ARGV[2]) then
+    return {"acquired"}
+end
+return {"locked"}
+"""
+
+# KEYS: lock key. ARGV: lock token, lock TTL (ms). Extends the lock only if still ours.
+RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# KEYS: lock key. ARGV: lock token. Deletes the lock only if still ours.
+UNLOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware storing and replaying responses by Idempotency-Key."""
+
+    def __init__(self, app, paths: Optional[List[str]] = None):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application
+            paths: Paths of POST endpoints to handle (lead and booking
+                creation by default)
+        """
+        self.app = app
+        self.paths = set(paths or [
+            f"{settings.api_v1_prefix}/leads",
+            f"{settings.api_v1_prefix}/bookings",
+        ])
+        self._scripts = None
+        self._scripts_client = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(HEADER)
+
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await send_json(send, 400, {"detail": "Invalid Idempotency-Key header"})
+            return
+
+        body, receive = await read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        # Same key from different tenants or endpoints never collides
+        scope_key = b"|".join([
+            headers.get(b"x-widget-key") or headers.get(b"x-tenant-id") or b"",
+            scope["method"].encode(),
+            scope["path"].encode(),
+            idempotency_key,
+        ])
+        key = hashlib.sha256(scope_key).hexdigest()
+        token = uuid.uuid4().hex
+
+        try:
+            lookup, unlock, _ = self._get_scripts()
+            result = await lookup(
+                keys=[RESPONSE_KEY.format(key), LOCK_KEY.format(key)],
+                args=[token, int(settings.idempotency_lock_ttl * 1000)],
+            )
+        except Exception as e:
+            logger.warning(f"Idempotency store unavailable, running request as is: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if result[0] == "cached":
+            await self._replay(send, result[1], fingerprint)
+            return
+
+        if result[0] == "locked":
+            cached = await self._wait_for_response(key)
+            if cached is None:
+                await send_json(
+                    send,
+                    409,
+                    {"detail": "A request with this Idempotency-Key is in progress"},
+                    headers=[(b"retry-after", b"1")],
+                )
+            else:
+                await self._replay(send, cached, fingerprint)
+            return
+
+        response = {"status": None, "headers": [], "body": []}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        renewal = asyncio.create_task(self._renew_lock(key, token))
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            renewal.cancel()
+            await self._store(key, token, unlock, response, fingerprint)
+
+    def _get_scripts(self):
+        """Get Lua scripts registered on the current Redis client."""
+        redis = get_redis()
+        if self._scripts is None or self._scripts_client is not redis:
+            self._scripts = (
+                redis.register_script(LOOKUP_SCRIPT),
+                redis.register_script(UNLOCK_SCRIPT),
+                redis.register_script(RENEW_SCRIPT),
+            )
+            self._scripts_client = redis
+        return self._scripts
+
+    async def _renew_lock(self, key: str, token: str) -> None:
+        """Keep the lock of a running request from expiring (until cancelled)."""
+        interval = settings.idempotency_lock_ttl / 3
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                _, _, renew = self._get_scripts()
+                if not await renew(
+                    keys=[LOCK_KEY.format(key)],
+                    args=[token, int(settings.idempotency_lock_ttl * 1000)],
+                ):
+                    logger.warning("Idempotency lock lost while the request was running")
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew idempotency lock: {e}")
+
+    async def _store(self, key: str, token: str, unlock, response: dict, fingerprint: str) -> None:
+        """Store a completed response (unless it may be retried) and release the lock."""
+        status = response["status"]
+
+        try:
+            if status is not None and status < 500 and status != 429:
+                data = json.dumps({
+                    "status": status,
+                    "headers": [
+                        [name.decode("latin-1"), value.decode("latin-1")]
+                        for name, value in response["headers"]
+                    ],
+                    "body": base64.b64encode(b"".join(response["body"])).decode(),
+                    "fingerprint": fingerprint,
+                })
+                await get_redis().set(RESPONSE_KEY.format(key), data, ex=settings.idempotency_ttl)
+
+            await unlock(keys=[LOCK_KEY.format(key)], args=[token])
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response: {e}")
+
+    async def _wait_for_response(self, key: str) -> Optional[str]:
+        """Wait for the response of a concurrent request with the same key."""
+        deadline = time.monotonic() + settings.idempotency_lock_ttl
+        redis = get_redis()
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(WAIT_INTERVAL)
+            try:
+                cached = await redis.get(RESPONSE_KEY.format(key))
+                if cached is not None:
+                    return cached
+                if not await redis.exists(LOCK_KEY.format(key)):
+                    # First request failed without storing a response
+                    return None
+            except Exception as e:
+                logger.warning(f"Idempotency store unavailable while waiting: {e}")
+                return None
+
+        return None
+
+    async def _replay(self, send, cached: str, fingerprint: str) -> None:
+        """Send a stored response."""
+        data = json.loads(cached)
+
+        if data["fingerprint"] != fingerprint:
+            await send_json(
+                send, 422, {"detail": "Idempotency-Key was already used with a different request body"}
+            )
+            return
+
+        headers: List[Tuple[bytes, bytes]] = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in data["headers"]
+        ]
+        headers.append((b"idempotent-replayed", b"true"))
+
+        await send({"type": "http.response.start", "status": data["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(data["body"])})
@@ -0,0 +1,213 @@
+"""Outbound rate governor for channel providers.
+
+Providers cap throughput (Telegram: ~30 msg/s per bot and 1 msg/s per chat,
+VK: 20 req/s per community token, ...). Instead of sending and retrying on
+429s, services take capacity from shared token buckets before every API
+call. Buckets live in Redis (the same Lua token bucket as the API rate
+limiter), so the limits hold across all Celery workers:
+
+* per provider and credential (account login, bot token, phone number ID)
+* per recipient, for providers that limit messages to one chat/user
+
+``acquire()`` first checks the provider's circuit breaker (``CircuitOpen``
+while it is open), then waits up to ``RATE_GOVERNOR_MAX_WAIT`` seconds for
+capacity and otherwise raises ``RateLimited``; tasks based on
+``ThrottledTask`` then retry with the error's ``retry_after`` as countdown. Limits can be tuned through
+``PROVIDER_RATE_LIMITS``, e.g.::
+
+    PROVIDER_RATE_LIMITS='{"smsc": {"rate": 50}, "telegram": {"recipient_rate": 0.5}}'
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from celery import Task
+from celery.exceptions import Reject, Retry
+
+from app.core.async_runtime import run_async
+from app.core.circuit_breaker import CircuitOpen, circuit_breaker
+from app.core.config import settings
+from app.core.rate_limit import Bucket, RateLimiter
+from app.core.speed_to_lead import speed_to_lead
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size per provider credential, and per
+# recipient where the provider limits it
+PROVIDER_LIMITS: Dict[str, Dict[str, Any]] = {
+    "smsc": {"rate": 30.0, "burst": 30},
+    "whatsapp": {"rate": 80.0, "burst": 80},
+    "telegram": {"rate": 30.0, "burst": 30, "recipient_rate": 1.0, "recipient_burst": 1},
+    "vk": {"rate": 20.0, "burst": 20, "recipient_rate": 1.0, "recipient_burst": 1},
+}
+
+
+class RateLimited(Exception):
+    """Provider capacity is exhausted; retry after ``retry_after`` seconds."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"{provider} rate limit reached, retry in {retry_after:.2f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class RateGovernor:
+    """Distributed token buckets for outbound provider calls."""
+
+    def __init__(self, limiter: Optional[RateLimiter] = None):
+        """
+        Initialize governor.
+
+        Args:
+            limiter: Token bucket limiter (a new one by default)
+        """
+        self.limiter = limiter or RateLimiter()
+
+    def get_limits(self, provider: str) -> Dict[str, Any]:
+        """
+        Get effective limits of a provider.
+
+        Args:
+            provider: Provider name (e.g., "smsc", "telegram")
+
+        Returns:
+            Dict with rate/burst and optional recipient_rate/recipient_burst
+        """
+        limits = dict(PROVIDER_LIMITS.get(provider, {}))
+        limits.update(settings.provider_rate_limits.get(provider, {}))
+        return limits
+
+    def get_buckets(
+        self,
+        provider: str,
+        credential: Optional[str] = None,
+        recipient: Optional[Any] = None,
+    ) -> List[Bucket]:
+        """
+        Build the buckets one provider call is checked against.
+
+        Args:
+            provider: Provider name
+            credential: Account/token the call is made with (hashed for the key)
+            recipient: Chat/user ID, for providers with per-recipient limits
+
+        Returns:
+            List of buckets (empty if the provider has no limits)
+        """
+        limits = self.get_limits(provider)
+        credential_key = hashlib.sha1((credential or "").encode()).hexdigest()[:16]
+        buckets = []
+
+        if limits.get("rate"):
+            rate = float(limits["rate"])
+            burst = int(limits.get("burst") or max(1, rate))
+            buckets.append((f"governor:{provider}:{credential_key}", burst, rate))
+
+        if recipient is not None and limits.get("recipient_rate"):
+            rate = float(limits["recipient_rate"])
+            burst = int(limits.get("recipient_burst") or 1)
+            buckets.append((f"governor:{provider}:{credential_key}:{recipient}", burst, rate))
+
+        return buckets
+
+    async def acquire(
+        self,
+        provider: str,
+        credential: Optional[str] = None,
+        recipient: Optional[Any] = None,
+        max_wait: Optional[float] = None,
+    ) -> None:
+        """
+        Take capacity for one provider call, waiting briefly if needed.
+
+        Args:
+            provider: Provider name
+            credential: Account/token the call is made with
+            recipient: Chat/user ID, for providers with per-recipient limits
+            max_wait: Max seconds to wait (RATE_GOVERNOR_MAX_WAIT by default)
+
+        Raises:
+            CircuitOpen: If the provider's circuit breaker is open
+            RateLimited: If capacity is not available within max_wait
+        """
+        await circuit_breaker.check(provider)
+
+        if not settings.rate_governor_enabled:
+            return
+
+        buckets = self.get_buckets(provider, credential, recipient)
+        if max_wait is None:
+            max_wait = settings.rate_governor_max_wait
+        deadline = time.monotonic() + max_wait
+
+        while True:
+            retry_after = await self.limiter.acquire(buckets)
+            if retry_after <= 0:
+                return
+
+            if time.monotonic() + retry_after > deadline:
+                logger.info(f"{provider} rate limit reached, deferring for {retry_after:.2f}s")
+                raise RateLimited(provider, retry_after)
+
+            await asyncio.sleep(retry_after)
+
+
+class ThrottledTask(Task):
+    """
+    Base task that defers itself when a provider is rate limited or down.
+
+    ``RateLimited`` and ``CircuitOpen`` errors re-send the task after their
+    ``retry_after`` (plus jitter, so deferred tasks do not return at once).
+    Deferrals keep ``request.retries`` unchanged, so they are not limited by
+    ``max_retries`` and don't use up the retries of real failures. The
+    worker holds deferred tasks without using an execution slot. When the
+    task is called directly from another task, the error propagates to the
+    calling task instead.
+
+    Bulk and reminder tasks (``bulk=True``) are also deferred, by
+    ``BULK_DEFER_SECONDS``, while first contact is slower than its SLO.
+    """
+
+    bulk = False
+
+    def __call__(self, *args, **kwargs):
+        if self.bulk and not self.request.called_directly:
+            if run_async(speed_to_lead.should_defer_bulk()):
+                self.defer(settings.bulk_defer_seconds * (1 + random.random()))
+
+        try:
+            return super().__call__(*args, **kwargs)
+        except (RateLimited, CircuitOpen) as e:
+            if self.request.called_directly:
+                raise
+            self.defer(e.retry_after * (1 + random.random()), exc=e)
+
+    def defer(self, countdown: float, exc: Optional[Exception] = None) -> None:
+        """
+        Re-send the running task after a delay without counting a retry.
+
+        Args:
+            countdown: Delay in seconds
+            exc: Error that caused the deferral (reported with the retry)
+
+        Raises:
+            Retry: Always, to tell the worker the task was re-sent
+        """
+        request = self.request
+        signature = self.signature_from_request(request, countdown=countdown, retries=request.retries)
+
+        if not request.is_eager:
+            try:
+                signature.apply_async()
+            except Exception as e:
+                raise Reject(e, requeue=False)
+
+        raise Retry(exc=exc, when=countdown, is_eager=request.is_eager, sig=signature)
+
+
+# Global governor instance (one per process, buckets are shared via Redis)
+rate_governor = RateGovernor()
@@ -0,0 +1,348 @@
+"""Distributed rate limiting for public lead endpoints.
+
+Token buckets are kept in Redis and checked by a Lua script, so all API
+processes share the same limits and every request costs a single EVALSHA
+round-trip, however many buckets it is checked against. Each widget POST
+is checked against three buckets:
+
+* tenant - per-minute limit of the tenant's plan (``PLAN_LIMITS``)
+* IP     - ``RATE_LIMIT_PER_MINUTE`` (0 disables it). Behind a reverse
+  proxy, list it in ``RATE_LIMIT_TRUSTED_PROXIES``: the client IP is then
+  taken from ``X-Forwarded-For``, otherwise all clients share the proxy's
+  bucket.
+* phone  - ``RATE_LIMIT_PER_PHONE_PER_MINUTE`` (stops SMS pumping)
+
+A request is allowed only if every bucket has a token; otherwise nothing is
+consumed and the client gets ``429`` with ``Retry-After``. If Redis is down
+or slow, the same buckets are kept in process memory, so limits still apply
+(per process) instead of failing open.
+"""
+
+import ipaddress
+import json
+import logging
+import math
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.core.asgi import read_body, send_json
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit:"
+
+# KEYS: bucket keys. ARGV: now (ms), then capacity and refill rate
+# (tokens/ms) for every key. All buckets are checked before any token is
+# taken. Returns {allowed, retry_after_ms}.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local available = tonumber(bucket[1])
+
+    if available == nil then
+        available = capacity
+    else
+        local elapsed = math.max(0, now - tonumber(bucket[2]))
+        available = math.min(capacity, available + elapsed * rate)
+    end
+
+    tokens[i] = available
+    if available < 1 then
+        retry_after = math.max(retry_after, math.ceil((1 - available) / rate))
+    end
+end
+
+if retry_after > 0 then
+    return {0, retry_after}
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    redis.call("HSET", key, "tokens", tokens[i] - 1, "ts", now)
+    redis.call("PEXPIRE", key, math.ceil(capacity / rate))
+end
+
+return {1, 0}
+"""
+
+# Bucket: (key, capacity, refill rate in tokens per second)
+Bucket = Tuple[str, int, float]
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """
+    Normalize a phone number for use as a limiter key.
+
+    Args:
+        phone: Phone number as submitted
+
+    Returns:
+        Digits only, with a leading 8 of Russian numbers replaced by 7,
+        or None if there are too few digits
+    """
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) < 7:
+        return None
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    return digits
+
+
+class LocalTokenBuckets:
+    """In-process token buckets, used while Redis is unavailable."""
+
+    def __init__(self, max_size: int = 100_000):
+        """
+        Initialize buckets.
+
+        Args:
+            max_size: Max number of tracked keys (least recently used are dropped)
+        """
+        self._buckets = TTLCache(max_size=max_size, ttl=60.0)
+        self._lock = threading.Lock()
+
+    def acquire(self, buckets: List[Bucket]) -> float:
+        """
+        Take one token from every bucket, if all have one.
+
+        Args:
+            buckets: Buckets to check
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        state = []
+        retry_after = 0.0
+
+        with self._lock:
+            for key, capacity, rate in buckets:
+                entry = self._buckets.get(key)
+                if entry is None:
+                    available = float(capacity)
+                else:
+                    available, updated_at = entry
+                    available = min(capacity, available + (now - updated_at) * rate)
+
+                state.append(available)
+                if available < 1:
+                    retry_after = max(retry_after, (1 - available) / rate)
+
+            if retry_after > 0:
+                return retry_after
+
+            for (key, capacity, rate), available in zip(buckets, state):
+                self._buckets.set(key, (available - 1, now), ttl=capacity / rate)
+
+        return 0.0
+
+
+class RateLimiter:
+    """Checks requests against Redis token buckets (local buckets as fallback)."""
+
+    def __init__(self):
+        """Initialize limiter."""
+        self.local = LocalTokenBuckets()
+        self._script = None
+        self._script_client = None
+        self._redis_down = False
+
+    async def acquire(self, buckets: List[Bucket]) -> float:
+        """
+        Take one token from every bucket, if all have one.
+
+        Args:
+            buckets: Buckets to check
+
+        Returns:
+            0 if allowed, otherwise seconds until the request would be allowed
+        """
+        if not buckets:
+            return 0.0
+
+        try:
+            redis = get_redis()
+            if self._script is None or self._script_client is not redis:
+                # Script objects use EVALSHA and reload the script on NOSCRIPT
+                self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+                self._script_client = redis
+
+            args = [int(time.time() * 1000)]
+            for _, capacity, rate in buckets:
+                args.extend([capacity, rate / 1000])
+
+            allowed, retry_after_ms = await self._script(
+                keys=[KEY_PREFIX + key for key, _, _ in buckets],
+                args=args,
+            )
+        except Exception as e:
+            if not self._redis_down:
+                logger.warning(f"Rate limiter using local buckets, Redis unavailable: {e}")
+                self._redis_down = True
+            return self.local.acquire(buckets)
+
+        if self._redis_down:
+            logger.info("Rate limiter using Redis again")
+            self._redis_down = False
+
+        return 0.0 if allowed else int(retry_after_ms) / 1000
+
+
+def client_ip(scope, headers: Dict[str, str], trusted_proxies: List[Network]) -> Optional[str]:
+    """
+    Get the client IP of a request.
+
+    Args:
+        scope: ASGI scope
+        headers: Request headers (lower-case names)
+        trusted_proxies: Networks of reverse proxies allowed to set
+            X-Forwarded-For
+
+    Returns:
+        The right-most X-Forwarded-For address not belonging to a trusted
+        proxy if the peer is one, else the peer address (None if unknown)
+    """
+    client = scope.get("client")
+    if not client:
+        return None
+
+    def is_trusted(address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in trusted_proxies)
+
+    address = client[0]
+    if not trusted_proxies or not is_trusted(address):
+        return address
+
+    forwarded = [part.strip() for part in headers.get("x-forwarded-for", "").split(",") if part.strip()]
+    for hop in reversed(forwarded):
+        address = hop
+        if not is_trusted(hop):
+            break
+    return address
+
+
+def per_minute(key: str, limit: int) -> Bucket:
+    """Bucket allowing ``limit`` requests per minute (bursts up to ``limit``)."""
+    return (key, limit, limit / 60)
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware limiting lead submissions (``POST /api/v1/leads...``).
+
+    The tenant comes from X-Widget-Key / X-Tenant-Id, the phone from the JSON
+    body (which is buffered and replayed to the endpoint). Requests without a
+    known tenant are only limited per IP; the endpoint rejects them anyway.
+    """
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application
+            limiter: Rate limiter (a new one by default)
+        """
+        self.app = app
+        self.limiter = limiter or RateLimiter()
+        self.path_prefix = f"{settings.api_v1_prefix}/leads"
+        self.trusted_proxies = [
+            ipaddress.ip_network(proxy, strict=False)
+            for proxy in settings.rate_limit_trusted_proxies
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+            or not settings.rate_limit_enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body, receive = await read_body(receive)
+        buckets = await self._get_buckets(scope, body)
+        retry_after = await self.limiter.acquire(buckets)
+
+        if retry_after > 0:
+            await send_json(
+                send,
+                429,
+                {"detail": "Too many requests"},
+                headers=[(b"retry-after", str(max(1, math.ceil(retry_after))).encode())],
+            )
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _get_buckets(self, scope, body: bytes) -> List[Bucket]:
+        """Build the buckets a request is checked against."""
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        buckets = []
+
+        tenant_limit = await self._get_tenant_limit(headers)
+        if tenant_limit is not None:
+            tenant_id, limit = tenant_limit
+            buckets.append(per_minute(f"tenant:{tenant_id}", limit))
+
+        ip = client_ip(scope, headers, self.trusted_proxies)
+        if ip and settings.rate_limit_per_minute > 0:
+            buckets.append(per_minute(f"ip:{ip}", settings.rate_limit_per_minute))
+
+        phone = self._get_phone(body)
+        if phone:
+            buckets.append(per_minute(f"phone:{phone}", settings.rate_limit_per_phone_per_minute))
+
+        return buckets
+
+    async def _get_tenant_limit(self, headers: Dict[str, str]) -> Optional[Tuple[int, int]]:
+        """Get tenant ID and its per-minute limit (None if unknown or unlimited)."""
+        # Imported here: the tenant service depends on core modules
+        from app.services.tenant_service import tenant_resolver
+
+        try:
+            if headers.get("x-widget-key"):
+                tenant = await tenant_resolver.get_by_public_key(headers["x-widget-key"])
+            elif headers.get("x-tenant-id", "").isdigit():
+                tenant = await tenant_resolver.get_by_id(int(headers["x-tenant-id"]))
+            else:
+                return None
+        except Exception as e:
+            logger.error(f"Failed to resolve tenant for rate limiting: {e}")
+            return None
+
+        if tenant is None:
+            return None
+
+        limit = tenant.limits.get("requests_per_minute")
+        return (tenant.id, limit) if limit else None
+
+    @staticmethod
+    def _get_phone(body: bytes) -> Optional[str]:
+        """Get normalized phone from a single-lead JSON body."""
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+
+        phone = data.get("phone") if isinstance(data, dict) else None
+        return normalize_phone(phone) if isinstance(phone, str) else None
@@ -0,0 +1,135 @@
+"""Shared Redis client.
+
+One ``redis.asyncio`` connection pool per process, opened lazily and closed
+in the FastAPI lifespan / on Celery worker shutdown. Like the shared HTTP
+clients, the pool is bound to the event loop it was created on and is
+replaced when used from another loop.
+
+Socket timeouts are short on purpose: callers (tenant cache, rate limiter)
+treat Redis as an optimization and fall back when it is slow or down.
+Pub/sub subscriptions (``subscribe()``) use their own connection without a
+socket timeout, since an idle subscription is not an error.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Idle subscriptions are pinged this often (seconds)
+PUBSUB_HEALTH_CHECK_INTERVAL = 30.0
+
+# Delay before re-subscribing after a connection error (seconds)
+PUBSUB_RECONNECT_DELAY = 1.0
+
+_client: Optional[aioredis.Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Get the shared Redis client for the running event loop.
+
+    Returns:
+        Redis client (responses decoded to str)
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = aioredis.from_url(
+            settings.redis_url_str,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=settings.redis_max_connections,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+        _client_loop = loop
+
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client."""
+    global _client, _client_loop
+
+    client, _client, _client_loop = _client, None, None
+    if client is not None:
+        try:
+            await client.close()
+            await client.connection_pool.disconnect()
+        except Exception as e:
+            logger.error(f"Failed to close Redis client: {e}")
+
+
+async def subscribe(
+    channel: str,
+    on_message: Callable[[str], None],
+    on_reconnect: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    Call a handler for every message on a channel (runs until cancelled).
+
+    The subscription has its own connection: reads block until a message
+    arrives instead of timing out after ``REDIS_SOCKET_TIMEOUT``, and the
+    connection is pinged every ``PUBSUB_HEALTH_CHECK_INTERVAL`` seconds so
+    a dead one is noticed. After a connection error it subscribes again.
+
+    Args:
+        channel: Channel name
+        on_message: Called with the data of each message
+        on_reconnect: Called after subscribing again; messages published
+            while disconnected are lost, so local state may be stale
+    """
+    client = aioredis.from_url(
+        settings.redis_url_str,
+        encoding="utf-8",
+        decode_responses=True,
+        socket_timeout=None,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        socket_keepalive=True,
+        health_check_interval=PUBSUB_HEALTH_CHECK_INTERVAL,
+    )
+    reconnecting = False
+
+    try:
+        while True:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(channel)
+                logger.info(f"Subscribed to Redis channel {channel}")
+                if reconnecting and on_reconnect is not None:
+                    on_reconnect()
+                reconnecting = False
+
+                while True:
+                    # None when idle (or a health check reply)
+                    message = await pubsub.get_message(timeout=PUBSUB_HEALTH_CHECK_INTERVAL)
+                    if message is not None and message["type"] == "message":
+                        try:
+                            on_message(message["data"])
+                        except Exception as e:
+                            logger.error(f"Failed to handle message on {channel}: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Subscription to Redis channel {channel} lost: {e}, reconnecting")
+                reconnecting = True
+                await asyncio.sleep(PUBSUB_RECONNECT_DELAY)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+    finally:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
@@ -0,0 +1,208 @@
+"""Single-flight: coalesce concurrent calls for the same key.
+
+While a call for a key is running, other callers for that key wait for its
+result instead of starting their own, so a burst of cache misses makes one
+upstream request. The call runs as its own task: a caller that is cancelled
+(e.g. client disconnected) does not cancel it for the others.
+
+With ``shared=True`` calls are also coalesced across processes: the first
+process takes a short lock in Redis and runs the call, the others wait for
+its result (JSON-serializable), which is kept for ``SINGLE_FLIGHT_RESULT_TTL``
+seconds. A failed call stores its error (message, exception type and
+``retry_after`` if the exception has one), so waiters fail with
+``SharedCallError`` instead of each retrying upstream. If the lock holder
+does not finish within ``SINGLE_FLIGHT_LOCK_TTL``, or Redis is unavailable,
+waiters make the call themselves.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RESULT_KEY = "flight:{}:{}:result"
+LOCK_KEY = "flight:{}:{}:lock"
+
+# Poll interval while another process runs the call
+WAIT_INTERVAL = 0.02
+
+# KEYS: result key, lock key. ARGV: lock token, lock TTL (ms).
+# Returns {"result", value}, {"acquired"} or {"locked"}.
+LOOKUP_SCRIPT = """
+local result = redis.call("GET", KEYS[1])
+if result then
+    return {"result", result}
+end
+if redis.call("SET", KEYS[2], ARGV[1], "NX", "PX", ARGV[2]) then
+    return {"acquired"}
+end
+return {"locked"}
+"""
+
+# KEYS: result key, lock key. ARGV: lock token, result, result TTL (ms).
+# Stores the result and releases the lock if it is still ours.
+PUBLISH_SCRIPT = """
+redis.call("SET", KEYS[1], ARGV[2], "PX", ARGV[3])
+if redis.call("GET", KEYS[2]) == ARGV[1] then
+    redis.call("DEL", KEYS[2])
+end
+return 1
+"""
+
+
+class SharedCallError(Exception):
+    """The call made by another process failed."""
+
+    def __init__(self, message: str, error_type: Optional[str] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.retry_after = retry_after
+
+
+class SingleFlight:
+    """Per-key in-flight call registry (one event loop)."""
+
+    def __init__(self, namespace: Optional[str] = None):
+        """
+        Initialize registry.
+
+        Args:
+            namespace: Redis key namespace (required for shared calls)
+        """
+        self.namespace = namespace
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._scripts = None
+        self._scripts_client = None
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], shared: bool = False) -> T:
+        """
+        Run ``fn`` for a key, or join the call already running for it.
+
+        Args:
+            key: Call key (str for shared calls)
+            fn: Coroutine function making the call
+            shared: Coalesce with other processes through Redis
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            SharedCallError: If the call made by another process failed
+            Exception: Whatever the call raised
+        """
+        if shared:
+            local_fn = fn
+            fn = lambda: self._do_shared(key, local_fn)
+        return await asyncio.shield(self.start(key, fn))
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        """
+        Start ``fn`` for a key in the background, unless already running.
+
+        Errors of background calls nobody awaits are logged.
+
+        Args:
+            key: Call key
+            fn: Coroutine function making the call
+
+        Returns:
+            Task of the (new or running) call
+        """
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return task
+
+        task = asyncio.create_task(fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check if a call for the key is running."""
+        return key in self._calls
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Single-flight call {key!r} failed: {task.exception()}")
+
+    def _get_scripts(self):
+        """Get Lua scripts registered on the current Redis client."""
+        redis = get_redis()
+        if self._scripts is None or self._scripts_client is not redis:
+            self._scripts = (
+                redis.register_script(LOOKUP_SCRIPT),
+                redis.register_script(PUBLISH_SCRIPT),
+            )
+            self._scripts_client = redis
+        return self._scripts
+
+    async def _do_shared(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the call once across processes."""
+        if not settings.single_flight_redis_enabled:
+            return await fn()
+
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        keys = [RESULT_KEY.format(self.namespace, digest), LOCK_KEY.format(self.namespace, digest)]
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.single_flight_lock_ttl
+
+        try:
+            lookup, publish = self._get_scripts()
+            while True:
+                result = await lookup(keys=keys, args=[token, int(settings.single_flight_lock_ttl * 1000)])
+                if result[0] == "result":
+                    return self._unpack(result[1])
+                if result[0] == "acquired":
+                    break
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Single-flight call {key!r} did not finish in time, calling directly")
+                    return await fn()
+                await asyncio.sleep(WAIT_INTERVAL)
+        except SharedCallError:
+            raise
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable, calling directly: {e}")
+            return await fn()
+
+        try:
+            value = await fn()
+        except Exception as e:
+            await self._publish(publish, keys, token, {
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "retry_after": getattr(e, "retry_after", None),
+            })
+            raise
+
+        await self._publish(publish, keys, token, {"value": value})
+        return value
+
+    async def _publish(self, publish, keys, token: str, outcome: Dict[str, Any]) -> None:
+        """Store the outcome for waiting processes and release the lock."""
+        try:
+            await publish(
+                keys=keys,
+                args=[token, json.dumps(outcome), int(settings.single_flight_result_ttl * 1000)],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish single-flight result: {e}")
+
+    @staticmethod
+    def _unpack(raw: str) -> Any:
+        outcome = json.loads(raw)
+        if "error" in outcome:
+            raise SharedCallError(outcome["error"], outcome.get("error_type"), outcome.get("retry_after"))
+        return outcome["value"]
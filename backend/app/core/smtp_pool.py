@@ -0,0 +1,258 @@
+"""Pooled SMTP connections for the email channel.
+
+Opening an SMTP session costs several round-trips (greeting, EHLO, STARTTLS
+handshake, EHLO again, AUTH) before the first message can be sent. The pool
+keeps authenticated sessions alive per process and sends many messages over
+each one. A session that the server closed (``421``, disconnect, timeout) is
+dropped and the message is resent once on a fresh session.
+
+Usage::
+
+    with smtp_pool.connection() as conn:
+        conn.server.send_message(msg)
+
+or simply ``smtp_pool.send(msg)`` / ``smtp_pool.send_many(messages)``.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import smtplib
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the session is unusable and the send can be repeated
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, socket.timeout, ConnectionError)
+
+
+def is_reconnect_error(error: Exception) -> bool:
+    """Check whether an SMTP error means the session must be reopened."""
+    if isinstance(error, RECONNECT_ERRORS):
+        return True
+
+    # 421: service not available, closing transmission channel
+    return getattr(error, "smtp_code", None) == 421
+
+
+class PooledSMTP:
+    """SMTP session with bookkeeping for the pool."""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+        self.broken = False
+
+    def close(self) -> None:
+        """Close the session, ignoring errors (the server may be gone)."""
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+
+class SMTPConnectionPool:
+    """
+    Process-wide pool of authenticated SMTP sessions.
+
+    Thread-safe, so it works with both prefork and threads Celery pools.
+    Sessions inherited through ``fork()`` are discarded, never shared.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        max_messages: Optional[int] = None,
+    ):
+        """Initialize pool (settings are used for anything not given)."""
+        self.host = host if host is not None else settings.smtp_host
+        self.port = port or settings.smtp_port
+        self.user = user if user is not None else settings.smtp_user
+        self.password = password if password is not None else settings.smtp_password
+        self.use_tls = use_tls if use_tls is not None else settings.smtp_use_tls
+        self.timeout = timeout or settings.smtp_timeout
+        self.max_size = max_size or settings.smtp_pool_size
+        self.idle_timeout = idle_timeout or settings.smtp_pool_idle_timeout
+        self.max_messages = max_messages or settings.smtp_max_messages_per_connection
+
+        self._idle: "queue.LifoQueue[PooledSMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._pid = os.getpid()
+
+    def _open(self) -> PooledSMTP:
+        """Open and authenticate a new SMTP session."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+
+        logger.debug(f"Opened SMTP session to {self.host}:{self.port}")
+        return PooledSMTP(server)
+
+    def _check_fork(self) -> None:
+        """Forget sessions inherited from the parent process."""
+        if self._pid != os.getpid():
+            self._idle = queue.LifoQueue()
+            self._slots = threading.BoundedSemaphore(self.max_size)
+            self._pid = os.getpid()
+
+    def _take_idle(self) -> Optional[PooledSMTP]:
+        """Get a reusable idle session, closing stale ones."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+
+            if time.monotonic() - conn.last_used < self.idle_timeout:
+                return conn
+
+            conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledSMTP]:
+        """
+        Borrow an authenticated SMTP session.
+
+        The session goes back to the pool unless it is marked broken, an
+        error escaped the block, or it reached the per-session message limit.
+
+        Raises:
+            smtplib.SMTPException: If no session frees up within the timeout
+        """
+        self._check_fork()
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise smtplib.SMTPException("Timed out waiting for a pooled SMTP connection")
+
+        conn = None
+        try:
+            conn = self._take_idle() or self._open()
+            yield conn
+
+        except Exception:
+            if conn:
+                conn.broken = True
+            raise
+
+        finally:
+            if conn:
+                if conn.broken or conn.messages_sent >= self.max_messages:
+                    conn.close()
+                else:
+                    conn.last_used = time.monotonic()
+                    self._idle.put(conn)
+            self._slots.release()
+
+    def send(self, msg: Message) -> None:
+        """
+        Send one message, reconnecting once if the session was dropped.
+
+        Raises:
+            smtplib.SMTPException: If sending fails
+        """
+        self.send_many([msg], raise_errors=True)
+
+    def send_many(
+        self,
+        messages: List[Message],
+        raise_errors: bool = False,
+    ) -> List[Optional[Exception]]:
+        """
+        Send messages one after another over pooled sessions.
+
+        If the server drops the session (421, disconnect, timeout), a new one
+        is opened and the message is resent once. Other errors (e.g. refused
+        recipient) only fail that message.
+
+        Args:
+            messages: Messages to send
+            raise_errors: Raise the first error instead of collecting it
+
+        Returns:
+            One entry per message: None if sent, otherwise the error
+
+        Raises:
+            smtplib.SMTPException: If a session cannot be opened, or on the
+                first failed message when raise_errors is set
+        """
+        errors: List[Optional[Exception]] = []
+        index = 0
+        resent = False
+
+        while index < len(messages):
+            with self.connection() as conn:
+                while index < len(messages) and conn.messages_sent < self.max_messages:
+                    try:
+                        conn.server.send_message(messages[index])
+                        conn.messages_sent += 1
+                        errors.append(None)
+
+                    except Exception as e:
+                        if is_reconnect_error(e):
+                            conn.broken = True
+                            if not resent:
+                                logger.warning(f"SMTP session dropped ({e}), reconnecting")
+                                resent = True
+                                break
+
+                        if raise_errors:
+                            raise
+
+                        logger.error(f"SMTP error: {e}")
+                        errors.append(e)
+
+                        if not conn.broken:
+                            # Reset transaction state after a refused message
+                            try:
+                                conn.server.rset()
+                            except Exception:
+                                conn.broken = True
+
+                    index += 1
+                    resent = False
+                    if conn.broken:
+                        break
+
+        return errors
+
+    def close(self) -> None:
+        """Close all idle sessions."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    async def aclose(self) -> None:
+        """Close all idle sessions without blocking the event loop."""
+        await asyncio.to_thread(self.close)
+
+
+# Global pool instance
+smtp_pool = SMTPConnectionPool()
@@ -0,0 +1,237 @@
+"""Speed to lead: time-to-first-contact metrics and SLO guard.
+
+The orchestrator observes how long each lead waited for its first message
+(created_at -> contacted). Observations go to Redis, so all workers feed one
+histogram:
+
+* ``metrics:ttfc`` - cumulative histogram per channel, exported at
+  ``/metrics`` as ``fast_lead_time_to_first_contact_seconds``.
+* ``metrics:ttfc:recent:<slot>`` - short-lived histograms per
+  ``SLOT_SECONDS``; the last ``FIRST_CONTACT_SLO_WINDOW`` seconds of them
+  give the current p95.
+
+While the recent p95 is above ``FIRST_CONTACT_SLO``, bulk and reminder tasks
+(``bulk = True``, see ``ThrottledTask``) are deferred so workers and
+provider capacity go to first contact. If Redis is unavailable, nothing is
+deferred.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (seconds)
+BUCKETS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600)
+
+HISTOGRAM_KEY = "metrics:ttfc"
+RECENT_KEY = "metrics:ttfc:recent:{}"
+DEFERRED_KEY = "metrics:bulk_deferred"
+
+# Size of the recent histogram slots (seconds)
+SLOT_SECONDS = 10
+
+# Quantile compared to the SLO, and samples needed before it is trusted
+SLO_QUANTILE = 0.95
+SLO_MIN_SAMPLES = 10
+
+# Seconds a process reuses the last SLO check
+CHECK_INTERVAL = 1.0
+
+
+def _bucket(seconds: float) -> str:
+    """Get the histogram bucket label of an observation."""
+    for bound in BUCKETS:
+        if seconds <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+def quantile(counts: Dict[str, int], q: float) -> Optional[float]:
+    """
+    Estimate a quantile from bucket counts (linear within a bucket).
+
+    Args:
+        counts: Observations per bucket label (not cumulative)
+        q: Quantile (0..1)
+
+    Returns:
+        Estimated value in seconds, or None without observations
+    """
+    total = sum(counts.values())
+    if not total:
+        return None
+
+    rank = q * total
+    cumulative = 0
+    lower = 0.0
+    for bound in BUCKETS:
+        count = counts.get(str(bound), 0)
+        if count and cumulative + count >= rank:
+            return lower + (bound - lower) * (rank - cumulative) / count
+        cumulative += count
+        lower = float(bound)
+
+    # Beyond the last bucket: report its bound
+    return float(BUCKETS[-1])
+
+
+class SpeedToLead:
+    """Time-to-first-contact histogram and first-contact SLO guard."""
+
+    def __init__(self):
+        """Initialize monitor."""
+        self._checked_at = 0.0
+        self._breached = False
+        self._p95: Optional[float] = None
+
+    async def observe(self, channel: str, seconds: float) -> None:
+        """
+        Record the time to first contact of a lead.
+
+        Args:
+            channel: Channel the lead was contacted through
+            seconds: Seconds from lead creation to first contact
+        """
+        bucket = _bucket(seconds)
+        slot = int(time.time() // SLOT_SECONDS)
+        recent_key = RECENT_KEY.format(slot)
+
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hincrby(HISTOGRAM_KEY, f"{channel}|{bucket}", 1)
+            pipe.hincrby(HISTOGRAM_KEY, f"{channel}|count", 1)
+            pipe.hincrbyfloat(HISTOGRAM_KEY, f"{channel}|sum", seconds)
+            pipe.hincrby(recent_key, bucket, 1)
+            pipe.expire(recent_key, settings.first_contact_slo_window + SLOT_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record time to first contact: {e}")
+
+    async def get_recent_p95(self) -> Optional[float]:
+        """
+        Get p95 time to first contact over FIRST_CONTACT_SLO_WINDOW.
+
+        Returns:
+            Seconds, or None with fewer than SLO_MIN_SAMPLES observations
+        """
+        slot = int(time.time() // SLOT_SECONDS)
+        slots = max(1, int(settings.first_contact_slo_window // SLOT_SECONDS))
+
+        pipe = get_redis().pipeline(transaction=False)
+        for offset in range(slots):
+            pipe.hgetall(RECENT_KEY.format(slot - offset))
+
+        counts: Dict[str, int] = {}
+        for histogram in await pipe.execute():
+            for bucket, count in histogram.items():
+                counts[bucket] = counts.get(bucket, 0) + int(count)
+
+        if sum(counts.values()) < SLO_MIN_SAMPLES:
+            return None
+        return quantile(counts, SLO_QUANTILE)
+
+    async def is_slo_breached(self) -> bool:
+        """
+        Check if first contact is currently slower than FIRST_CONTACT_SLO.
+
+        The result is reused for CHECK_INTERVAL seconds per process.
+
+        Returns:
+            True while the recent p95 is above the SLO
+        """
+        now = time.monotonic()
+        if now - self._checked_at < CHECK_INTERVAL:
+            return self._breached
+
+        self._checked_at = now
+        try:
+            self._p95 = await self.get_recent_p95()
+        except Exception as e:
+            logger.warning(f"First contact SLO unavailable: {e}")
+            self._p95 = None
+
+        breached = self._p95 is not None and self._p95 > settings.first_contact_slo
+        if breached != self._breached:
+            if breached:
+                logger.warning(
+                    f"First contact p95 {self._p95:.1f}s is above the {settings.first_contact_slo:.0f}s SLO, "
+                    f"deferring bulk tasks"
+                )
+            else:
+                logger.info("First contact is back within SLO, resuming bulk tasks")
+        self._breached = breached
+        return breached
+
+    async def should_defer_bulk(self) -> bool:
+        """
+        Check if a bulk/reminder task should be deferred (and count it).
+
+        Returns:
+            True if bulk throttling is enabled and the SLO is breached
+        """
+        if not settings.bulk_throttle_enabled or not await self.is_slo_breached():
+            return False
+
+        try:
+            await get_redis().incr(DEFERRED_KEY)
+        except Exception:
+            pass
+        return True
+
+    async def render_metrics(self) -> List[str]:
+        """
+        Render metrics in Prometheus text format.
+
+        Returns:
+            Exposition lines
+        """
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hgetall(HISTOGRAM_KEY)
+        pipe.get(DEFERRED_KEY)
+        histogram, deferred = await pipe.execute()
+
+        channels: Dict[str, Dict[str, str]] = {}
+        for field, value in histogram.items():
+            channel, _, name = field.rpartition("|")
+            channels.setdefault(channel, {})[name] = value
+
+        name = "fast_lead_time_to_first_contact_seconds"
+        lines = [
+            f"# HELP {name} Time from lead creation to the first message sent to the lead.",
+            f"# TYPE {name} histogram",
+        ]
+        for channel, values in sorted(channels.items()):
+            cumulative = 0
+            for bound in [*map(str, BUCKETS), "+Inf"]:
+                cumulative += int(values.get(bound, 0))
+                lines.append(f'{name}_bucket{{channel="{channel}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{channel="{channel}"}} {float(values.get("sum", 0))}')
+            lines.append(f'{name}_count{{channel="{channel}"}} {int(values.get("count", 0))}')
+
+        p95 = await self.get_recent_p95()
+        breached = p95 is not None and p95 > settings.first_contact_slo
+
+        lines += [
+            "# HELP fast_lead_first_contact_p95_seconds Recent p95 time to first contact.",
+            "# TYPE fast_lead_first_contact_p95_seconds gauge",
+            f"fast_lead_first_contact_p95_seconds {p95 if p95 is not None else 'NaN'}",
+            "# HELP fast_lead_first_contact_slo_seconds First contact SLO (p95).",
+            "# TYPE fast_lead_first_contact_slo_seconds gauge",
+            f"fast_lead_first_contact_slo_seconds {settings.first_contact_slo}",
+            "# HELP fast_lead_first_contact_slo_breached 1 while bulk tasks are deferred.",
+            "# TYPE fast_lead_first_contact_slo_breached gauge",
+            f"fast_lead_first_contact_slo_breached {int(breached and settings.bulk_throttle_enabled)}",
+            "# HELP fast_lead_bulk_deferred_total Bulk and reminder tasks deferred for first contact.",
+            "# TYPE fast_lead_bulk_deferred_total counter",
+            f"fast_lead_bulk_deferred_total {int(deferred or 0)}",
+        ]
+        return lines
+
+
+# Global speed-to-lead instance
+speed_to_lead = SpeedToLead()
@@ -1,11 +1,20 @@
 """Fast Lead Backend - Main application entry point."""
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.http_client import http_clients
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.redis import close_redis
+from app.services.availability_cache import availability_cache
+from app.services.booking_requests import booking_requests
+from app.services.tenant_service import tenant_resolver
 from app.api import health
 from app.api.v1 import leads, bookings, webhooks
 
@@ -15,8 +24,17 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     await init_db()
+    await http_clients.start()
+    tenant_listener = asyncio.create_task(tenant_resolver.listen())
+    availability_listener = asyncio.create_task(availability_cache.listen())
+    booking_listener = asyncio.create_task(booking_requests.listen())
     yield
     # Shutdown
+    tenant_listener.cancel()
+    availability_listener.cancel()
+    booking_listener.cancel()
+    await http_clients.aclose()
+    await close_redis()
     await close_db()
 
 
@@ -30,6 +48,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Rate limiting of lead submissions (added first so CORS headers wrap 429s)
+app.add_middleware(RateLimitMiddleware)
+
+# Idempotency-Key replays are served before rate limiting
+app.add_middleware(IdempotencyMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
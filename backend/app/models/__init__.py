@@ -3,6 +3,8 @@
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.models.lead import Lead, LeadStatus, LeadChannel
+from app.models.outbox import OutboxMessage
+from app.models.message_template import MessageTemplate
 
 __all__ = [
     "Tenant",
@@ -10,4 +12,6 @@ __all__ = [
     "Lead",
     "LeadStatus",
     "LeadChannel",
+    "OutboxMessage",
+    "MessageTemplate",
 ]
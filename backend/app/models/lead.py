@@ -2,7 +2,7 @@
 
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Enum, JSON, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Enum, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -76,14 +76,31 @@ class Lead(Base):
     payload = Column(JSON, nullable=True)  # Extra data from widget
     notes = Column(Text, nullable=True)
 
+    # Orchestrator fallback chain: {"channels": [...], "step": 0, "attempts": [...]}
+    contact_chain = Column(JSON, nullable=True)
+
     # Tenant relationship
     tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
     tenant = relationship("Tenant", back_populates="leads")
 
+    # Deduplication of repeat submissions (hash of normalized contact and time window)
+    dedup_key = Column(String(64), nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     contacted_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        # Backstop for the Redis dedup check: one lead per contact and window
+        Index(
+            "uq_leads_tenant_dedup_key",
+            "tenant_id",
+            "dedup_key",
+            unique=True,
+            postgresql_where=dedup_key.isnot(None),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<Lead(id={self.id}, name='{self.name}', channel='{self.channel}', status='{self.status}')>"
@@ -0,0 +1,52 @@
+"""Message template model - per-tenant texts of outbound channel messages."""
+
+from datetime import datetime
+from sqlalchemy import (
+    Column, String, Boolean, DateTime, Integer, ForeignKey, Enum, Text, UniqueConstraint,
+)
+from app.core.database import Base
+from app.models.lead import LeadChannel
+
+
+class MessageTemplate(Base):
+    """
+    Message template model.
+
+    Overrides a built-in message (e.g. the SMS welcome text) for one tenant,
+    channel and locale. Texts use ``{placeholder}`` fields (``{{``/``}}`` for
+    literal braces). ``version`` must be incremented on every change so
+    workers holding a compiled copy pick up the new text.
+    """
+
+    __tablename__ = "message_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Lookup key
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+    channel = Column(Enum(LeadChannel), nullable=False)
+    name = Column(String(100), nullable=False)  # welcome, booking_confirmation
+    locale = Column(String(10), default="ru", nullable=False)
+
+    # Content
+    subject = Column(String(255), nullable=True)  # email only
+    body = Column(Text, nullable=False)  # plain text (SMS, WhatsApp, email text part)
+    body_html = Column(Text, nullable=True)  # email only
+
+    # Cache invalidation
+    version = Column(Integer, default=1, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "channel", "name", "locale", name="uq_message_templates_key"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MessageTemplate(id={self.id}, tenant_id={self.tenant_id}, "
+            f"channel='{self.channel}', name='{self.name}', version={self.version})>"
+        )
@@ -0,0 +1,46 @@
+"""Outbox model - Celery tasks written in the same transaction as business data."""
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, JSON, Text, Index
+from app.core.database import Base
+
+
+class OutboxMessage(Base):
+    """
+    Outbox message model.
+
+    A Celery task that must be published once the surrounding transaction
+    commits. Rows are written by the request path together with the data they
+    refer to, and published to the broker in batches by the outbox relay.
+    """
+
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Task to publish
+    task_name = Column(String(255), nullable=False)
+    args = Column(JSON, nullable=True)
+    kwargs = Column(JSON, nullable=True)
+    options = Column(JSON, nullable=True)  # apply_async options (queue, priority, countdown)
+
+    # Delivery tracking
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    published_at = Column(DateTime, nullable=True)
+    dead_at = Column(DateTime, nullable=True)  # gave up after OUTBOX_MAX_ATTEMPTS failed publishes
+
+    __table_args__ = (
+        # Relay only scans pending rows
+        Index(
+            "ix_outbox_messages_unpublished",
+            "id",
+            postgresql_where=published_at.is_(None) & dead_at.is_(None),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage(id={self.id}, task='{self.task_name}', published_at={self.published_at})>"
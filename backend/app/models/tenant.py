@@ -1,11 +1,17 @@
 """Tenant model - represents a client/organization using Fast Lead."""
 
+import secrets
 from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, Integer, JSON
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
+def generate_public_key() -> str:
+    """Generate a widget public key."""
+    return f"pk_{secrets.token_urlsafe(24)}"
+
+
 class Tenant(Base):
     """
     Tenant model.
@@ -21,6 +27,9 @@ class Tenant(Base):
     slug = Column(String(100), unique=True, nullable=False, index=True)
     domain = Column(String(255), nullable=True)
 
+    # Widget public key (X-Widget-Key header), safe to embed in client sites
+    public_key = Column(String(64), unique=True, nullable=True, index=True, default=generate_public_key)
+
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
     is_trial = Column(Boolean, default=True, nullable=False)
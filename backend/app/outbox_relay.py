@@ -0,0 +1,34 @@
+"""Outbox relay process - publishes outbox rows to Celery.
+
+Usage:
+    python -m app.outbox_relay
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.core.database import close_db
+from app.services.outbox_service import OutboxRelay
+
+
+async def main() -> None:
+    """Run the outbox relay until SIGINT/SIGTERM."""
+    stop_event = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await OutboxRelay().run(stop_event)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s: %(levelname)s/%(name)s] %(message)s",
+    )
+    asyncio.run(main())
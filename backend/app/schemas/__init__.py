@@ -4,6 +4,9 @@ from app.schemas.lead import (
     CreateLeadRequest,
     LeadResponse,
     CreateLeadResponse,
+    BatchCreateLeadRequest,
+    BatchLeadResult,
+    BatchCreateLeadResponse,
     UTMParams,
     ConsentParams,
 )
@@ -21,6 +24,9 @@ __all__ = [
     "CreateLeadRequest",
     "LeadResponse",
     "CreateLeadResponse",
+    "BatchCreateLeadRequest",
+    "BatchLeadResult",
+    "BatchCreateLeadResponse",
     "UTMParams",
     "ConsentParams",
     "CreateBookingRequest",
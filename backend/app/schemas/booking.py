@@ -42,6 +42,22 @@ class BookingResponse(BaseModel):
         from_attributes = True
 
 
+class BookingRequestStatus(BaseModel):
+    """Response schema for an asynchronous booking request."""
+
+    request_id: str = Field(..., description="Booking request ID")
+    status: str = Field(..., description="pending, succeeded or failed")
+    lead_id: int = Field(..., description="Lead ID")
+    created_at: str = Field(..., description="Time the request was accepted")
+    finished_at: Optional[str] = Field(None, description="Time the booking finished")
+    booking: Optional[BookingResponse] = Field(None, description="Booking (if succeeded)")
+    error: Optional[str] = Field(None, description="Error message (if failed)")
+    error_status: Optional[int] = Field(
+        None,
+        description="HTTP status a synchronous request would have failed with"
+    )
+
+
 class CancelBookingRequest(BaseModel):
     """Request schema for cancelling a booking."""
 
@@ -1,7 +1,7 @@
 """Lead schemas for API requests and responses."""
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field, EmailStr, field_validator
 
 from app.models.lead import LeadStatus, LeadChannel
@@ -140,6 +140,10 @@ class CreateLeadResponse(BaseModel):
         None,
         description="Recommended next action (e.g., 'send_sms', 'send_email')"
     )
+    duplicate: bool = Field(
+        False,
+        description="True if the contact already submitted a lead recently and it was returned instead"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -151,8 +155,36 @@ class CreateLeadResponse(BaseModel):
                         "channel": "sms",
                         "status": "new"
                     },
-                    "next_action": "send_sms"
+                    "next_action": "send_sms",
+                    "duplicate": False
                 }
             ]
         }
     }
+
+
+class BatchCreateLeadRequest(BaseModel):
+    """Request schema for batch lead creation (CRM and ad platform imports)."""
+
+    leads: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description="Leads to create, each in the CreateLeadRequest format"
+    )
+
+
+class BatchLeadResult(BaseModel):
+    """Result of creating a single lead in a batch."""
+
+    index: int = Field(..., description="Position of the lead in the request")
+    success: bool
+    lead: Optional[LeadResponse] = None
+    error: Optional[str] = None
+
+
+class BatchCreateLeadResponse(BaseModel):
+    """Response schema for batch lead creation."""
+
+    created: int = Field(..., description="Number of leads created")
+    failed: int = Field(..., description="Number of leads rejected")
+    results: List[BatchLeadResult]
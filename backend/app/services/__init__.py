@@ -7,6 +7,7 @@ from app.services.calcom_service import CalcomService
 from app.services.vk_service import VKService
 from app.services.telegram_service import TelegramService
 from app.services.whatsapp_service import WhatsAppService
+from app.services.template_service import TemplateService
 
 __all__ = [
     "LeadService",
@@ -16,4 +17,5 @@ __all__ = [
     "VKService",
     "TelegramService",
     "WhatsAppService",
+    "TemplateService",
 ]
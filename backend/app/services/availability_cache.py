@@ -0,0 +1,211 @@
+"""Cal.com availability cache - stale-while-revalidate in two tiers."""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.redis import get_redis, subscribe
+from app.core.single_flight import SingleFlight
+from app.services.calcom_service import CalcomService, CalcomServiceError
+from app.services.slot_index import slot_index
+
+logger = logging.getLogger(__name__)
+
+# Redis keys and invalidation channel
+REDIS_KEY = "availability:{}:{}:{}"
+GENERATION_KEY = "availability:gen:{}"
+INVALIDATION_CHANNEL = "availability:invalidate"
+
+# Event type, date_from, date_to
+AvailabilityKey = Tuple[int, str, str]
+
+# KEYS: entry key, generation key. ARGV: entry, generation read before the
+# fetch, TTL (s). Stores the entry only if no invalidation happened meanwhile.
+STORE_SCRIPT = """
+if (redis.call("GET", KEYS[2]) or "0") ~= ARGV[2] then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[3])
+return 1
+"""
+
+
+class AvailabilityCache:
+    """
+    Caches Cal.com availability per event type and date range.
+
+    Lookup goes through an in-process TTL LRU (AVAILABILITY_LOCAL_TTL, a few
+    seconds), then Redis (shared by all API processes), then Cal.com.
+    Entries are fresh for AVAILABILITY_CACHE_TTL seconds; after that they are
+    still served for up to AVAILABILITY_STALE_TTL seconds while one
+    background refresh fetches new slots. Concurrent misses for the same key
+    wait for a single upstream fetch. Fetched slots also sync the slot index.
+
+    Booking webhooks call ``invalidate()``: it bumps the event type's
+    generation in Redis (entries of older generations are ignored, and a
+    fetch started before the invalidation is not stored) and publishes it, so
+    every process running ``listen()`` drops its local entries. If Redis is
+    unavailable, the local tier and Cal.com are used.
+    """
+
+    def __init__(self):
+        """Initialize cache."""
+        self.local = TTLCache(
+            max_size=settings.availability_cache_size,
+            ttl=settings.availability_local_ttl,
+        )
+        self.flights = SingleFlight()
+        self._store = None
+        self._store_client = None
+
+    async def get(
+        self,
+        event_type_id: Optional[int] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get available slots.
+
+        Args:
+            event_type_id: Event type ID (default event type if not provided)
+            date_from: Start date in YYYY-MM-DD format (optional)
+            date_to: End date in YYYY-MM-DD format (optional)
+
+        Returns:
+            List of available time slots
+
+        Raises:
+            CalcomServiceError: If nothing is cached and Cal.com fails
+        """
+        key = (event_type_id or settings.calcom_event_type_id, date_from or "", date_to or "")
+
+        entry = self.local.get(key)
+        if entry is None:
+            entry = await self._get_redis(key)
+            if entry is not None:
+                self.local.set(key, entry)
+
+        if entry is None:
+            # Last resort while Redis is down: an expired local copy
+            stale = self.local.peek(key)
+            if stale is not None:
+                entry = stale.value
+
+        age = time.time() - entry["fetched_at"] if entry else None
+
+        if entry is None or age >= settings.availability_stale_ttl:
+            entry = await self.flights.do(key, lambda: self._refresh(key))
+        elif age >= settings.availability_cache_ttl:
+            # Serve stale slots, refresh in the background
+            self.flights.start(key, lambda: self._refresh(key))
+
+        return entry["slots"]
+
+    async def _get_redis(self, key: AvailabilityKey) -> Optional[Dict[str, Any]]:
+        """Get an entry from Redis (None if missing, outdated or Redis is down)."""
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.get(REDIS_KEY.format(*key))
+            pipe.get(GENERATION_KEY.format(key[0]))
+            raw, generation = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Availability cache unavailable, using Cal.com: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        if entry["generation"] != int(generation or 0):
+            return None
+        return entry
+
+    async def _refresh(self, key: AvailabilityKey) -> Dict[str, Any]:
+        """Fetch slots from Cal.com and store them in both tiers."""
+        event_type_id, date_from, date_to = key
+
+        try:
+            generation = int(await get_redis().get(GENERATION_KEY.format(event_type_id)) or 0)
+        except Exception:
+            generation = None
+
+        started_at = time.time()
+        try:
+            slots = await CalcomService().get_availability(
+                event_type_id=event_type_id,
+                date_from=date_from or None,
+                date_to=date_to or None,
+            )
+        except CalcomServiceError as e:
+            logger.error(f"Failed to refresh availability {key}: {e}")
+            raise
+
+        entry = {"slots": slots, "fetched_at": started_at, "generation": generation or 0}
+
+        if generation is not None:
+            try:
+                stored = await self._get_store()(
+                    keys=[REDIS_KEY.format(*key), GENERATION_KEY.format(event_type_id)],
+                    args=[json.dumps(entry), generation, settings.availability_stale_ttl],
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache availability in Redis: {e}")
+                stored = True
+
+            if not stored:
+                # Invalidated while fetching: return the slots, but don't cache them
+                return entry
+
+            await slot_index.sync(event_type_id, date_from or None, date_to or None, slots)
+
+        self.local.set(key, entry)
+        return entry
+
+    def _get_store(self):
+        """Get the store script registered on the current Redis client."""
+        redis = get_redis()
+        if self._store is None or self._store_client is not redis:
+            self._store = redis.register_script(STORE_SCRIPT)
+            self._store_client = redis
+        return self._store
+
+    def forget(self, event_type_id: Optional[int] = None) -> None:
+        """Drop local entries of an event type (all if None)."""
+        for key in self.local.keys():
+            if event_type_id is None or key[0] == event_type_id:
+                self.local.delete(key)
+
+    async def invalidate(self, event_type_id: Optional[int] = None) -> None:
+        """
+        Invalidate cached availability in all processes after a booking change.
+
+        Args:
+            event_type_id: Event type whose slots changed (default event type
+                if not provided)
+        """
+        event_type_id = event_type_id or settings.calcom_event_type_id
+        self.forget(event_type_id)
+
+        try:
+            redis = get_redis()
+            await redis.incr(GENERATION_KEY.format(event_type_id))
+            await redis.publish(INVALIDATION_CHANNEL, str(event_type_id))
+        except Exception as e:
+            logger.error(f"Failed to invalidate availability of event type {event_type_id}: {e}")
+
+    async def listen(self) -> None:
+        """Drop local entries on invalidation messages (runs until cancelled)."""
+        await subscribe(
+            INVALIDATION_CHANNEL,
+            lambda data: self.forget(int(data)),
+            # Bookings may have changed while disconnected
+            on_reconnect=self.local.clear,
+        )
+
+
+# Process-wide availability cache (shares the local tier)
+availability_cache = AvailabilityCache()
@@ -0,0 +1,181 @@
+"""Booking requests - status of bookings made asynchronously by a worker.
+
+``POST /api/v1/bookings`` with ``Prefer: respond-async`` returns ``202``
+with a booking-request ID instead of waiting for Cal.com. The
+``create_booking`` task (``calcom`` queue) makes the booking and stores the
+outcome here; clients poll ``GET /api/v1/bookings/requests/{id}`` or follow
+``.../events`` (SSE).
+
+Requests are kept in Redis for ``BOOKING_REQUEST_TTL`` seconds. Finished
+requests are announced on one pub/sub channel; each API process runs
+``listen()`` and wakes its local waiters, so open event streams don't each
+hold a Redis connection. Waiters also re-read their request every
+``POLL_INTERVAL`` seconds and after the listener reconnects.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.redis import get_redis, subscribe
+
+logger = logging.getLogger(__name__)
+
+REQUEST_KEY = "booking:req:{}"
+DONE_CHANNEL = "booking:req:done"
+
+# Request statuses
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Waiters re-read the request this often (a missed message only delays them)
+POLL_INTERVAL = 1.0
+
+
+class BookingRequests:
+    """Store of asynchronous booking requests, in Redis."""
+
+    def __init__(self):
+        """Initialize store."""
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+
+    async def create(self, lead_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Register a pending booking request.
+
+        Args:
+            lead_id: Lead ID
+
+        Returns:
+            Request record, or None if Redis is unavailable
+        """
+        request_id = uuid.uuid4().hex
+        record = {
+            "request_id": request_id,
+            "status": PENDING,
+            "lead_id": lead_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        try:
+            await get_redis().set(
+                REQUEST_KEY.format(request_id),
+                json.dumps(record),
+                ex=settings.booking_request_ttl,
+            )
+        except Exception as e:
+            logger.warning(f"Booking requests unavailable, booking synchronously: {e}")
+            return None
+
+        return record
+
+    async def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a booking request.
+
+        Args:
+            request_id: Request ID
+
+        Returns:
+            Request record, or None if unknown or expired
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        raw = await get_redis().get(REQUEST_KEY.format(request_id))
+        return json.loads(raw) if raw else None
+
+    async def finish(
+        self,
+        request_id: str,
+        booking: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        error_status: Optional[int] = None,
+    ) -> None:
+        """
+        Store the outcome of a booking request and notify waiters.
+
+        Args:
+            request_id: Request ID
+            booking: Booking details (on success)
+            error: Error message (on failure)
+            error_status: HTTP status of the error
+        """
+        try:
+            record = await self.get(request_id) or {"request_id": request_id}
+            record.update(
+                status=FAILED if error else SUCCEEDED,
+                booking=booking,
+                error=error,
+                error_status=error_status,
+                finished_at=datetime.now(timezone.utc).isoformat(),
+            )
+
+            pipe = get_redis().pipeline(transaction=True)
+            pipe.set(REQUEST_KEY.format(request_id), json.dumps(record), ex=settings.booking_request_ttl)
+            pipe.publish(DONE_CHANNEL, request_id)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to store outcome of booking request {request_id}: {e}")
+
+    async def wait(self, request_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait until a booking request is finished.
+
+        Args:
+            request_id: Request ID
+            timeout: Seconds to wait at most
+
+        Returns:
+            Request record (still pending after the timeout), or None if
+            unknown or expired
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        event = asyncio.Event()
+        self._waiters.setdefault(request_id, set()).add(event)
+        try:
+            while True:
+                record = await self.get(request_id)
+                remaining = deadline - loop.time()
+                if record is None or record["status"] != PENDING or remaining <= 0:
+                    return record
+
+                try:
+                    await asyncio.wait_for(event.wait(), min(remaining, POLL_INTERVAL))
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        finally:
+            waiters = self._waiters.get(request_id)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._waiters[request_id]
+
+    async def listen(self) -> None:
+        """Wake local waiters of finished requests (runs until cancelled)."""
+        await subscribe(DONE_CHANNEL, self._wake, on_reconnect=self._wake_all)
+
+    def _wake(self, request_id: str) -> None:
+        """Wake the local waiters of a request."""
+        for event in self._waiters.get(request_id, ()):
+            event.set()
+
+    def _wake_all(self) -> None:
+        """Wake all local waiters (notifications may have been missed)."""
+        for request_id in list(self._waiters):
+            self._wake(request_id)
+
+
+# Process-wide booking request store (shares local waiters)
+booking_requests = BookingRequests()
@@ -0,0 +1,139 @@
+"""Booking service - books a lead's appointment in Cal.com."""
+
+import logging
+from typing import Optional
+
+from fastapi import status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.lead import Lead, LeadStatus
+from app.schemas.booking import BookingResponse, CreateBookingRequest
+from app.services.availability_cache import availability_cache
+from app.services.calcom_service import CalcomService, CalcomServiceError, CalcomUnavailable
+from app.services.slot_index import SlotHold, slot_index
+
+logger = logging.getLogger(__name__)
+
+
+class BookingError(Exception):
+    """Booking failed (with the HTTP status the API responds with)."""
+
+    def __init__(self, message: str, status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class BookingService:
+    """Service for booking leads (used by the API and the booking task)."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize service with database session."""
+        self.db = db
+
+    async def get_bookable_lead(self, lead_id: int) -> Lead:
+        """
+        Get a lead that can be booked.
+
+        Args:
+            lead_id: Lead ID
+
+        Returns:
+            Lead
+
+        Raises:
+            BookingError: If the lead does not exist (404) or already has a
+                booking (400)
+        """
+        result = await self.db.execute(
+            select(Lead).where(Lead.id == lead_id)
+        )
+        lead = result.scalar_one_or_none()
+
+        if not lead:
+            raise BookingError(f"Lead {lead_id} not found", status.HTTP_404_NOT_FOUND)
+
+        if lead.booking_id:
+            raise BookingError(f"Lead {lead_id} already has a booking", status.HTTP_400_BAD_REQUEST)
+
+        return lead
+
+    async def create_booking(
+        self,
+        lead: Lead,
+        data: CreateBookingRequest,
+        hold: Optional[SlotHold] = None,
+    ) -> BookingResponse:
+        """
+        Create a booking in Cal.com and update the lead.
+
+        The slot hold is confirmed on success and released if Cal.com fails.
+
+        Args:
+            lead: Lead to book (from ``get_bookable_lead``)
+            data: Booking request
+            hold: Hold of the requested slot (optional)
+
+        Returns:
+            Booking details
+
+        Raises:
+            BookingError: If Cal.com fails or the lead cannot be updated
+        """
+        calcom = CalcomService()
+
+        try:
+            booking_result = await calcom.create_booking(
+                name=data.name,
+                email=data.email,
+                start_time=data.start_time,
+                timezone=data.timezone,
+                metadata={
+                    **(data.metadata or {}),
+                    "lead_id": lead.id,
+                    "tenant_id": lead.tenant_id,
+                },
+            )
+        except CalcomServiceError as e:
+            await slot_index.release(hold)
+            logger.error(f"Failed to create booking for lead {lead.id}: {e}")
+            status_code = (
+                status.HTTP_503_SERVICE_UNAVAILABLE
+                if isinstance(e, CalcomUnavailable)
+                else status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            raise BookingError(f"Failed to create booking: {str(e)}", status_code) from e
+
+        if hold:
+            await slot_index.confirm(hold)
+        else:
+            await slot_index.mark_booked(settings.calcom_event_type_id, booking_result["start_time"])
+        await availability_cache.invalidate()
+
+        # Update lead with booking information
+        try:
+            lead.booking_id = str(booking_result["booking_id"])
+            lead.booking_url = booking_result["booking_url"]
+            lead.booked_at = booking_result["start_time"]
+            lead.status = LeadStatus.BOOKED
+
+            await self.db.commit()
+            await self.db.refresh(lead)
+
+            logger.info(f"Booking created for lead {lead.id}: {booking_result['booking_id']}")
+
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Failed to update lead with booking info: {e}")
+            raise BookingError("Booking created but failed to update lead") from e
+
+        return BookingResponse(
+            booking_id=booking_result["booking_id"],
+            booking_uid=booking_result["booking_uid"],
+            booking_url=booking_result["booking_url"],
+            start_time=booking_result["start_time"],
+            end_time=booking_result["end_time"],
+            status=booking_result["status"],
+            lead_id=lead.id,
+        )
@@ -6,20 +6,41 @@ from datetime import datetime
 
 import httpx
 
+from app.core.circuit_breaker import CircuitOpen, circuit_breaker
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.single_flight import SharedCallError, SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Timeout of the create booking call (seconds)
+CREATE_BOOKING_TIMEOUT = 30.0
+
 
 class CalcomServiceError(Exception):
     """Base exception for Cal.com service errors."""
     pass
 
 
+class CalcomUnavailable(CalcomServiceError):
+    """Cal.com circuit is open; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Cal.com is unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
 class CalcomService:
     """
     Service for managing appointments via Cal.com.
 
+    Concurrent identical reads (``get_booking``, ``get_availability``) are
+    coalesced into one upstream call: within the process, and across
+    processes through Redis when SINGLE_FLIGHT_REDIS_ENABLED is set.
+
+    While the Cal.com circuit breaker is open, calls fail fast with
+    ``CalcomUnavailable`` instead of waiting for the timeout.
+
     API Documentation: https://cal.com/docs/api-reference
     """
 
@@ -81,6 +102,8 @@ class CalcomService:
         if metadata:
             data["metadata"] = metadata
 
+        await self._check_circuit()
+
         # Send request
         try:
             headers = {
@@ -88,41 +111,41 @@ class CalcomService:
                 "Content-Type": "application/json",
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_url}/bookings",
-                    json=data,
-                    headers=headers,
-                    timeout=30.0,
+            client = get_http_client("calcom")
+            response = await client.post(
+                f"{self.api_url}/bookings",
+                json=data,
+                headers=headers,
+                timeout=CREATE_BOOKING_TIMEOUT,
+            )
+
+            # Check HTTP status
+            if response.status_code != 201:
+                error_detail = response.text
+                try:
+                    error_json = response.json()
+                    error_detail = error_json.get("message", error_detail)
+                except:
+                    pass
+
+                raise CalcomServiceError(
+                    f"Cal.com API returned status {response.status_code}: {error_detail}"
                 )
 
-                # Check HTTP status
-                if response.status_code != 201:
-                    error_detail = response.text
-                    try:
-                        error_json = response.json()
-                        error_detail = error_json.get("message", error_detail)
-                    except:
-                        pass
-
-                    raise CalcomServiceError(
-                        f"Cal.com API returned status {response.status_code}: {error_detail}"
-                    )
-
-                # Parse response
-                result = response.json()
-
-                logger.info(f"Booking created successfully. Booking ID: {result.get('id')}")
-
-                return {
-                    "success": True,
-                    "booking_id": result.get("id"),
-                    "booking_uid": result.get("uid"),
-                    "booking_url": result.get("url"),
-                    "start_time": result.get("startTime"),
-                    "end_time": result.get("endTime"),
-                    "status": result.get("status", "accepted"),
-                }
+            # Parse response
+            result = response.json()
+
+            logger.info(f"Booking created successfully. Booking ID: {result.get('id')}")
+
+            return {
+                "success": True,
+                "booking_id": result.get("id"),
+                "booking_uid": result.get("uid"),
+                "booking_url": result.get("url"),
+                "start_time": result.get("startTime"),
+                "end_time": result.get("endTime"),
+                "status": result.get("status", "accepted"),
+            }
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error while creating booking: {e}")
@@ -144,24 +167,32 @@ class CalcomService:
         Raises:
             CalcomServiceError: If retrieval fails
         """
+        return await self._coalesce(
+            f"booking:{booking_id}",
+            lambda: self._fetch_booking(booking_id),
+        )
+
+    async def _fetch_booking(self, booking_id: int) -> Dict[str, Any]:
+        """Get booking details from Cal.com."""
+        await self._check_circuit()
+
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/bookings/{booking_id}",
-                    headers=headers,
-                    timeout=10.0,
-                )
+            client = get_http_client("calcom")
+            response = await client.get(
+                f"{self.api_url}/bookings/{booking_id}",
+                headers=headers,
+            )
 
-                if response.status_code != 200:
-                    raise CalcomServiceError(
-                        f"Failed to get booking: HTTP {response.status_code}"
-                    )
+            if response.status_code != 200:
+                raise CalcomServiceError(
+                    f"Failed to get booking: HTTP {response.status_code}"
+                )
 
-                return response.json()
+            return response.json()
 
         except Exception as e:
             logger.error(f"Error getting booking: {e}")
@@ -185,6 +216,8 @@ class CalcomService:
         Raises:
             CalcomServiceError: If cancellation fails
         """
+        await self._check_circuit()
+
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -195,26 +228,25 @@ class CalcomService:
             if cancellation_reason:
                 data["cancellationReason"] = cancellation_reason
 
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.api_url}/bookings/{booking_id}",
-                    headers=headers,
-                    json=data if data else None,
-                    timeout=10.0,
-                )
+            client = get_http_client("calcom")
+            response = await client.delete(
+                f"{self.api_url}/bookings/{booking_id}",
+                headers=headers,
+                json=data if data else None,
+            )
 
-                if response.status_code not in [200, 204]:
-                    raise CalcomServiceError(
-                        f"Failed to cancel booking: HTTP {response.status_code}"
-                    )
+            if response.status_code not in [200, 204]:
+                raise CalcomServiceError(
+                    f"Failed to cancel booking: HTTP {response.status_code}"
+                )
 
-                logger.info(f"Booking {booking_id} cancelled successfully")
+            logger.info(f"Booking {booking_id} cancelled successfully")
 
-                return {
-                    "success": True,
-                    "booking_id": booking_id,
-                    "cancelled_at": datetime.utcnow().isoformat(),
-                }
+            return {
+                "success": True,
+                "booking_id": booking_id,
+                "cancelled_at": datetime.utcnow().isoformat(),
+            }
 
         except Exception as e:
             logger.error(f"Error cancelling booking: {e}")
@@ -240,6 +272,8 @@ class CalcomService:
         Raises:
             CalcomServiceError: If rescheduling fails
         """
+        await self._check_circuit()
+
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -253,29 +287,28 @@ class CalcomService:
             if cancellation_reason:
                 data["rescheduleReason"] = cancellation_reason
 
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    f"{self.api_url}/bookings/{booking_id}",
-                    headers=headers,
-                    json=data,
-                    timeout=10.0,
-                )
+            client = get_http_client("calcom")
+            response = await client.patch(
+                f"{self.api_url}/bookings/{booking_id}",
+                headers=headers,
+                json=data,
+            )
 
-                if response.status_code != 200:
-                    raise CalcomServiceError(
-                        f"Failed to reschedule booking: HTTP {response.status_code}"
-                    )
+            if response.status_code != 200:
+                raise CalcomServiceError(
+                    f"Failed to reschedule booking: HTTP {response.status_code}"
+                )
 
-                result = response.json()
+            result = response.json()
 
-                logger.info(f"Booking {booking_id} rescheduled successfully")
+            logger.info(f"Booking {booking_id} rescheduled successfully")
 
-                return {
-                    "success": True,
-                    "booking_id": result.get("id"),
-                    "new_start_time": result.get("startTime"),
-                    "new_end_time": result.get("endTime"),
-                }
+            return {
+                "success": True,
+                "booking_id": result.get("id"),
+                "new_start_time": result.get("startTime"),
+                "new_end_time": result.get("endTime"),
+            }
 
         except Exception as e:
             logger.error(f"Error rescheduling booking: {e}")
@@ -306,6 +339,20 @@ class CalcomService:
         if not event_type_id:
             raise CalcomServiceError("Event type ID not configured")
 
+        return await self._coalesce(
+            f"availability:{event_type_id}:{date_from or ''}:{date_to or ''}",
+            lambda: self._fetch_availability(event_type_id, date_from, date_to),
+        )
+
+    async def _fetch_availability(
+        self,
+        event_type_id: int,
+        date_from: Optional[str],
+        date_to: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Get available time slots from Cal.com."""
+        await self._check_circuit()
+
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -320,22 +367,43 @@ class CalcomService:
             if date_to:
                 params["dateTo"] = date_to
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/availability",
-                    headers=headers,
-                    params=params,
-                    timeout=10.0,
-                )
+            client = get_http_client("calcom")
+            response = await client.get(
+                f"{self.api_url}/availability",
+                headers=headers,
+                params=params,
+            )
 
-                if response.status_code != 200:
-                    raise CalcomServiceError(
-                        f"Failed to get availability: HTTP {response.status_code}"
-                    )
+            if response.status_code != 200:
+                raise CalcomServiceError(
+                    f"Failed to get availability: HTTP {response.status_code}"
+                )
 
-                result = response.json()
-                return result.get("slots", [])
+            result = response.json()
+            return result.get("slots", [])
 
         except Exception as e:
             logger.error(f"Error getting availability: {e}")
             raise CalcomServiceError(f"Failed to get availability: {e}") from e
+
+    async def _check_circuit(self) -> None:
+        """Fail fast while the Cal.com circuit breaker is open."""
+        try:
+            await circuit_breaker.check("calcom")
+        except CircuitOpen as e:
+            logger.warning(f"Cal.com call rejected: {e}")
+            raise CalcomUnavailable(e.retry_after) from e
+
+    async def _coalesce(self, key: str, fetch) -> Any:
+        """Run a read once for all concurrent identical callers."""
+        try:
+            return await calcom_reads.do(key, fetch, shared=True)
+        except SharedCallError as e:
+            # Keep the fail-fast kind, so waiters also answer 503
+            if e.error_type == CalcomUnavailable.__name__:
+                raise CalcomUnavailable(e.retry_after or 0) from e
+            raise CalcomServiceError(str(e)) from e
+
+
+# Coalesced Cal.com reads (one registry per process)
+calcom_reads = SingleFlight("calcom")
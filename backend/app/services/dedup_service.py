@@ -0,0 +1,140 @@
+"""Dedup service - detect repeat widget submissions of the same contact."""
+
+import hashlib
+import logging
+import re
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.rate_limit import normalize_phone
+from app.core.redis import get_redis
+from app.schemas.lead import CreateLeadRequest
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "lead:dedup:{}:{}"
+
+# Value of a claimed key while the lead is being inserted
+_PENDING = "pending"
+
+VK_URL_PREFIX = re.compile(r"^(https?://)?(m\.)?vk\.com/", re.IGNORECASE)
+
+
+def normalize_contact(data: CreateLeadRequest) -> Optional[str]:
+    """
+    Get the normalized contact a lead is deduplicated by.
+
+    Phone is preferred, then email, then VK ID, so a resubmission with an
+    extra field still matches the first submission.
+
+    Args:
+        data: Lead creation request data
+
+    Returns:
+        Contact like "phone:79991234567", or None if the lead has no contact
+    """
+    if data.phone:
+        phone = normalize_phone(data.phone)
+        if phone:
+            return f"phone:{phone}"
+
+    if data.email:
+        return f"email:{data.email.strip().lower()}"
+
+    if data.vk_id:
+        vk_id = VK_URL_PREFIX.sub("", data.vk_id.strip()).strip("/").lower()
+        if vk_id:
+            return f"vk:{vk_id}"
+
+    return None
+
+
+class LeadDeduplicator:
+    """
+    Finds leads already created for a contact within LEAD_DEDUP_WINDOW.
+
+    Redis is the fast path: the first submission claims a key for the
+    window, and repeats read the lead ID from it without touching the
+    database. The ``dedup_key`` column (unique per tenant) is the backstop
+    for concurrent submissions and for when Redis is unavailable; it is
+    bucketed by window, so Redis still catches repeats across a bucket edge.
+    """
+
+    def dedup_key(self, contact: str, now: Optional[float] = None) -> str:
+        """
+        Build the value of ``Lead.dedup_key`` for a contact.
+
+        Args:
+            contact: Normalized contact
+            now: Unix time (current time by default)
+
+        Returns:
+            Hex digest of the contact and current window bucket
+        """
+        bucket = int((now or time.time()) // settings.lead_dedup_window)
+        return hashlib.sha256(f"{contact}:{bucket}".encode()).hexdigest()
+
+    async def claim(self, tenant_id: int, contact: str) -> Optional[int]:
+        """
+        Claim a contact for the window, or get the lead it was claimed for.
+
+        Args:
+            tenant_id: Tenant ID
+            contact: Normalized contact
+
+        Returns:
+            ID of the lead already created for the contact, or None if the
+            caller should create the lead (Redis errors included)
+        """
+        key = REDIS_KEY.format(tenant_id, contact)
+
+        try:
+            redis = get_redis()
+            if await redis.set(key, _PENDING, nx=True, ex=settings.lead_dedup_window):
+                return None
+            existing = await redis.get(key)
+        except Exception as e:
+            logger.warning(f"Lead dedup cache unavailable, using database: {e}")
+            return None
+
+        # Concurrent submission still being inserted: the unique index decides
+        if existing is None or existing == _PENDING:
+            return None
+
+        return int(existing)
+
+    async def remember(self, tenant_id: int, contact: str, lead_id: int) -> None:
+        """
+        Store the lead created for a claimed contact.
+
+        Args:
+            tenant_id: Tenant ID
+            contact: Normalized contact
+            lead_id: Created (or existing) lead ID
+        """
+        try:
+            await get_redis().set(
+                REDIS_KEY.format(tenant_id, contact),
+                lead_id,
+                ex=settings.lead_dedup_window,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store lead dedup key: {e}")
+
+    async def release(self, tenant_id: int, contact: str) -> None:
+        """
+        Release a claim after the lead could not be created.
+
+        Args:
+            tenant_id: Tenant ID
+            contact: Normalized contact
+        """
+        try:
+            await get_redis().delete(REDIS_KEY.format(tenant_id, contact))
+        except Exception as e:
+            logger.warning(f"Failed to release lead dedup key: {e}")
+
+
+# Global deduplicator instance
+lead_deduplicator = LeadDeduplicator()
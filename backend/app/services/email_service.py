@@ -6,7 +6,13 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, List, Dict, Any
 
+import aiosmtplib
+
+from app.core.async_smtp import async_smtp
 from app.core.config import settings
+from app.core.smtp_pool import smtp_pool
+from app.models.lead import LeadChannel
+from app.services.template_service import get_default_template
 
 logger = logging.getLogger(__name__)
 
@@ -37,16 +43,16 @@ class EmailService:
         if not self.smtp_host or not self.smtp_user:
             logger.warning("SMTP credentials not configured. Email sending will fail.")
 
-    def send_email(
+    def build_message(
         self,
         to_email: str,
         subject: str,
         body_html: Optional[str] = None,
         body_text: Optional[str] = None,
         reply_to: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> MIMEMultipart:
         """
-        Send email.
+        Build a MIME message.
 
         Args:
             to_email: Recipient email address
@@ -56,10 +62,10 @@ class EmailService:
             reply_to: Reply-To email (optional)
 
         Returns:
-            Dict with success status and message ID
+            Message ready to send
 
         Raises:
-            EmailServiceError: If email sending fails
+            EmailServiceError: If required fields are missing
         """
         # Validate
         if not to_email:
@@ -90,16 +96,37 @@ class EmailService:
             html_part = MIMEText(body_html, 'html', 'utf-8')
             msg.attach(html_part)
 
-        # Send email
-        try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30) as server:
-                if self.use_tls:
-                    server.starttls()
+        return msg
 
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
+    def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: Optional[str] = None,
+        body_text: Optional[str] = None,
+        reply_to: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send email over a pooled SMTP session.
 
-                server.send_message(msg)
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body_html: HTML body (optional)
+            body_text: Plain text body (optional, falls back to HTML if not provided)
+            reply_to: Reply-To email (optional)
+
+        Returns:
+            Dict with success status and message ID
+
+        Raises:
+            EmailServiceError: If email sending fails
+        """
+        msg = self.build_message(to_email, subject, body_html, body_text, reply_to)
+
+        # Send email
+        try:
+            smtp_pool.send(msg)
 
             logger.info(f"Email sent successfully to {to_email}")
 
@@ -121,68 +148,182 @@ class EmailService:
             logger.error(f"Unexpected error while sending email: {e}")
             raise EmailServiceError(f"Failed to send email: {e}") from e
 
-    def send_welcome_email(
+    def send_emails(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send many emails over pooled SMTP sessions.
+
+        Messages go out back to back on the same authenticated session, so a
+        burst costs one connection setup instead of one per email.
+
+        Args:
+            emails: Dicts with send_email arguments (to_email, subject,
+                body_html, body_text, reply_to)
+
+        Returns:
+            One result per email, in the same order: to_email, success, error
+
+        Raises:
+            EmailServiceError: If no SMTP session can be opened
+        """
+        results: List[Dict[str, Any]] = []
+        messages = []
+
+        for email in emails:
+            try:
+                messages.append(self.build_message(**email))
+                results.append({"to_email": email.get("to_email"), "success": True, "error": None})
+            except EmailServiceError as e:
+                results.append({"to_email": email.get("to_email"), "success": False, "error": str(e)})
+
+        try:
+            errors = iter(smtp_pool.send_many(messages))
+        except Exception as e:
+            logger.error(f"SMTP error while sending {len(messages)} email(s): {e}")
+            raise EmailServiceError(f"Failed to send emails: {e}") from e
+
+        for result in results:
+            if result["success"]:
+                error = next(errors)
+                if error:
+                    result.update(success=False, error=str(error))
+
+        sent = sum(1 for result in results if result["success"])
+        logger.info(f"Sent {sent}/{len(emails)} email(s)")
+
+        return results
+
+    async def send_email_async(
         self,
         to_email: str,
-        name: str,
-        company_name: str = "Fast Lead",
+        subject: str,
+        body_html: Optional[str] = None,
+        body_text: Optional[str] = None,
+        reply_to: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Send welcome email to new lead.
+        Send email with the async SMTP engine (no thread is blocked).
 
         Args:
-            to_email: Recipient email
-            name: Lead name
-            company_name: Company name
+            to_email: Recipient email address
+            subject: Email subject
+            body_html: HTML body (optional)
+            body_text: Plain text body (optional)
+            reply_to: Reply-To email (optional)
 
         Returns:
-            Send result
+            Dict with success status
+
+        Raises:
+            EmailServiceError: If email sending fails
         """
-        subject = f"Спасибо за интерес к {company_name}"
+        msg = self.build_message(to_email, subject, body_html, body_text, reply_to)
+
+        try:
+            await async_smtp.send(msg)
 
-        body_html = f"""
-        <html>
-          <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-              <h2 style="color: #2563eb;">Здравствуйте, {name}!</h2>
+        except aiosmtplib.SMTPAuthenticationError as e:
+            logger.error(f"SMTP authentication failed: {e}")
+            raise EmailServiceError(f"Authentication failed: {e}") from e
 
-              <p>Спасибо за интерес к нашим услугам.</p>
+        except Exception as e:
+            logger.error(f"SMTP error while sending email: {e}")
+            raise EmailServiceError(f"Failed to send email: {e}") from e
+
+        logger.info(f"Email sent successfully to {to_email}")
+
+        return {
+            "success": True,
+            "to_email": to_email,
+            "subject": subject,
+        }
+
+    async def send_emails_async(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send many emails concurrently with the async SMTP engine.
 
-              <p>Наш специалист свяжется с вами в ближайшее время для обсуждения деталей.</p>
+        Up to SMTP_ASYNC_MAX_CONNECTIONS_PER_HOST messages are in flight at
+        once; the rest wait for a free session.
 
-              <p>Если у вас есть срочные вопросы, вы можете ответить на это письмо.</p>
+        Args:
+            emails: Dicts with send_email arguments
 
-              <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
-                <p style="color: #666; font-size: 14px;">
-                  С уважением,<br>
-                  Команда {company_name}
-                </p>
-              </div>
-            </div>
-          </body>
-        </html>
+        Returns:
+            One result per email, in the same order: to_email, success, error
         """
+        results: List[Dict[str, Any]] = []
+        messages = []
+
+        for email in emails:
+            try:
+                messages.append(self.build_message(**email))
+                results.append({"to_email": email.get("to_email"), "success": True, "error": None})
+            except EmailServiceError as e:
+                results.append({"to_email": email.get("to_email"), "success": False, "error": str(e)})
 
-        body_text = f"""
-Здравствуйте, {name}!
+        errors = iter(await async_smtp.send_many(messages))
 
-Спасибо за интерес к нашим услугам.
+        for result in results:
+            if result["success"]:
+                error = next(errors)
+                if error:
+                    result.update(success=False, error=str(error))
 
-Наш специалист свяжется с вами в ближайшее время для обсуждения деталей.
+        sent = sum(1 for result in results if result["success"])
+        logger.info(f"Sent {sent}/{len(emails)} email(s)")
 
-Если у вас есть срочные вопросы, вы можете ответить на это письмо.
+        return results
 
-С уважением,
-Команда {company_name}
+    def send_welcome_email(
+        self,
+        to_email: str,
+        name: str,
+        company_name: str = "Fast Lead",
+    ) -> Dict[str, Any]:
         """
+        Send welcome email to new lead.
 
-        return self.send_email(
-            to_email=to_email,
-            subject=subject,
-            body_html=body_html,
-            body_text=body_text,
+        Args:
+            to_email: Recipient email
+            name: Lead name
+            company_name: Company name
+
+        Returns:
+            Send result
+        """
+        return self.send_email(**self.welcome_email(to_email, name, company_name))
+
+    async def send_welcome_email_async(
+        self,
+        to_email: str,
+        name: str,
+        company_name: str = "Fast Lead",
+    ) -> Dict[str, Any]:
+        """Send welcome email to new lead without blocking the event loop."""
+        return await self.send_email_async(**self.welcome_email(to_email, name, company_name))
+
+    def welcome_email(
+        self,
+        to_email: str,
+        name: str,
+        company_name: str = "Fast Lead",
+    ) -> Dict[str, Any]:
+        """
+        Build welcome email from the built-in template.
+
+        Returns:
+            send_email arguments (to_email, subject, body_html, body_text)
+        """
+        message = get_default_template(LeadChannel.EMAIL, "welcome").render(
+            {"name": name, "company_name": company_name}
         )
 
+        return {
+            "to_email": to_email,
+            "subject": message.subject,
+            "body_html": message.body_html,
+            "body_text": message.body,
+        }
+
     def send_booking_confirmation(
         self,
         to_email: str,
@@ -202,70 +343,42 @@ class EmailService:
         Returns:
             Send result
         """
-        subject = "Подтверждение встречи"
-
-        body_html = f"""
-        <html>
-          <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-              <h2 style="color: #2563eb;">Встреча подтверждена!</h2>
-
-              <p>Здравствуйте, {name}!</p>
-
-              <p>Ваша встреча успешно забронирована на <strong>{booking_time}</strong>.</p>
-
-              <div style="margin: 30px 0; padding: 20px; background-color: #f3f4f6; border-radius: 8px;">
-                <p style="margin: 0;">
-                  <a href="{booking_url}"
-                     style="display: inline-block; padding: 12px 24px; background-color: #2563eb; color: white; text-decoration: none; border-radius: 6px;">
-                    Открыть встречу
-                  </a>
-                </p>
-              </div>
-
-              <p>По этой ссылке вы сможете:</p>
-              <ul>
-                <li>Добавить встречу в календарь</li>
-                <li>Перенести встречу</li>
-                <li>Отменить встречу</li>
-              </ul>
-
-              <p>До встречи!</p>
-
-              <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
-                <p style="color: #666; font-size: 14px;">
-                  С уважением,<br>
-                  Команда Fast Lead
-                </p>
-              </div>
-            </div>
-          </body>
-        </html>
-        """
-
-        body_text = f"""
-Встреча подтверждена!
-
-Здравствуйте, {name}!
-
-Ваша встреча успешно забронирована на {booking_time}.
-
-Ссылка на встречу: {booking_url}
-
-По этой ссылке вы сможете:
-- Добавить встречу в календарь
-- Перенести встречу
-- Отменить встречу
+        return self.send_email(
+            **self.booking_confirmation_email(to_email, name, booking_url, booking_time)
+        )
 
-До встречи!
+    async def send_booking_confirmation_async(
+        self,
+        to_email: str,
+        name: str,
+        booking_url: str,
+        booking_time: str,
+    ) -> Dict[str, Any]:
+        """Send booking confirmation email without blocking the event loop."""
+        return await self.send_email_async(
+            **self.booking_confirmation_email(to_email, name, booking_url, booking_time)
+        )
 
-С уважением,
-Команда Fast Lead
+    def booking_confirmation_email(
+        self,
+        to_email: str,
+        name: str,
+        booking_url: str,
+        booking_time: str,
+    ) -> Dict[str, Any]:
         """
+        Build booking confirmation email from the built-in template.
 
-        return self.send_email(
-            to_email=to_email,
-            subject=subject,
-            body_html=body_html,
-            body_text=body_text,
+        Returns:
+            send_email arguments (to_email, subject, body_html, body_text)
+        """
+        message = get_default_template(LeadChannel.EMAIL, "booking_confirmation").render(
+            {"name": name, "booking_url": booking_url, "booking_time": booking_time}
         )
+
+        return {
+            "to_email": to_email,
+            "subject": message.subject,
+            "body_html": message.body_html,
+            "body_text": message.body,
+        }
@@ -1,11 +1,15 @@
 """Lead service - business logic for lead management."""
 
-from typing import Optional
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.core.config import settings
 from app.models.lead import Lead, LeadStatus
 from app.schemas.lead import CreateLeadRequest
+from app.services.dedup_service import lead_deduplicator, normalize_contact
+from app.services.outbox_service import OutboxService
 
 
 class LeadService:
@@ -19,47 +23,153 @@ class LeadService:
         self,
         data: CreateLeadRequest,
         tenant_id: int
-    ) -> Lead:
+    ) -> Tuple[Lead, bool]:
         """
-        Create a new lead.
+        Create a new lead, unless the contact already submitted one recently.
+
+        The orchestrator task is written to the outbox in the same transaction,
+        so it is published by the outbox relay once the lead is committed.
+        A repeat submission of the same phone, email or VK ID within
+        LEAD_DEDUP_WINDOW returns the existing lead and enqueues nothing.
 
         Args:
             data: Lead creation request data
             tenant_id: ID of the tenant creating the lead
 
         Returns:
-            Created Lead instance
+            Tuple of (lead, duplicate): the created lead, or the existing
+            lead with duplicate=True
         """
-        # Create lead instance
-        lead = Lead(
-            name=data.name,
-            phone=data.phone,
-            email=data.email,
-            vk_id=data.vk_id,
-            channel=data.channel,
-            status=LeadStatus.NEW,
-            source=data.source,
-            consent_gdpr=data.consent.gdpr,
-            consent_marketing=data.consent.marketing,
-            payload=data.payload,
-            tenant_id=tenant_id,
-        )
+        contact = normalize_contact(data) if settings.lead_dedup_enabled else None
+
+        if contact is None:
+            return await self._insert_lead(self._lead_values(data, tenant_id)), False
+
+        existing_id = await lead_deduplicator.claim(tenant_id, contact)
+        if existing_id is not None:
+            lead = await self.get_lead(existing_id, tenant_id)
+            if lead is not None:
+                return lead, True
+
+        values = self._lead_values(data, tenant_id)
+        values["dedup_key"] = lead_deduplicator.dedup_key(contact)
+
+        try:
+            lead = await self._insert_lead(values)
+            duplicate = lead is None
+
+            if duplicate:
+                # Lost the race to a concurrent submission (or Redis was down)
+                result = await self.db.execute(
+                    select(Lead).where(
+                        Lead.tenant_id == tenant_id,
+                        Lead.dedup_key == values["dedup_key"],
+                    )
+                )
+                lead = result.scalar_one()
+        except Exception:
+            await lead_deduplicator.release(tenant_id, contact)
+            raise
+
+        await lead_deduplicator.remember(tenant_id, contact, lead.id)
+        return lead, duplicate
+
+    async def _insert_lead(self, values: Dict[str, Any]) -> Optional[Lead]:
+        """
+        Insert a lead and enqueue its orchestrator task.
+
+        Args:
+            values: Lead column values
+
+        Returns:
+            Created Lead, or None if a lead with the same dedup_key exists
+        """
+        stmt = pg_insert(Lead).values(**values)
+        if values.get("dedup_key"):
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=["tenant_id", "dedup_key"],
+                index_where=Lead.dedup_key.isnot(None),
+            )
 
-        # Add UTM parameters if provided
-        if data.utm:
-            lead.utm_source = data.utm.source
-            lead.utm_medium = data.utm.medium
-            lead.utm_campaign = data.utm.campaign
-            lead.utm_content = data.utm.content
-            lead.utm_term = data.utm.term
+        # Insert and get server-generated columns back in one round-trip
+        result = await self.db.scalars(stmt.returning(Lead))
+        lead = result.one_or_none()
 
-        # Save to database
-        self.db.add(lead)
+        if lead is None:
+            return None
+
+        await OutboxService(self.db).enqueue("process_new_lead", args=[lead.id])
         await self.db.commit()
-        await self.db.refresh(lead)
 
         return lead
 
+    async def create_leads(
+        self,
+        items: List[CreateLeadRequest],
+        tenant_id: int
+    ) -> List[Lead]:
+        """
+        Create many leads with a single multi-row INSERT ... RETURNING.
+
+        Orchestrator tasks for all leads are written to the outbox with one
+        more INSERT in the same transaction. Imports are not deduplicated.
+
+        Args:
+            items: Validated lead creation requests
+            tenant_id: ID of the tenant creating the leads
+
+        Returns:
+            Created Lead instances, in the same order as items
+        """
+        if not items:
+            return []
+
+        rows = [self._lead_values(data, tenant_id) for data in items]
+
+        stmt = insert(Lead).returning(Lead, sort_by_parameter_order=True)
+        result = await self.db.scalars(stmt, rows)
+        leads = list(result.all())
+
+        await OutboxService(self.db).enqueue_many(
+            "process_new_lead",
+            [[lead.id] for lead in leads],
+        )
+        await self.db.commit()
+
+        return leads
+
+    def _lead_values(self, data: CreateLeadRequest, tenant_id: int) -> Dict[str, Any]:
+        """
+        Map a lead creation request to Lead column values.
+
+        Args:
+            data: Lead creation request data
+            tenant_id: ID of the tenant creating the lead
+
+        Returns:
+            Dict of column values for the Lead model
+        """
+        utm = data.utm
+
+        return {
+            "name": data.name,
+            "phone": data.phone,
+            "email": data.email,
+            "vk_id": data.vk_id,
+            "channel": data.channel,
+            "status": LeadStatus.NEW,
+            "source": data.source,
+            "utm_source": utm.source if utm else None,
+            "utm_medium": utm.medium if utm else None,
+            "utm_campaign": utm.campaign if utm else None,
+            "utm_content": utm.content if utm else None,
+            "utm_term": utm.term if utm else None,
+            "consent_gdpr": data.consent.gdpr,
+            "consent_marketing": data.consent.marketing,
+            "payload": data.payload,
+            "tenant_id": tenant_id,
+        }
+
     async def get_lead(self, lead_id: int, tenant_id: int) -> Optional[Lead]:
         """
         Get lead by ID.
@@ -0,0 +1,143 @@
+"""Lead status buffer - batched status transitions for the orchestrator."""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, cast, column, func, update, values
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.lead import Lead, LeadStatus
+
+logger = logging.getLogger(__name__)
+
+# (status, contacted_at) of the latest pending transition per lead
+Transition = Tuple[LeadStatus, Optional[datetime]]
+
+
+class LeadStatusBuffer:
+    """
+    Collects lead status transitions and writes them in bulk.
+
+    Transitions are flushed as a single ``UPDATE ... FROM (VALUES ...)`` when
+    the buffer reaches ``max_rows``, after ``flush_interval`` seconds, or when
+    ``flush()`` is called explicitly (the orchestrator flushes on task
+    completion). Only the latest status per lead is kept between flushes and
+    flushes are serialized, so per-lead ordering is preserved.
+
+    The first transition to CONTACTED also records ``contacted_at``.
+
+    Must be used from a single event loop (the worker async runtime).
+    """
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        max_rows: Optional[int] = None,
+    ):
+        """Initialize buffer."""
+        self.flush_interval = flush_interval or settings.lead_status_flush_interval
+        self.max_rows = max_rows or settings.lead_status_flush_max_rows
+        self._pending: Dict[int, Transition] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def record(self, lead_id: int, status: LeadStatus) -> None:
+        """
+        Record a status transition.
+
+        Args:
+            lead_id: Lead ID
+            status: New lead status
+        """
+        contacted_at = datetime.utcnow() if status == LeadStatus.CONTACTED else None
+
+        previous = self._pending.get(lead_id)
+        if previous and previous[1] and not contacted_at:
+            # Keep first contact time if the lead moves on before the flush
+            contacted_at = previous[1]
+
+        self._pending[lead_id] = (status, contacted_at)
+
+        if len(self._pending) >= self.max_rows:
+            await self.flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        """Timer callback: run a flush in the background."""
+        self._timer = None
+        asyncio.ensure_future(self._flush_quietly())
+
+    async def _flush_quietly(self) -> None:
+        """Flush and log errors (pending transitions are kept for retry)."""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush lead status transitions: {e}")
+
+    async def flush(self) -> int:
+        """
+        Write all pending transitions in one UPDATE.
+
+        Returns:
+            Number of leads updated
+
+        Raises:
+            Exception: If the update fails (transitions are kept for retry)
+        """
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                await self._write(pending)
+            except Exception:
+                # Put transitions back unless newer ones were recorded meanwhile
+                for lead_id, transition in pending.items():
+                    self._pending.setdefault(lead_id, transition)
+                raise
+
+            logger.info(f"Flushed {len(pending)} lead status transition(s)")
+            return len(pending)
+
+    async def _write(self, pending: Dict[int, Transition]) -> None:
+        """Execute the bulk UPDATE ... FROM (VALUES ...)."""
+        transitions = values(
+            column("id", Integer),
+            column("status", Lead.__table__.c.status.type),
+            column("contacted_at", DateTime),
+            name="transitions",
+        ).data([
+            (lead_id, status, contacted_at)
+            for lead_id, (status, contacted_at) in pending.items()
+        ])
+
+        stmt = (
+            update(Lead)
+            .where(Lead.id == transitions.c.id)
+            .values(
+                status=transitions.c.status,
+                contacted_at=func.coalesce(
+                    Lead.contacted_at,
+                    cast(transitions.c.contacted_at, DateTime),
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        async with async_session_maker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+
+# Per-process buffer used by the orchestrator tasks
+lead_status_buffer = LeadStatusBuffer()
@@ -0,0 +1,253 @@
+"""Outbox service - transactional task enqueue and relay to Celery."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+
+from kombu.exceptions import OperationalError
+from sqlalchemy import select, update, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.outbox import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """
+    Service for enqueueing Celery tasks through the outbox table.
+
+    Tasks are written with the caller's session and become visible to the
+    relay only when the caller commits, so a task is never published for data
+    that was rolled back, and never lost for data that was committed.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize service with database session."""
+        self.db = db
+
+    async def enqueue(
+        self,
+        task_name: str,
+        args: Optional[List[Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        **options: Any,
+    ) -> None:
+        """
+        Add a task to the outbox (does not commit).
+
+        Args:
+            task_name: Registered Celery task name (e.g., "process_new_lead")
+            args: Positional task arguments
+            kwargs: Keyword task arguments
+            **options: apply_async options (queue, priority, countdown)
+        """
+        await self.enqueue_many(task_name, [args or []], kwargs=kwargs, **options)
+
+    async def enqueue_many(
+        self,
+        task_name: str,
+        args_list: List[List[Any]],
+        kwargs: Optional[Dict[str, Any]] = None,
+        **options: Any,
+    ) -> None:
+        """
+        Add one task per argument list to the outbox with a single INSERT.
+
+        Args:
+            task_name: Registered Celery task name
+            args_list: Positional arguments for each task
+            kwargs: Keyword arguments shared by all tasks
+            **options: apply_async options shared by all tasks
+        """
+        if not args_list:
+            return
+
+        rows = [
+            {
+                "task_name": task_name,
+                "args": args,
+                "kwargs": kwargs,
+                "options": options or None,
+            }
+            for args in args_list
+        ]
+        await self.db.execute(insert(OutboxMessage), rows)
+
+
+class OutboxRelay:
+    """
+    Publishes outbox rows to the Celery broker in batches.
+
+    Runs as a separate process (see ``app.outbox_relay``). Rows are claimed
+    with ``FOR UPDATE SKIP LOCKED``, so several relays can run side by side.
+    Delivery is at-least-once: a crash between publishing and committing
+    re-publishes the batch.
+
+    A row that fails to publish (e.g. its arguments cannot be serialized) is
+    retried on later batches; after ``OUTBOX_MAX_ATTEMPTS`` failures it is
+    marked dead (``dead_at``, ``last_error``) and skipped. Rows are not
+    charged an attempt when the broker itself is unavailable. Dead rows are
+    kept for inspection; clear ``dead_at`` to publish one again.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        """Initialize relay."""
+        self.batch_size = batch_size or settings.outbox_batch_size
+        self.poll_interval = poll_interval or settings.outbox_poll_interval
+        self._last_cleanup = datetime.min
+
+    async def relay_batch(self) -> int:
+        """
+        Publish one batch of pending outbox rows.
+
+        Returns:
+            Number of rows published
+        """
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(
+                    OutboxMessage.id,
+                    OutboxMessage.task_name,
+                    OutboxMessage.args,
+                    OutboxMessage.kwargs,
+                    OutboxMessage.options,
+                    OutboxMessage.attempts,
+                )
+                .where(OutboxMessage.published_at.is_(None), OutboxMessage.dead_at.is_(None))
+                .order_by(OutboxMessage.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.all()
+
+            if not rows:
+                await session.rollback()
+                return 0
+
+            messages = [tuple(row[:5]) for row in rows]
+            attempts = {row.id: row.attempts for row in rows}
+
+            # Broker publish is blocking, keep it off the event loop
+            published, failed = await asyncio.to_thread(self._publish, messages)
+
+            if published:
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(published))
+                    .values(published_at=datetime.utcnow())
+                )
+
+            dead = []
+            for message_id, error in failed:
+                values = {"attempts": OutboxMessage.attempts + 1, "last_error": error}
+                if attempts[message_id] + 1 >= settings.outbox_max_attempts:
+                    values["dead_at"] = datetime.utcnow()
+                    dead.append(message_id)
+
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id == message_id)
+                    .values(**values)
+                )
+
+            await session.commit()
+
+        if dead:
+            logger.error(
+                f"Outbox message(s) {dead} failed {settings.outbox_max_attempts} times, marked dead"
+            )
+
+        if failed:
+            logger.warning(f"Outbox relay failed to publish {len(failed)} message(s)")
+
+        return len(published)
+
+    def _publish(self, messages: List[Tuple]) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """
+        Publish messages over a single broker connection.
+
+        Args:
+            messages: Tuples of (id, task_name, args, kwargs, options)
+
+        Returns:
+            Tuple of (published IDs, [(failed ID, error)])
+        """
+        published = []
+        failed = []
+
+        with celery_app.producer_or_acquire() as producer:
+            for message_id, task_name, args, kwargs, options in messages:
+                try:
+                    celery_app.send_task(
+                        task_name,
+                        args=args or [],
+                        kwargs=kwargs or {},
+                        producer=producer,
+                        **(options or {}),
+                    )
+                    published.append(message_id)
+                except OperationalError as e:
+                    # Broker unavailable: leave the rest for the next batch
+                    logger.error(f"Broker unavailable, outbox batch interrupted: {e}")
+                    break
+                except Exception as e:
+                    logger.error(f"Failed to publish outbox message {message_id}: {e}")
+                    failed.append((message_id, str(e)))
+
+        return published, failed
+
+    async def cleanup(self) -> None:
+        """Delete published rows older than the retention period."""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.outbox_retention_hours)
+
+        async with async_session_maker() as session:
+            await session.execute(
+                delete(OutboxMessage).where(OutboxMessage.published_at < cutoff)
+            )
+            await session.commit()
+
+        self._last_cleanup = datetime.utcnow()
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Relay outbox rows until stopped.
+
+        Full batches are followed immediately by the next one; otherwise the
+        relay sleeps for the poll interval.
+
+        Args:
+            stop_event: Event that stops the loop when set (optional)
+        """
+        stop_event = stop_event or asyncio.Event()
+        logger.info(
+            f"Outbox relay started (batch_size={self.batch_size}, "
+            f"poll_interval={self.poll_interval}s)"
+        )
+
+        while not stop_event.is_set():
+            try:
+                published = await self.relay_batch()
+
+                if datetime.utcnow() - self._last_cleanup > timedelta(minutes=10):
+                    await self.cleanup()
+
+            except Exception as e:
+                logger.error(f"Outbox relay error: {e}")
+                published = 0
+
+            if published < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+        logger.info("Outbox relay stopped")
@@ -0,0 +1,338 @@
+"""Slot index - local view of free, held and booked Cal.com slots."""
+
+import logging
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Free slots of one UTC day (set), booked slots (sorted set by start time),
+# short-lived hold of one slot
+FREE_KEY = "slots:{}:free:{}"
+BOOKED_KEY = "slots:{}:booked"
+HOLD_KEY = "slots:{}:hold:{}"
+
+# Member of a synced day without free slots
+EMPTY_DAY = "-"
+
+# Booked slots are kept this long after they started
+BOOKED_RETENTION = timedelta(days=1)
+
+# KEYS: free day set, booked set, hold key. ARGV: slot, token, hold TTL (ms).
+# Returns "held", "booked", "unavailable" or "locked". A hold with the same
+# token is extended.
+HOLD_SCRIPT = """
+if redis.call("ZSCORE", KEYS[2], ARGV[1]) then
+    return "booked"
+end
+if redis.call("GET", KEYS[3]) == ARGV[2] then
+    redis.call("PEXPIRE", KEYS[3], ARGV[3])
+    return "held"
+end
+if redis.call("EXISTS", KEYS[1]) == 1 and redis.call("SISMEMBER", KEYS[1], ARGV[1]) == 0 then
+    return "unavailable"
+end
+if redis.call("SET", KEYS[3], ARGV[2], "NX", "PX", ARGV[3]) then
+    return "held"
+end
+return "locked"
+"""
+
+# KEYS: free day set, booked set, hold key. ARGV: slot, token, slot start
+# (epoch s), cutoff for old booked slots (epoch s).
+BOOK_SCRIPT = """
+redis.call("SREM", KEYS[1], ARGV[1])
+redis.call("ZADD", KEYS[2], ARGV[3], ARGV[1])
+redis.call("ZREMRANGEBYSCORE", KEYS[2], "-inf", ARGV[4])
+if ARGV[2] ~= "" and redis.call("GET", KEYS[3]) == ARGV[2] then
+    redis.call("DEL", KEYS[3])
+end
+return 1
+"""
+
+# KEYS: hold key. ARGV: token. Deletes the hold only if still ours.
+RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class SlotUnavailable(Exception):
+    """The slot is booked, not offered by Cal.com, or held by another request."""
+
+    def __init__(self, slot: str, reason: str):
+        super().__init__(f"Slot {slot} is {reason}")
+        self.slot = slot
+        self.reason = reason
+
+
+class SlotHold(NamedTuple):
+    """Reservation of a slot while it is being booked in Cal.com."""
+
+    event_type_id: int
+    slot: str
+    token: str
+
+
+def normalize_slot(value: str) -> Optional[Tuple[str, datetime]]:
+    """
+    Normalize a slot start time to UTC.
+
+    Args:
+        value: ISO 8601 start time (naive times are taken as UTC)
+
+    Returns:
+        Tuple of (canonical "YYYY-MM-DDTHH:MM:SSZ", UTC datetime), or None if
+        the value is not a valid time
+    """
+    try:
+        start = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    start = start.astimezone(timezone.utc).replace(microsecond=0)
+    return start.strftime("%Y-%m-%dT%H:%M:%SZ"), start
+
+
+class SlotIndex:
+    """
+    Index of free, held and booked slots per event type, in Redis.
+
+    * Free slots per UTC day are synced from Cal.com availability (see
+      ``AvailabilityCache``) and expire with AVAILABILITY_STALE_TTL. A day
+      that was never synced is unknown and any slot in it is allowed.
+    * Booked slots come from our bookings and Cal.com webhooks.
+    * ``hold()`` atomically checks both and reserves the slot for
+      SLOT_HOLD_TTL seconds, so concurrent requests for the same slot are
+      rejected locally instead of racing in Cal.com.
+
+    If Redis is unavailable, holds are skipped and Cal.com decides.
+    """
+
+    def __init__(self):
+        """Initialize index."""
+        self._scripts = None
+        self._scripts_client = None
+
+    def _get_scripts(self):
+        """Get Lua scripts registered on the current Redis client."""
+        redis = get_redis()
+        if self._scripts is None or self._scripts_client is not redis:
+            self._scripts = (
+                redis.register_script(HOLD_SCRIPT),
+                redis.register_script(BOOK_SCRIPT),
+                redis.register_script(RELEASE_SCRIPT),
+            )
+            self._scripts_client = redis
+        return self._scripts
+
+    def _keys(self, event_type_id: int, slot: str, start: datetime) -> List[str]:
+        return [
+            FREE_KEY.format(event_type_id, start.date().isoformat()),
+            BOOKED_KEY.format(event_type_id),
+            HOLD_KEY.format(event_type_id, slot),
+        ]
+
+    async def hold(self, event_type_id: int, start_time: str) -> Optional[SlotHold]:
+        """
+        Reserve a slot before booking it in Cal.com.
+
+        Args:
+            event_type_id: Event type ID
+            start_time: Slot start time (ISO 8601)
+
+        Returns:
+            Hold to confirm or release, or None if the index is disabled,
+            the time is not parseable or Redis is unavailable
+
+        Raises:
+            SlotUnavailable: If the slot is booked, not free or held
+        """
+        normalized = normalize_slot(start_time)
+        if not settings.slot_index_enabled or normalized is None:
+            return None
+
+        hold = SlotHold(event_type_id, normalized[0], uuid.uuid4().hex)
+        try:
+            await self._hold(hold, settings.slot_hold_ttl)
+        except SlotUnavailable:
+            raise
+        except Exception as e:
+            logger.warning(f"Slot index unavailable, booking without a hold: {e}")
+            return None
+
+        return hold
+
+    async def renew(self, hold: Optional[SlotHold], ttl: float) -> None:
+        """
+        Extend a hold, or take it again if it expired and the slot is free.
+
+        Used when the booking starts later than the hold was taken (booking
+        task), so the hold covers the Cal.com call.
+
+        Args:
+            hold: Hold to extend
+            ttl: New hold TTL (seconds)
+
+        Raises:
+            SlotUnavailable: If the hold expired and the slot was taken since
+        """
+        if hold is None:
+            return
+
+        try:
+            await self._hold(hold, ttl)
+        except SlotUnavailable:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to renew slot hold {hold.slot}: {e}")
+
+    async def _hold(self, hold: SlotHold, ttl: float) -> None:
+        """Run the hold script for a hold (raises SlotUnavailable)."""
+        _, start = normalize_slot(hold.slot)
+        hold_script, _, _ = self._get_scripts()
+        result = await hold_script(
+            keys=self._keys(hold.event_type_id, hold.slot, start),
+            args=[hold.slot, hold.token, int(ttl * 1000)],
+        )
+
+        if result != "held":
+            raise SlotUnavailable(hold.slot, {"locked": "held by another booking"}.get(result, result))
+
+    async def confirm(self, hold: Optional[SlotHold]) -> None:
+        """Mark a held slot as booked (after Cal.com accepted the booking)."""
+        if hold is not None:
+            await self._book(hold.event_type_id, hold.slot, hold.token)
+
+    async def release(self, hold: Optional[SlotHold]) -> None:
+        """Release a hold (after the Cal.com booking failed)."""
+        if hold is None:
+            return
+
+        try:
+            _, _, release = self._get_scripts()
+            await release(keys=[HOLD_KEY.format(hold.event_type_id, hold.slot)], args=[hold.token])
+        except Exception as e:
+            logger.warning(f"Failed to release slot hold {hold.slot}: {e}")
+
+    async def mark_booked(self, event_type_id: int, start_time: Optional[str]) -> None:
+        """
+        Mark a slot as booked (booking created outside this request).
+
+        Args:
+            event_type_id: Event type ID
+            start_time: Slot start time (ISO 8601)
+        """
+        normalized = normalize_slot(start_time) if start_time else None
+        if normalized is not None:
+            await self._book(event_type_id, normalized[0], "")
+
+    async def mark_free(self, event_type_id: int, start_time: Optional[str]) -> None:
+        """
+        Forget a booked slot (booking cancelled or moved).
+
+        The slot's day becomes unknown until the next availability sync.
+
+        Args:
+            event_type_id: Event type ID
+            start_time: Slot start time (ISO 8601)
+        """
+        normalized = normalize_slot(start_time) if start_time else None
+        if normalized is None or not settings.slot_index_enabled:
+            return
+
+        slot, start = normalized
+        free_key, booked_key, _ = self._keys(event_type_id, slot, start)
+
+        try:
+            pipe = get_redis().pipeline(transaction=True)
+            pipe.zrem(booked_key, slot)
+            pipe.delete(free_key)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to free slot {slot}: {e}")
+
+    async def _book(self, event_type_id: int, slot: str, token: str) -> None:
+        """Move a slot from free (and held) to booked."""
+        if not settings.slot_index_enabled:
+            return
+
+        start = normalize_slot(slot)[1]
+        cutoff = datetime.now(timezone.utc) - BOOKED_RETENTION
+
+        try:
+            _, book, _ = self._get_scripts()
+            await book(
+                keys=self._keys(event_type_id, slot, start),
+                args=[slot, token, int(start.timestamp()), int(cutoff.timestamp())],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to mark slot {slot} as booked: {e}")
+
+    async def sync(
+        self,
+        event_type_id: int,
+        date_from: Optional[str],
+        date_to: Optional[str],
+        slots: Iterable[Dict[str, Any]],
+    ) -> None:
+        """
+        Sync free slots from a Cal.com availability response.
+
+        UTC days strictly inside the requested range are replaced. Edge days
+        may be cut by the event type's timezone and are left unknown. Slots
+        Cal.com offers are no longer considered booked.
+
+        Args:
+            event_type_id: Event type ID
+            date_from: Requested start date (YYYY-MM-DD, optional)
+            date_to: Requested end date (YYYY-MM-DD, optional)
+            slots: Slots as returned by ``CalcomService.get_availability``
+        """
+        if not settings.slot_index_enabled:
+            return
+
+        days: Dict[date, List[str]] = {}
+        for item in slots:
+            if item.get("available", True) is False:
+                continue
+            normalized = normalize_slot(item.get("time"))
+            if normalized is not None:
+                days.setdefault(normalized[1].date(), []).append(normalized[0])
+
+        replaced = set()
+        try:
+            first = date.fromisoformat(date_from) + timedelta(days=1)
+            last = date.fromisoformat(date_to) - timedelta(days=1)
+            replaced = {first + timedelta(days=i) for i in range((last - first).days + 1)}
+        except (TypeError, ValueError):
+            pass
+
+        ttl = settings.availability_stale_ttl
+        booked_key = BOOKED_KEY.format(event_type_id)
+
+        try:
+            pipe = get_redis().pipeline(transaction=True)
+            for day in replaced:
+                key = FREE_KEY.format(event_type_id, day.isoformat())
+                pipe.delete(key)
+                pipe.sadd(key, *(days.get(day) or [EMPTY_DAY]))
+                pipe.expire(key, ttl)
+            free = [slot for day_slots in days.values() for slot in day_slots]
+            if free:
+                pipe.zrem(booked_key, *free)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to sync slot index of event type {event_type_id}: {e}")
+
+
+# Process-wide slot index
+slot_index = SlotIndex()
@@ -1,16 +1,23 @@
 """SMS service - SMSC.ru integration."""
 
+import asyncio
 import hashlib
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from urllib.parse import urlencode
 
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.circuit_breaker import CircuitOpen
+from app.core.rate_governor import RateLimited, rate_governor
 
 logger = logging.getLogger(__name__)
 
+# SMSC errors worth retrying: 4 - IP temporarily blocked, 9 - too many requests
+RETRYABLE_ERROR_CODES = {4, 9}
+
 
 class SMSServiceError(Exception):
     """Base exception for SMS service errors."""
@@ -30,6 +37,7 @@ class SMSService:
         self.login = settings.smsc_login
         self.password = settings.smsc_password
         self.sender = settings.smsc_sender
+        self.batch_max_recipients = settings.smsc_batch_max_recipients
 
         # Validate configuration
         if not self.login or not self.password:
@@ -56,20 +64,16 @@ class SMSService:
 
         Raises:
             SMSServiceError: If SMS sending fails
+            CircuitOpen: If the SMSC circuit breaker is open
+            RateLimited: If SMSC capacity is not available in time
         """
         # Clean phone number (remove +, spaces, etc.)
         phone = self._clean_phone(phone)
 
-        # Validate phone number
-        if not self._validate_phone(phone):
-            raise SMSServiceError(f"Invalid phone number: {phone}")
-
-        # Validate message
-        if not message or len(message) == 0:
-            raise SMSServiceError("Message cannot be empty")
-
-        if len(message) > 1000:
-            raise SMSServiceError("Message too long (max 1000 characters)")
+        # Validate phone number and message
+        error = self._check_message(phone, message)
+        if error:
+            raise SMSServiceError(error)
 
         # Prepare request parameters
         params = {
@@ -86,43 +90,45 @@ class SMSService:
         if translit:
             params["translit"] = 1
 
+        # Wait for SMSC capacity (raises RateLimited)
+        await rate_governor.acquire("smsc", credential=self.login)
+
         # Send request
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    data=params,
-                    timeout=30.0,
+            client = get_http_client("smsc")
+            response = await client.post(
+                self.api_url,
+                data=params,
+            )
+
+            # Check HTTP status
+            if response.status_code != 200:
+                raise SMSServiceError(
+                    f"SMSC API returned status {response.status_code}: {response.text}"
                 )
 
-                # Check HTTP status
-                if response.status_code != 200:
-                    raise SMSServiceError(
-                        f"SMSC API returned status {response.status_code}: {response.text}"
-                    )
-
-                # Parse JSON response
-                result = response.json()
-
-                # Check for errors
-                if "error" in result or "error_code" in result:
-                    error_code = result.get("error_code", result.get("error"))
-                    error_text = result.get("error_text", "Unknown error")
-                    raise SMSServiceError(
-                        f"SMSC API error {error_code}: {error_text}"
-                    )
-
-                logger.info(
-                    f"SMS sent successfully to {phone}. Message ID: {result.get('id')}"
+            # Parse JSON response
+            result = response.json()
+
+            # Check for errors
+            if "error" in result or "error_code" in result:
+                error_code = result.get("error_code", result.get("error"))
+                error_text = result.get("error_text", "Unknown error")
+                raise SMSServiceError(
+                    f"SMSC API error {error_code}: {error_text}"
                 )
 
-                return {
-                    "success": True,
-                    "message_id": result.get("id"),
-                    "count": result.get("cnt", 1),
-                    "cost": result.get("cost", 0),
-                    "balance": result.get("balance"),
-                }
+            logger.info(
+                f"SMS sent successfully to {phone}. Message ID: {result.get('id')}"
+            )
+
+            return {
+                "success": True,
+                "message_id": result.get("id"),
+                "count": result.get("cnt", 1),
+                "cost": result.get("cost", 0),
+                "balance": result.get("balance"),
+            }
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error while sending SMS: {e}")
@@ -131,6 +137,171 @@ class SMSService:
             logger.error(f"Unexpected error while sending SMS: {e}")
             raise SMSServiceError(f"Failed to send SMS: {e}") from e
 
+    async def send_sms_batch(
+        self,
+        messages: List[Dict[str, str]],
+        sender: Optional[str] = None,
+        translit: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send SMS to many recipients with as few API requests as possible.
+
+        Recipients that share a message text are sent with comma-separated
+        ``phones``; personalized messages are sent with the ``list`` parameter.
+        Each request carries at most ``SMSC_BATCH_MAX_RECIPIENTS`` recipients,
+        and requests are sent concurrently.
+
+        Args:
+            messages: Dicts with "phone" and "message"
+            sender: Sender name for all messages (optional)
+            translit: Transliterate messages to Latin (optional)
+
+        Returns:
+            One result per input message, in the same order: phone, success,
+            message_id, error and retryable (the request failed as a whole,
+            or the response had no result for the recipient, so it should
+            be sent again)
+        """
+        results = []
+        by_text: Dict[str, List[int]] = {}
+
+        for index, item in enumerate(messages):
+            phone = self._clean_phone(item.get("phone") or "")
+            text = item.get("message") or ""
+            error = self._check_message(phone, text)
+
+            results.append({
+                "phone": phone,
+                "success": False,
+                "message_id": None,
+                "error": error,
+                "retryable": False,
+            })
+
+            if not error:
+                by_text.setdefault(text, []).append(index)
+
+        requests = []
+        personalized = []
+
+        for text, indices in by_text.items():
+            if len(indices) == 1:
+                personalized.extend(indices)
+                continue
+
+            for chunk in self._chunks(indices):
+                phones = ",".join(results[i]["phone"] for i in chunk)
+                requests.append((chunk, {"phones": phones, "mes": text}))
+
+        for chunk in self._chunks(personalized):
+            # list format: "phone:message" per line, newlines in text escaped
+            lines = (
+                f"{results[i]['phone']}:{messages[i]['message']}".replace("\n", "\\n")
+                for i in chunk
+            )
+            requests.append((chunk, {"list": "\n".join(lines)}))
+
+        await asyncio.gather(*(
+            self._send_batch_request(chunk, params, results, sender, translit)
+            for chunk, params in requests
+        ))
+
+        sent = sum(1 for result in results if result["success"])
+        logger.info(
+            f"SMS batch: {sent}/{len(messages)} sent in {len(requests)} request(s)"
+        )
+
+        return results
+
+    async def _send_batch_request(
+        self,
+        indices: List[int],
+        recipients: Dict[str, str],
+        results: List[Dict[str, Any]],
+        sender: Optional[str],
+        translit: bool,
+    ) -> None:
+        """
+        Send one batch request and fill in results for its recipients.
+
+        Args:
+            indices: Positions of the request recipients in results
+            recipients: Either "phones" and "mes", or "list"
+            results: Per-message results to update
+            sender: Sender name (optional)
+            translit: Transliterate messages to Latin
+        """
+        params = {
+            "login": self.login,
+            "psw": self.password,
+            **recipients,
+            "sender": sender or self.sender,
+            "charset": "utf-8",
+            "fmt": 3,  # JSON response format
+            "op": 1,  # Per-phone results
+        }
+
+        if translit:
+            params["translit"] = 1
+
+        try:
+            await rate_governor.acquire("smsc", credential=self.login)
+        except (RateLimited, CircuitOpen) as e:
+            for i in indices:
+                results[i].update(error=str(e), retryable=True)
+            return
+
+        try:
+            client = get_http_client("smsc")
+            response = await client.post(self.api_url, data=params)
+
+            if response.status_code != 200:
+                raise httpx.HTTPStatusError(
+                    f"SMSC API returned status {response.status_code}",
+                    request=response.request,
+                    response=response,
+                )
+
+            result = response.json()
+
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"HTTP error while sending SMS batch: {e}")
+            for i in indices:
+                results[i].update(error=f"Failed to send SMS: {e}", retryable=True)
+            return
+
+        if "error" in result or "error_code" in result:
+            error_code = result.get("error_code", result.get("error"))
+            error_text = result.get("error_text", "Unknown error")
+            logger.error(f"SMSC API error {error_code} for SMS batch: {error_text}")
+            for i in indices:
+                results[i].update(
+                    error=f"SMSC API error {error_code}: {error_text}",
+                    retryable=error_code in RETRYABLE_ERROR_CODES,
+                )
+            return
+
+        # op=1 returns the state of every recipient
+        phones = {
+            self._clean_phone(str(entry.get("phone") or "")): entry
+            for entry in result.get("phones", [])
+        }
+
+        missing = 0
+        for i in indices:
+            entry = phones.get(results[i]["phone"])
+            if entry is None:
+                # Truncated or partial response: don't assume it was sent
+                missing += 1
+                results[i].update(error=f"No result from SMSC for {results[i]['phone']}", retryable=True)
+            elif entry.get("error"):
+                results[i]["error"] = f"SMSC error for {results[i]['phone']}: {entry['error']}"
+            else:
+                results[i].update(success=True, message_id=result.get("id"), error=None)
+
+        if missing:
+            logger.warning(f"SMSC response of SMS batch {result.get('id')} lacks {missing} recipient(s)")
+
     async def get_balance(self) -> float:
         """
         Get account balance.
@@ -148,19 +319,19 @@ class SMSService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://smsc.ru/sys/balance.php",
-                    data=params,
-                    timeout=10.0,
-                )
+            client = get_http_client("smsc")
+            response = await client.post(
+                "https://smsc.ru/sys/balance.php",
+                data=params,
+                timeout=10.0,
+            )
 
-                result = response.json()
+            result = response.json()
 
-                if "balance" in result:
-                    return float(result["balance"])
-                else:
-                    raise SMSServiceError("Failed to get balance")
+            if "balance" in result:
+                return float(result["balance"])
+            else:
+                raise SMSServiceError("Failed to get balance")
 
         except Exception as e:
             logger.error(f"Error checking balance: {e}")
@@ -191,27 +362,50 @@ class SMSService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://smsc.ru/sys/status.php",
-                    data=params,
-                    timeout=10.0,
-                )
-
-                result = response.json()
-
-                return {
-                    "status": result.get("status"),
-                    "status_name": result.get("status_name"),
-                    "last_date": result.get("last_date"),
-                    "last_timestamp": result.get("last_timestamp"),
-                    "err": result.get("err"),
-                }
+            client = get_http_client("smsc")
+            response = await client.post(
+                "https://smsc.ru/sys/status.php",
+                data=params,
+                timeout=10.0,
+            )
+
+            result = response.json()
+
+            return {
+                "status": result.get("status"),
+                "status_name": result.get("status_name"),
+                "last_date": result.get("last_date"),
+                "last_timestamp": result.get("last_timestamp"),
+                "err": result.get("err"),
+            }
 
         except Exception as e:
             logger.error(f"Error checking status: {e}")
             raise SMSServiceError(f"Failed to check status: {e}") from e
 
+    def _chunks(self, indices: List[int]) -> List[List[int]]:
+        """Split recipients into per-request chunks."""
+        size = self.batch_max_recipients
+        return [indices[i:i + size] for i in range(0, len(indices), size)]
+
+    def _check_message(self, phone: str, message: str) -> Optional[str]:
+        """
+        Validate cleaned phone number and message text.
+
+        Returns:
+            Error message, or None if valid
+        """
+        if not self._validate_phone(phone):
+            return f"Invalid phone number: {phone}"
+
+        if not message or len(message) == 0:
+            return "Message cannot be empty"
+
+        if len(message) > 1000:
+            return "Message too long (max 1000 characters)"
+
+        return None
+
     def _clean_phone(self, phone: str) -> str:
         """
         Clean phone number (remove +, spaces, dashes, etc.).
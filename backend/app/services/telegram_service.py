@@ -6,6 +6,8 @@ from typing import Optional, Dict, Any
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.rate_governor import rate_governor
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,8 @@ class TelegramService:
 
         Raises:
             TelegramServiceError: If sending fails
+            CircuitOpen: If the provider circuit breaker is open
+            RateLimited: If bot or chat capacity is not available in time
         """
         # Validate
         if not chat_id:
@@ -75,42 +79,44 @@ class TelegramService:
         if reply_markup:
             payload["reply_markup"] = reply_markup
 
+        # Wait for bot-wide and per-chat capacity
+        await rate_governor.acquire("telegram", credential=self.bot_token, recipient=chat_id)
+
         # Send request
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_url}/sendMessage",
-                    json=payload,
-                    timeout=30.0,
+            client = get_http_client("telegram")
+            response = await client.post(
+                f"{self.api_url}/sendMessage",
+                json=payload,
+            )
+
+            # Check HTTP status
+            if response.status_code != 200:
+                raise TelegramServiceError(
+                    f"Telegram API returned status {response.status_code}: {response.text}"
+                )
+
+            # Parse response
+            result = response.json()
+
+            # Check for errors
+            if not result.get("ok"):
+                error_code = result.get("error_code", 0)
+                description = result.get("description", "Unknown error")
+                raise TelegramServiceError(
+                    f"Telegram API error {error_code}: {description}"
                 )
 
-                # Check HTTP status
-                if response.status_code != 200:
-                    raise TelegramServiceError(
-                        f"Telegram API returned status {response.status_code}: {response.text}"
-                    )
-
-                # Parse response
-                result = response.json()
-
-                # Check for errors
-                if not result.get("ok"):
-                    error_code = result.get("error_code", 0)
-                    description = result.get("description", "Unknown error")
-                    raise TelegramServiceError(
-                        f"Telegram API error {error_code}: {description}"
-                    )
-
-                message_data = result.get("result", {})
-                message_id = message_data.get("message_id")
-
-                logger.info(f"Telegram message sent successfully. Message ID: {message_id}")
-
-                return {
-                    "success": True,
-                    "message_id": message_id,
-                    "chat_id": chat_id,
-                }
+            message_data = result.get("result", {})
+            message_id = message_data.get("message_id")
+
+            logger.info(f"Telegram message sent successfully. Message ID: {message_id}")
+
+            return {
+                "success": True,
+                "message_id": message_id,
+                "chat_id": chat_id,
+            }
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error while sending Telegram message: {e}")
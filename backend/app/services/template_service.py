@@ -0,0 +1,434 @@
+"""Template service - compiled, cached outbound message templates."""
+
+import html
+import logging
+import string
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.lead import LeadChannel
+from app.models.message_template import MessageTemplate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCALE = "ru"
+
+# Values available to every template unless overridden by the caller
+DEFAULT_CONTEXT: Dict[str, Any] = {"company_name": "Fast Lead"}
+
+# Built-in templates, used when a tenant has no override:
+# (channel, name, locale) -> subject / body / body_html
+DEFAULT_TEMPLATES: Dict[Tuple[LeadChannel, str, str], Dict[str, Optional[str]]] = {
+    (LeadChannel.SMS, "welcome", "ru"): {
+        "body": (
+            "Здравствуйте, {name}!\n\n"
+            "Спасибо за интерес к нашим услугам. "
+            "Наш специалист свяжется с вами в ближайшее время.\n\n"
+            "С уважением, {company_name}"
+        ),
+    },
+    (LeadChannel.WHATSAPP, "welcome", "ru"): {
+        "body": "Здравствуйте, {name}! Спасибо за обращение. Мы свяжемся с вами в ближайшее время.",
+    },
+    (LeadChannel.EMAIL, "welcome", "ru"): {
+        "subject": "Спасибо за интерес к {company_name}",
+        "body": """
+Здравствуйте, {name}!
+
+Спасибо за интерес к нашим услугам.
+
+Наш специалист свяжется с вами в ближайшее время для обсуждения деталей.
+
+Если у вас есть срочные вопросы, вы можете ответить на это письмо.
+
+С уважением,
+Команда {company_name}
+        """,
+        "body_html": """
+        <html>
+          <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+              <h2 style="color: #2563eb;">Здравствуйте, {name}!</h2>
+
+              <p>Спасибо за интерес к нашим услугам.</p>
+
+              <p>Наш специалист свяжется с вами в ближайшее время для обсуждения деталей.</p>
+
+              <p>Если у вас есть срочные вопросы, вы можете ответить на это письмо.</p>
+
+              <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
+                <p style="color: #666; font-size: 14px;">
+                  С уважением,<br>
+                  Команда {company_name}
+                </p>
+              </div>
+            </div>
+          </body>
+        </html>
+        """,
+    },
+    (LeadChannel.EMAIL, "booking_confirmation", "ru"): {
+        "subject": "Подтверждение встречи",
+        "body": """
+Встреча подтверждена!
+
+Здравствуйте, {name}!
+
+Ваша встреча успешно забронирована на {booking_time}.
+
+Ссылка на встречу: {booking_url}
+
+По этой ссылке вы сможете:
+- Добавить встречу в календарь
+- Перенести встречу
+- Отменить встречу
+
+До встречи!
+
+С уважением,
+Команда {company_name}
+        """,
+        "body_html": """
+        <html>
+          <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+              <h2 style="color: #2563eb;">Встреча подтверждена!</h2>
+
+              <p>Здравствуйте, {name}!</p>
+
+              <p>Ваша встреча успешно забронирована на <strong>{booking_time}</strong>.</p>
+
+              <div style="margin: 30px 0; padding: 20px; background-color: #f3f4f6; border-radius: 8px;">
+                <p style="margin: 0;">
+                  <a href="{booking_url}"
+                     style="display: inline-block; padding: 12px 24px; background-color: #2563eb; color: white; text-decoration: none; border-radius: 6px;">
+                    Открыть встречу
+                  </a>
+                </p>
+              </div>
+
+              <p>По этой ссылке вы сможете:</p>
+              <ul>
+                <li>Добавить встречу в календарь</li>
+                <li>Перенести встречу</li>
+                <li>Отменить встречу</li>
+              </ul>
+
+              <p>До встречи!</p>
+
+              <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee;">
+                <p style="color: #666; font-size: 14px;">
+                  С уважением,<br>
+                  Команда {company_name}
+                </p>
+              </div>
+            </div>
+          </body>
+        </html>
+        """,
+    },
+}
+
+
+class TemplateServiceError(Exception):
+    """Base exception for template service errors."""
+    pass
+
+
+class RenderedMessage(NamedTuple):
+    """Rendered message parts (subject and body_html are email only)."""
+
+    subject: Optional[str]
+    body: str
+    body_html: Optional[str]
+
+
+class CompiledText:
+    """
+    Template text parsed once into literal/field segments.
+
+    Rendering joins the segments with context values, so no parsing happens
+    per message. Missing fields render as empty strings.
+    """
+
+    __slots__ = ("segments", "escape")
+
+    def __init__(self, source: str, escape: bool = False):
+        """
+        Compile template text.
+
+        Args:
+            source: Text with {field} / {field:spec} placeholders
+            escape: HTML-escape substituted values
+
+        Raises:
+            TemplateServiceError: If the text is not a valid template
+        """
+        try:
+            self.segments = [
+                (literal, field, spec or "")
+                for literal, field, spec, _ in string.Formatter().parse(source)
+            ]
+        except ValueError as e:
+            raise TemplateServiceError(f"Invalid template: {e}") from e
+
+        self.escape = escape
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Render text with context values."""
+        parts = []
+
+        for literal, field, spec in self.segments:
+            parts.append(literal)
+            if field is None:
+                continue
+
+            value = context.get(field, "")
+            value = format(value, spec) if spec else str(value)
+            parts.append(html.escape(value) if self.escape else value)
+
+        return "".join(parts)
+
+
+class CompiledTemplate:
+    """All parts of a message template, compiled."""
+
+    __slots__ = ("subject", "body", "body_html", "version")
+
+    def __init__(
+        self,
+        body: str,
+        subject: Optional[str] = None,
+        body_html: Optional[str] = None,
+        version: Optional[Tuple] = None,
+    ):
+        """
+        Compile template parts.
+
+        Args:
+            body: Plain text body
+            subject: Email subject (optional)
+            body_html: Email HTML body (optional, values are HTML-escaped)
+            version: Source version the template was compiled from
+        """
+        self.body = CompiledText(body)
+        self.subject = CompiledText(subject) if subject else None
+        self.body_html = CompiledText(body_html, escape=True) if body_html else None
+        self.version = version
+
+    def render(self, context: Dict[str, Any]) -> RenderedMessage:
+        """Render all parts with context values (merged over DEFAULT_CONTEXT)."""
+        context = {**DEFAULT_CONTEXT, **context}
+
+        return RenderedMessage(
+            subject=self.subject.render(context) if self.subject else None,
+            body=self.body.render(context),
+            body_html=self.body_html.render(context) if self.body_html else None,
+        )
+
+
+_default_templates: Dict[Tuple[LeadChannel, str, str], CompiledTemplate] = {}
+
+
+def get_default_template(
+    channel: LeadChannel,
+    name: str,
+    locale: str = DEFAULT_LOCALE,
+) -> CompiledTemplate:
+    """
+    Get a compiled built-in template.
+
+    Args:
+        channel: Message channel
+        name: Template name (e.g., "welcome")
+        locale: Locale (falls back to DEFAULT_LOCALE)
+
+    Returns:
+        Compiled template
+
+    Raises:
+        TemplateServiceError: If there is no such built-in template
+    """
+    channel = LeadChannel(channel)
+
+    for key in ((channel, name, locale), (channel, name, DEFAULT_LOCALE)):
+        if key in _default_templates:
+            return _default_templates[key]
+
+        if key in DEFAULT_TEMPLATES:
+            _default_templates[key] = CompiledTemplate(**DEFAULT_TEMPLATES[key])
+            return _default_templates[key]
+
+    raise TemplateServiceError(f"No template '{name}' for channel {channel.value}")
+
+
+class TemplateService:
+    """
+    Service for rendering outbound messages from per-tenant templates.
+
+    Compiled templates are kept in a process-wide LRU cache. After
+    TEMPLATE_CACHE_TTL seconds an entry is revalidated by reading only the
+    template versions; it is recompiled only if a version changed. Tenants
+    without an override get the built-in template, and that is cached too,
+    so steady-state sends never hit the database.
+    """
+
+    def __init__(self, cache: Optional[TTLCache] = None):
+        """Initialize service."""
+        if cache is None:
+            cache = TTLCache(
+                max_size=settings.template_cache_size,
+                ttl=settings.template_cache_ttl,
+            )
+        self.cache = cache
+
+    async def get(
+        self,
+        tenant_id: Optional[int],
+        channel: LeadChannel,
+        name: str,
+        locale: str = DEFAULT_LOCALE,
+    ) -> CompiledTemplate:
+        """
+        Get compiled template for a tenant.
+
+        Lookup order: tenant template in locale, tenant template in
+        DEFAULT_LOCALE, built-in template.
+
+        Args:
+            tenant_id: Tenant ID (None for built-in templates)
+            channel: Message channel
+            name: Template name (e.g., "welcome")
+            locale: Locale
+
+        Returns:
+            Compiled template
+        """
+        channel = LeadChannel(channel)
+
+        if tenant_id is None:
+            return get_default_template(channel, name, locale)
+
+        key = (tenant_id, channel, name, locale)
+        entry = self.cache.peek(key)
+
+        if entry is not None and not entry.expired:
+            return entry.value
+
+        try:
+            template = await self._load(key, entry.value if entry else None)
+        except TemplateServiceError:
+            raise
+        except Exception as e:
+            if entry is None:
+                raise
+            # Keep serving the cached copy if the database is unavailable
+            logger.error(f"Failed to revalidate template {key}: {e}")
+            template = entry.value
+
+        self.cache.set(key, template)
+        return template
+
+    async def render(
+        self,
+        tenant_id: Optional[int],
+        channel: LeadChannel,
+        name: str,
+        context: Dict[str, Any],
+        locale: str = DEFAULT_LOCALE,
+    ) -> RenderedMessage:
+        """
+        Render a message.
+
+        Args:
+            tenant_id: Tenant ID (None for built-in templates)
+            channel: Message channel
+            name: Template name
+            context: Placeholder values
+            locale: Locale
+
+        Returns:
+            Rendered message
+        """
+        template = await self.get(tenant_id, channel, name, locale)
+        return template.render(context)
+
+    async def render_many(
+        self,
+        tenant_id: Optional[int],
+        channel: LeadChannel,
+        name: str,
+        contexts: Iterable[Dict[str, Any]],
+        locale: str = DEFAULT_LOCALE,
+    ) -> List[RenderedMessage]:
+        """
+        Render one message per context with a single template lookup.
+
+        Args:
+            tenant_id: Tenant ID (None for built-in templates)
+            channel: Message channel
+            name: Template name
+            contexts: Placeholder values per recipient
+            locale: Locale
+
+        Returns:
+            Rendered messages, in the same order as contexts
+        """
+        template = await self.get(tenant_id, channel, name, locale)
+        return [template.render(context) for context in contexts]
+
+    def invalidate(self, tenant_id: int) -> None:
+        """Drop cached templates of a tenant in this process."""
+        for key in self.cache.keys():
+            if key[0] == tenant_id:
+                self.cache.delete(key)
+
+    async def _load(
+        self,
+        key: Tuple[int, LeadChannel, str, str],
+        cached: Optional[CompiledTemplate],
+    ) -> CompiledTemplate:
+        """Load (or revalidate) the template for a cache key."""
+        tenant_id, channel, name, locale = key
+        locales = list(dict.fromkeys([locale, DEFAULT_LOCALE]))
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(MessageTemplate.id, MessageTemplate.locale, MessageTemplate.version)
+                .where(
+                    MessageTemplate.tenant_id == tenant_id,
+                    MessageTemplate.channel == channel,
+                    MessageTemplate.name == name,
+                    MessageTemplate.locale.in_(locales),
+                    MessageTemplate.is_active.is_(True),
+                )
+            )
+            versions = {row.locale: (row.id, row.version) for row in result.all()}
+
+            # Preferred locale first
+            source = next((versions[loc] for loc in locales if loc in versions), None)
+
+            if source is None:
+                return get_default_template(channel, name, locale)
+
+            if cached is not None and cached.version == source:
+                return cached
+
+            row = await session.get(MessageTemplate, source[0])
+
+        logger.info(f"Compiled template {name}/{channel.value} for tenant {tenant_id} (v{source[1]})")
+
+        return CompiledTemplate(
+            body=row.body,
+            subject=row.subject,
+            body_html=row.body_html,
+            version=source,
+        )
+
+
+# Process-wide service (shares the compiled template cache)
+template_service = TemplateService()
@@ -0,0 +1,302 @@
+"""Tenant service - cached tenant context for public endpoints."""
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.redis import get_redis, subscribe
+from app.models.tenant import Tenant
+
+logger = logging.getLogger(__name__)
+
+# Limits per subscription plan (None = unlimited)
+PLAN_LIMITS: Dict[str, Dict[str, Optional[int]]] = {
+    "trial": {"leads_per_month": 100, "requests_per_minute": 30},
+    "start": {"leads_per_month": 1000, "requests_per_minute": 60},
+    "pro": {"leads_per_month": 10000, "requests_per_minute": 300},
+    "business": {"leads_per_month": None, "requests_per_minute": 1000},
+}
+
+DEFAULT_PLAN = "trial"
+
+# Redis keys and invalidation channel
+REDIS_KEY_BY_ID = "tenant:ctx:{}"
+REDIS_KEY_BY_PUBLIC_KEY = "tenant:pk:{}"
+INVALIDATION_CHANNEL = "tenant:invalidate"
+
+# Marker for "no such tenant" in both cache tiers
+_MISSING = "missing"
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """Tenant data needed to accept and route a lead."""
+
+    id: int
+    slug: str
+    public_key: Optional[str]
+    is_active: bool
+    is_trial: bool
+    trial_ends_at: Optional[datetime]
+    plan: str
+    limits: Dict[str, Optional[int]] = field(default_factory=dict)
+    widget_config: Dict[str, Any] = field(default_factory=dict)
+    credentials: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def trial_expired(self) -> bool:
+        """Check whether the trial period is over."""
+        return bool(
+            self.is_trial
+            and self.trial_ends_at
+            and self.trial_ends_at < datetime.utcnow()
+        )
+
+    @classmethod
+    def from_tenant(cls, tenant: Tenant) -> "TenantContext":
+        """Build context from a Tenant row."""
+        widget_config = dict(tenant.widget_config or {})
+        plan = tenant.subscription_plan or DEFAULT_PLAN
+
+        return cls(
+            id=tenant.id,
+            slug=tenant.slug,
+            public_key=tenant.public_key,
+            is_active=tenant.is_active,
+            is_trial=tenant.is_trial,
+            trial_ends_at=tenant.trial_ends_at,
+            plan=plan,
+            limits=dict(PLAN_LIMITS.get(plan, PLAN_LIMITS[DEFAULT_PLAN])),
+            # Per-tenant channel credentials live in widget_config["credentials"]
+            credentials=widget_config.pop("credentials", None) or {},
+            widget_config=widget_config,
+        )
+
+    def to_json(self) -> str:
+        """Serialize for Redis."""
+        data = asdict(self)
+        if self.trial_ends_at:
+            data["trial_ends_at"] = self.trial_ends_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "TenantContext":
+        """Deserialize from Redis."""
+        data = json.loads(raw)
+        if data.get("trial_ends_at"):
+            data["trial_ends_at"] = datetime.fromisoformat(data["trial_ends_at"])
+        return cls(**data)
+
+
+class TenantResolver:
+    """
+    Resolves tenant ID or widget public key to a TenantContext.
+
+    Lookup goes through three tiers: an in-process TTL LRU (microseconds),
+    Redis (shared by all API processes), then PostgreSQL. Unknown IDs/keys
+    are cached briefly as well, so bogus headers cannot hammer the database.
+
+    When a tenant changes, ``invalidate()`` deletes its Redis entries and
+    publishes the ID; every process running ``listen()`` drops its local
+    copy. It is called after any ORM session commits changes to a tenant
+    (see ``_invalidate_committed_tenants``); changes made with bulk UPDATEs
+    or outside the app only show once cached entries expire
+    (TENANT_CACHE_TTL locally, TENANT_REDIS_TTL in Redis). Redis errors are
+    logged and the resolver falls back to the DB.
+    """
+
+    def __init__(self):
+        """Initialize resolver."""
+        self.local = TTLCache(
+            max_size=settings.tenant_cache_size,
+            ttl=settings.tenant_cache_ttl,
+        )
+
+    async def get_by_id(self, tenant_id: int) -> Optional[TenantContext]:
+        """
+        Get tenant context by ID.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            Tenant context, or None if the tenant does not exist
+        """
+        return await self._resolve(
+            ("id", tenant_id),
+            REDIS_KEY_BY_ID.format(tenant_id),
+            Tenant.id == tenant_id,
+        )
+
+    async def get_by_public_key(self, public_key: str) -> Optional[TenantContext]:
+        """
+        Get tenant context by widget public key.
+
+        Args:
+            public_key: Widget public key
+
+        Returns:
+            Tenant context, or None if the key is unknown
+        """
+        return await self._resolve(
+            ("pk", public_key),
+            REDIS_KEY_BY_PUBLIC_KEY.format(public_key),
+            Tenant.public_key == public_key,
+        )
+
+    async def _resolve(self, local_key, redis_key: str, criteria) -> Optional[TenantContext]:
+        """Look up a tenant through the local, Redis and DB tiers."""
+        cached = self.local.get(local_key)
+        if cached is not None:
+            return None if cached == _MISSING else cached
+
+        redis = get_redis()
+
+        try:
+            raw = await redis.get(redis_key)
+        except Exception as e:
+            logger.warning(f"Tenant cache unavailable, using database: {e}")
+            raw = None
+            redis = None
+
+        if raw is not None:
+            context = None if raw == _MISSING else TenantContext.from_json(raw)
+            self._store_local(local_key, context)
+            return context
+
+        async with async_session_maker() as session:
+            result = await session.execute(select(Tenant).where(criteria))
+            tenant = result.scalar_one_or_none()
+
+        context = TenantContext.from_tenant(tenant) if tenant else None
+        self._store_local(local_key, context)
+
+        if redis is not None:
+            try:
+                await self._store_redis(redis, redis_key, context)
+            except Exception as e:
+                logger.warning(f"Failed to cache tenant in Redis: {e}")
+
+        return context
+
+    def _store_local(self, local_key, context: Optional[TenantContext]) -> None:
+        """Cache context in process (unknown tenants for a shorter time)."""
+        if context is None:
+            self.local.set(local_key, _MISSING, ttl=settings.tenant_negative_cache_ttl)
+        else:
+            self.local.set(local_key, context)
+
+    async def _store_redis(self, redis, redis_key: str, context: Optional[TenantContext]) -> None:
+        """Cache context in Redis under both ID and public key."""
+        if context is None:
+            await redis.set(redis_key, _MISSING, px=int(settings.tenant_negative_cache_ttl * 1000))
+            return
+
+        raw = context.to_json()
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(REDIS_KEY_BY_ID.format(context.id), raw, ex=settings.tenant_redis_ttl)
+        if context.public_key:
+            pipe.set(REDIS_KEY_BY_PUBLIC_KEY.format(context.public_key), raw, ex=settings.tenant_redis_ttl)
+        await pipe.execute()
+
+    def forget(self, tenant_id: int) -> None:
+        """Drop local entries of a tenant (by ID and by public key)."""
+        for key in self.local.keys():
+            value = self.local.peek(key)
+            if key == ("id", tenant_id) or (
+                value is not None
+                and isinstance(value.value, TenantContext)
+                and value.value.id == tenant_id
+            ):
+                self.local.delete(key)
+
+    async def invalidate(self, tenant_id: int, public_key: Optional[str] = None) -> None:
+        """
+        Invalidate a tenant in all processes after it was changed.
+
+        Args:
+            tenant_id: Tenant ID
+            public_key: Previous public key, if it was changed
+        """
+        self.forget(tenant_id)
+
+        keys = [REDIS_KEY_BY_ID.format(tenant_id)]
+        if public_key:
+            keys.append(REDIS_KEY_BY_PUBLIC_KEY.format(public_key))
+
+        redis = get_redis()
+        try:
+            raw = await redis.get(keys[0])
+            if raw and raw != _MISSING:
+                cached_key = TenantContext.from_json(raw).public_key
+                if cached_key:
+                    keys.append(REDIS_KEY_BY_PUBLIC_KEY.format(cached_key))
+
+            await redis.delete(*keys)
+            await redis.publish(INVALIDATION_CHANNEL, str(tenant_id))
+        except Exception as e:
+            logger.error(f"Failed to invalidate tenant {tenant_id} in Redis: {e}")
+
+    async def listen(self) -> None:
+        """Drop local entries on invalidation messages (runs until cancelled)."""
+        await subscribe(
+            INVALIDATION_CHANNEL,
+            lambda data: self.forget(int(data)),
+            # Tenants may have changed while disconnected
+            on_reconnect=self.local.clear,
+        )
+
+
+# Process-wide resolver (shares the local cache)
+tenant_resolver = TenantResolver()
+
+# Invalidations scheduled after commits (referenced until done)
+_pending_invalidations: Set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_tenant_changes(session, flush_context) -> None:
+    """Remember tenants changed or deleted in the transaction (ID -> old public key)."""
+    for obj in [*session.dirty, *session.deleted]:
+        if not isinstance(obj, Tenant) or obj.id is None:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+
+        changed = session.info.setdefault("changed_tenants", {})
+        old_keys = inspect(obj).attrs.public_key.history.deleted
+        changed[obj.id] = changed.get(obj.id) or (old_keys[0] if old_keys else None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tenants(session) -> None:
+    """Invalidate cached tenants once their changes are committed."""
+    changed = session.info.pop("changed_tenants", None)
+    if not changed:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning(f"No event loop to invalidate tenants {sorted(changed)}, waiting for cache TTL")
+        return
+
+    for tenant_id, public_key in changed.items():
+        task = loop.create_task(tenant_resolver.invalidate(tenant_id, public_key))
+        _pending_invalidations.add(task)
+        task.add_done_callback(_pending_invalidations.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_tenant_changes(session) -> None:
+    """Drop tracked tenant changes of a rolled back transaction."""
+    session.info.pop("changed_tenants", None)
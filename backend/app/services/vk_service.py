@@ -6,6 +6,8 @@ from typing import Optional, Dict, Any
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.rate_governor import rate_governor
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,8 @@ class VKService:
 
         Raises:
             VKServiceError: If sending fails
+            CircuitOpen: If the provider circuit breaker is open
+            RateLimited: If community or user capacity is not available in time
         """
         # Validate
         if not user_id:
@@ -77,42 +81,44 @@ class VKService:
             import json
             params["keyboard"] = json.dumps(keyboard)
 
+        # Wait for community-wide and per-user capacity
+        await rate_governor.acquire("vk", credential=self.access_token, recipient=user_id)
+
         # Send request
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_url}/messages.send",
-                    data=params,
-                    timeout=30.0,
+            client = get_http_client("vk")
+            response = await client.post(
+                f"{self.api_url}/messages.send",
+                data=params,
+            )
+
+            # Check HTTP status
+            if response.status_code != 200:
+                raise VKServiceError(
+                    f"VK API returned status {response.status_code}: {response.text}"
+                )
+
+            # Parse response
+            result = response.json()
+
+            # Check for errors
+            if "error" in result:
+                error = result["error"]
+                error_msg = error.get("error_msg", "Unknown error")
+                error_code = error.get("error_code", 0)
+                raise VKServiceError(
+                    f"VK API error {error_code}: {error_msg}"
                 )
 
-                # Check HTTP status
-                if response.status_code != 200:
-                    raise VKServiceError(
-                        f"VK API returned status {response.status_code}: {response.text}"
-                    )
-
-                # Parse response
-                result = response.json()
-
-                # Check for errors
-                if "error" in result:
-                    error = result["error"]
-                    error_msg = error.get("error_msg", "Unknown error")
-                    error_code = error.get("error_code", 0)
-                    raise VKServiceError(
-                        f"VK API error {error_code}: {error_msg}"
-                    )
-
-                message_id = result.get("response")
-
-                logger.info(f"VK message sent successfully. Message ID: {message_id}")
-
-                return {
-                    "success": True,
-                    "message_id": message_id,
-                    "user_id": user_id,
-                }
+            message_id = result.get("response")
+
+            logger.info(f"VK message sent successfully. Message ID: {message_id}")
+
+            return {
+                "success": True,
+                "message_id": message_id,
+                "user_id": user_id,
+            }
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error while sending VK message: {e}")
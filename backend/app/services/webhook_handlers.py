@@ -0,0 +1,215 @@
+"""Webhook handlers - apply external service events (inline or from the webhook queue)."""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.lead import Lead, LeadStatus
+from app.services.availability_cache import availability_cache
+from app.services.slot_index import normalize_slot, slot_index
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_calcom_event(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a Cal.com webhook event.
+
+    Args:
+        db: Database session
+        payload: Webhook payload (verified)
+
+    Returns:
+        Dict with handling result
+
+    Raises:
+        Exception: If the event could not be applied (it can be retried)
+    """
+    # Extract event type
+    event_type = payload.get("triggerEvent")
+    booking_data = payload.get("payload", {})
+
+    # Booked/freed slots change availability of the event type
+    if event_type in ("BOOKING_CREATED", "BOOKING_RESCHEDULED", "BOOKING_CANCELLED"):
+        event_type_id = booking_data.get("eventTypeId") or settings.calcom_event_type_id
+
+        if event_type == "BOOKING_CANCELLED":
+            await slot_index.mark_free(event_type_id, booking_data.get("startTime"))
+        else:
+            await slot_index.mark_booked(event_type_id, booking_data.get("startTime"))
+
+        await availability_cache.invalidate(event_type_id)
+
+    # Get booking ID and lead ID
+    booking_id = booking_data.get("id")
+    metadata = booking_data.get("metadata", {})
+    lead_id = metadata.get("lead_id")
+
+    if not booking_id:
+        logger.warning("Webhook payload missing booking ID")
+        return {"success": True, "message": "No booking ID found"}
+
+    # Handle different event types
+    if event_type == "BOOKING_CREATED":
+        await handle_booking_created(db, booking_id, lead_id, booking_data)
+
+    elif event_type == "BOOKING_RESCHEDULED":
+        await handle_booking_rescheduled(db, booking_id, lead_id, booking_data)
+
+    elif event_type == "BOOKING_CANCELLED":
+        await handle_booking_cancelled(db, booking_id, lead_id, booking_data)
+
+    elif event_type == "BOOKING_COMPLETED":
+        await handle_booking_completed(db, booking_id, lead_id, booking_data)
+
+    else:
+        logger.info(f"Unhandled webhook event type: {event_type}")
+
+    return {"success": True, "event_type": event_type}
+
+
+def calcom_event_key(payload: Dict[str, Any]) -> str:
+    """Get the ordering key of a Cal.com event (its booking)."""
+    booking_data = payload.get("payload") or {}
+    return str(booking_data.get("id") or booking_data.get("uid") or "")
+
+
+async def handle_booking_created(
+    db: AsyncSession,
+    booking_id: int,
+    lead_id: int,
+    booking_data: Dict[str, Any],
+):
+    """Handle booking.created event."""
+    logger.info(f"Handling BOOKING_CREATED: booking={booking_id}, lead={lead_id}")
+
+    if not lead_id:
+        logger.warning("No lead_id in booking metadata")
+        return
+
+    # Find lead
+    result = await db.execute(
+        select(Lead).where(Lead.id == lead_id)
+    )
+    lead = result.scalar_one_or_none()
+
+    if not lead:
+        logger.warning(f"Lead {lead_id} not found for booking {booking_id}")
+        return
+
+    # Update lead if not already updated
+    if not lead.booking_id:
+        lead.booking_id = str(booking_id)
+        lead.booking_url = booking_data.get("meetingUrl") or booking_data.get("url")
+        lead.booked_at = booking_data.get("startTime")
+        lead.status = LeadStatus.BOOKED
+
+        await db.commit()
+        logger.info(f"Lead {lead_id} updated with booking {booking_id}")
+
+
+def _same_slot(a: str, b: str) -> bool:
+    """Check if two start times are the same instant."""
+    normalized = normalize_slot(a), normalize_slot(b)
+    return None not in normalized and normalized[0][0] == normalized[1][0]
+
+
+async def handle_booking_rescheduled(
+    db: AsyncSession,
+    booking_id: int,
+    lead_id: int,
+    booking_data: Dict[str, Any],
+):
+    """Handle booking.rescheduled event."""
+    logger.info(f"Handling BOOKING_RESCHEDULED: booking={booking_id}, lead={lead_id}")
+
+    # Find lead by booking_id
+    result = await db.execute(
+        select(Lead).where(Lead.booking_id == str(booking_id))
+    )
+    lead = result.scalar_one_or_none()
+
+    if not lead:
+        logger.warning(f"Lead not found for booking {booking_id}")
+        return
+
+    start_time = booking_data.get("startTime")
+    if lead.booked_at and start_time and _same_slot(lead.booked_at.isoformat(), start_time):
+        # Redelivered, or already applied by our reschedule endpoint
+        logger.info(f"Lead {lead.id} already booked at {start_time}")
+        return
+
+    # Previous slot is free again
+    if lead.booked_at:
+        await slot_index.mark_free(
+            booking_data.get("eventTypeId") or settings.calcom_event_type_id,
+            lead.booked_at.isoformat(),
+        )
+
+    # Update booking time
+    lead.booked_at = start_time
+
+    await db.commit()
+    logger.info(f"Lead {lead.id} booking rescheduled")
+
+
+async def handle_booking_cancelled(
+    db: AsyncSession,
+    booking_id: int,
+    lead_id: int,
+    booking_data: Dict[str, Any],
+):
+    """Handle booking.cancelled event."""
+    logger.info(f"Handling BOOKING_CANCELLED: booking={booking_id}, lead={lead_id}")
+
+    # Find lead by booking_id
+    result = await db.execute(
+        select(Lead).where(Lead.booking_id == str(booking_id))
+    )
+    lead = result.scalar_one_or_none()
+
+    if not lead:
+        logger.warning(f"Lead not found for booking {booking_id}")
+        return
+
+    # Update lead status
+    lead.status = LeadStatus.QUALIFIED  # Move back to qualified
+    # Keep booking_id and booking_url for history
+
+    await db.commit()
+    logger.info(f"Lead {lead.id} booking cancelled")
+
+
+async def handle_booking_completed(
+    db: AsyncSession,
+    booking_id: int,
+    lead_id: int,
+    booking_data: Dict[str, Any],
+):
+    """Handle booking.completed event."""
+    logger.info(f"Handling BOOKING_COMPLETED: booking={booking_id}, lead={lead_id}")
+
+    # Find lead by booking_id
+    result = await db.execute(
+        select(Lead).where(Lead.booking_id == str(booking_id))
+    )
+    lead = result.scalar_one_or_none()
+
+    if not lead:
+        logger.warning(f"Lead not found for booking {booking_id}")
+        return
+
+    # Update lead status to completed
+    lead.status = LeadStatus.COMPLETED
+
+    await db.commit()
+    logger.info(f"Lead {lead.id} marked as completed")
+
+
+# Source -> handler applying its events
+WEBHOOK_HANDLERS: Dict[str, Callable[[AsyncSession, Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+    "calcom": handle_calcom_event,
+}
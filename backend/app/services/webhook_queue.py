@@ -0,0 +1,359 @@
+"""Webhook queue - Redis streams between webhook ingestion and processing.
+
+Webhook endpoints verify the signature, add the raw event to a stream and
+answer right away; ``app.webhook_consumer`` applies the events:
+
+* Events are spread over ``WEBHOOK_STREAM_PARTITIONS`` streams
+  (``webhooks:<n>``) by source and key (Cal.com: booking ID), so events of
+  one booking stay in order.
+* Each partition is consumed by one consumer at a time: consumers take a
+  lease per partition (``webhooks:lease:<n>``) and partitions of a stopped
+  consumer are taken over when its lease expires. Events are read through
+  the ``webhooks`` consumer group with the partition as consumer name, so
+  the new owner first re-reads what the old one had not acknowledged.
+* A failing event is retried in place (``WEBHOOK_RETRY_BACKOFF``, doubled
+  per attempt), holding back later events of its partition. After
+  ``WEBHOOK_MAX_ATTEMPTS`` it is moved to the dead-letter stream
+  (``webhooks:dlq``) and can be re-queued with ``replay_dead_letters()``.
+
+Delivery is at-least-once; handlers must tolerate repeated events. Changing
+the partition count while streams are not empty may reorder events of a key.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.redis import get_redis
+from app.services.webhook_handlers import WEBHOOK_HANDLERS
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "webhooks:{}"
+LEASE_KEY = "webhooks:lease:{}"
+DLQ_KEY = "webhooks:dlq"
+GROUP = "webhooks"
+
+# Partition lease (seconds); renewed while the consumer works
+LEASE_TTL = 10.0
+
+# Events read per partition at once
+READ_COUNT = 10
+
+# KEYS: lease key. ARGV: token, TTL (ms). Extends the lease only if still ours.
+RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# KEYS: lease key. ARGV: token. Deletes the lease only if still ours.
+RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def partition_of(source: str, key: str) -> int:
+    """Get the stream partition of an event key."""
+    return zlib.crc32(f"{source}:{key}".encode()) % settings.webhook_stream_partitions
+
+
+class WebhookQueue:
+    """Producer and consumer of the webhook streams."""
+
+    def __init__(self):
+        """Initialize queue."""
+        self._scripts = None
+        self._scripts_client = None
+
+    async def publish(self, source: str, key: str, body: str) -> bool:
+        """
+        Add a verified webhook event to its partition.
+
+        Args:
+            source: Webhook source (key of ``WEBHOOK_HANDLERS``)
+            key: Ordering key (events with the same key are applied in order)
+            body: Raw JSON body
+
+        Returns:
+            True if queued, False if the queue is disabled or Redis is
+            unavailable (the caller applies the event itself)
+        """
+        if not settings.webhook_queue_enabled:
+            return False
+
+        try:
+            await get_redis().xadd(
+                STREAM_KEY.format(partition_of(source, key)),
+                {"source": source, "key": key, "body": body, "received_at": str(time.time())},
+                maxlen=settings.webhook_stream_maxlen,
+                approximate=True,
+            )
+        except Exception as e:
+            logger.warning(f"Webhook queue unavailable, handling {source} event inline: {e}")
+            return False
+
+        return True
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Consume all partitions until stopped.
+
+        Args:
+            stop_event: Event that stops consuming (after the current event)
+        """
+        stop_event = stop_event or asyncio.Event()
+        logger.info(f"Webhook consumer started ({settings.webhook_stream_partitions} partitions)")
+
+        await asyncio.gather(*(
+            self._consume(partition, stop_event)
+            for partition in range(settings.webhook_stream_partitions)
+        ))
+
+        logger.info("Webhook consumer stopped")
+
+    async def _consume(self, partition: int, stop_event: asyncio.Event) -> None:
+        """Consume one partition while holding its lease."""
+        stream = STREAM_KEY.format(partition)
+        lease = LEASE_KEY.format(partition)
+        token = uuid.uuid4().hex
+        # Blocking reads must return before the Redis socket timeout
+        block_ms = max(1, int(settings.redis_socket_timeout * 500))
+
+        while not stop_event.is_set():
+            try:
+                redis = get_redis()
+                if not await redis.set(lease, token, nx=True, px=int(LEASE_TTL * 1000)):
+                    await self._sleep(stop_event, LEASE_TTL / 2)
+                    continue
+
+                await self._ensure_group(stream)
+                logger.info(f"Consuming webhook partition {partition}")
+
+                # Unacknowledged events of the previous owner first
+                backlog = True
+                while not stop_event.is_set() and await self._renew_lease(lease, token):
+                    response = await redis.xreadgroup(
+                        GROUP,
+                        f"p{partition}",
+                        {stream: "0" if backlog else ">"},
+                        count=READ_COUNT,
+                        block=None if backlog else block_ms,
+                    )
+                    entries = response[0][1] if response else []
+                    if backlog and not entries:
+                        backlog = False
+
+                    for entry_id, fields in entries:
+                        handled = await self._handle(stream, entry_id, fields, lease, token, stop_event)
+                        if not handled or stop_event.is_set():
+                            break
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Webhook partition {partition} consumer error: {e}, retrying")
+                await self._sleep(stop_event, 1)
+
+        # Hand the partition over without waiting for the lease to expire
+        try:
+            _, release = self._get_scripts()
+            await release(keys=[lease], args=[token])
+        except Exception:
+            pass
+
+    async def _handle(
+        self,
+        stream: str,
+        entry_id: str,
+        fields: Dict[str, str],
+        lease: str,
+        token: str,
+        stop_event: asyncio.Event,
+    ) -> bool:
+        """
+        Apply an event with retries, then acknowledge it (or dead-letter it).
+
+        Returns:
+            False if the partition lease was lost or the consumer is stopping
+            (the event is left pending for the next owner)
+        """
+        if not fields:
+            # Deleted after it was read (already applied)
+            await get_redis().xack(stream, GROUP, entry_id)
+            return True
+
+        source = fields.get("source")
+        handler = WEBHOOK_HANDLERS.get(source)
+        error = f"No handler for webhook source {source!r}" if handler is None else None
+        attempts = 0
+
+        while handler is not None and attempts < settings.webhook_max_attempts:
+            if attempts and not await self._renew_lease(lease, token):
+                return False
+            attempts += 1
+
+            try:
+                if not await self._apply(handler, fields["body"], lease, token):
+                    logger.warning(f"Lost lease while applying webhook {source} event {entry_id}")
+                    return False
+                error = None
+                break
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                logger.warning(f"Webhook {source} event {entry_id} failed (attempt {attempts}): {error}")
+                if attempts < settings.webhook_max_attempts:
+                    # Capped so the lease outlives the wait
+                    backoff = settings.webhook_retry_backoff * 2 ** (attempts - 1)
+                    await self._sleep(stop_event, min(backoff, LEASE_TTL / 2))
+                    if stop_event.is_set():
+                        return False
+
+        pipe = get_redis().pipeline(transaction=True)
+        if error is not None:
+            logger.error(f"Webhook {source} event {entry_id} moved to dead-letter queue: {error}")
+            pipe.xadd(
+                DLQ_KEY,
+                {**fields, "stream": stream, "entry_id": entry_id, "error": error, "attempts": str(attempts)},
+                maxlen=settings.webhook_stream_maxlen,
+                approximate=True,
+            )
+        pipe.xack(stream, GROUP, entry_id)
+        pipe.xdel(stream, entry_id)
+        await pipe.execute()
+        return True
+
+    async def _apply(self, handler, body: str, lease: str, token: str) -> bool:
+        """
+        Run a handler while renewing the partition lease.
+
+        Returns:
+            False if the lease was lost (the handler is cancelled, so the
+            next owner does not apply events of the partition concurrently)
+
+        Raises:
+            Exception: If the handler fails
+        """
+        async def apply():
+            async with async_session_maker() as db:
+                await handler(db, json.loads(body))
+
+        task = asyncio.ensure_future(apply())
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=LEASE_TTL / 3)
+                if done:
+                    task.result()
+                    return True
+                if not await self._renew_lease(lease, token):
+                    return False
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def _ensure_group(self, stream: str) -> None:
+        """Create the consumer group of a stream (and the stream) if missing."""
+        try:
+            await get_redis().xgroup_create(stream, GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _get_scripts(self):
+        """Get Lua scripts registered on the current Redis client."""
+        redis = get_redis()
+        if self._scripts is None or self._scripts_client is not redis:
+            self._scripts = (
+                redis.register_script(RENEW_SCRIPT),
+                redis.register_script(RELEASE_SCRIPT),
+            )
+            self._scripts_client = redis
+        return self._scripts
+
+    async def _renew_lease(self, lease: str, token: str) -> bool:
+        """Extend a partition lease (False if it is no longer ours)."""
+        renew, _ = self._get_scripts()
+        return bool(await renew(keys=[lease], args=[token, int(LEASE_TTL * 1000)]))
+
+    @staticmethod
+    async def _sleep(stop_event: asyncio.Event, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def get_dead_letters(self, count: int = 100) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Get the oldest dead-lettered events.
+
+        Args:
+            count: Maximum number of events
+
+        Returns:
+            List of (entry ID, fields incl. error and attempts)
+        """
+        return await get_redis().xrange(DLQ_KEY, count=count)
+
+    async def replay_dead_letters(self, count: int = 100) -> int:
+        """
+        Re-queue dead-lettered events to their partitions.
+
+        Args:
+            count: Maximum number of events
+
+        Returns:
+            Number of events re-queued
+        """
+        redis = get_redis()
+        replayed = 0
+
+        for entry_id, fields in await self.get_dead_letters(count):
+            pipe = redis.pipeline(transaction=True)
+            pipe.xadd(
+                STREAM_KEY.format(partition_of(fields["source"], fields["key"])),
+                {name: fields[name] for name in ("source", "key", "body", "received_at")},
+                maxlen=settings.webhook_stream_maxlen,
+                approximate=True,
+            )
+            pipe.xdel(DLQ_KEY, entry_id)
+            await pipe.execute()
+            replayed += 1
+
+        return replayed
+
+    async def render_metrics(self) -> List[str]:
+        """
+        Render queue metrics in Prometheus text format.
+
+        Returns:
+            Exposition lines
+        """
+        pipe = get_redis().pipeline(transaction=False)
+        for partition in range(settings.webhook_stream_partitions):
+            pipe.xlen(STREAM_KEY.format(partition))
+        pipe.xlen(DLQ_KEY)
+        *backlog, dead = await pipe.execute()
+
+        return [
+            "# HELP fast_lead_webhook_queue_events Webhook events waiting to be applied.",
+            "# TYPE fast_lead_webhook_queue_events gauge",
+            f"fast_lead_webhook_queue_events {sum(backlog)}",
+            "# HELP fast_lead_webhook_dead_letters Webhook events that failed all attempts.",
+            "# TYPE fast_lead_webhook_dead_letters gauge",
+            f"fast_lead_webhook_dead_letters {dead}",
+        ]
+
+
+# Global webhook queue instance
+webhook_queue = WebhookQueue()
@@ -6,6 +6,8 @@ from typing import Optional, Dict, Any
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.rate_governor import rate_governor
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +29,10 @@ class WhatsAppService:
         self.access_token = settings.whatsapp_access_token
         self.phone_number_id = settings.whatsapp_phone_number_id
         self.api_version = settings.whatsapp_api_version
-        self.api_url = f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/messages"
+        self.api_url = (
+            f"{settings.whatsapp_api_url.rstrip('/')}/{self.api_version}/"
+            f"{self.phone_number_id}/messages"
+        )
 
         # Validate configuration
         if not self.access_token:
@@ -54,6 +59,8 @@ class WhatsAppService:
 
         Raises:
             WhatsAppServiceError: If sending fails
+            CircuitOpen: If the provider circuit breaker is open
+            RateLimited: If WhatsApp capacity is not available in time
         """
         # Validate
         if not to:
@@ -82,45 +89,47 @@ class WhatsAppService:
             "Content-Type": "application/json",
         }
 
+        # Wait for capacity of this business phone number
+        await rate_governor.acquire("whatsapp", credential=self.phone_number_id)
+
         # Send request
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0,
+            client = get_http_client("whatsapp")
+            response = await client.post(
+                self.api_url,
+                json=payload,
+                headers=headers,
+            )
+
+            # Check HTTP status
+            if response.status_code != 200:
+                raise WhatsAppServiceError(
+                    f"WhatsApp API returned status {response.status_code}: {response.text}"
                 )
 
-                # Check HTTP status
-                if response.status_code != 200:
-                    raise WhatsAppServiceError(
-                        f"WhatsApp API returned status {response.status_code}: {response.text}"
-                    )
-
-                # Parse response
-                result = response.json()
+            # Parse response
+            result = response.json()
 
-                # Check for errors
-                if "error" in result:
-                    error = result["error"]
-                    error_msg = error.get("message", "Unknown error")
-                    error_code = error.get("code", 0)
-                    raise WhatsAppServiceError(
-                        f"WhatsApp API error {error_code}: {error_msg}"
-                    )
+            # Check for errors
+            if "error" in result:
+                error = result["error"]
+                error_msg = error.get("message", "Unknown error")
+                error_code = error.get("code", 0)
+                raise WhatsAppServiceError(
+                    f"WhatsApp API error {error_code}: {error_msg}"
+                )
 
-                # Extract message ID
-                messages = result.get("messages", [])
-                message_id = messages[0].get("id") if messages else None
+            # Extract message ID
+            messages = result.get("messages", [])
+            message_id = messages[0].get("id") if messages else None
 
-                logger.info(f"WhatsApp message sent successfully. Message ID: {message_id}")
+            logger.info(f"WhatsApp message sent successfully. Message ID: {message_id}")
 
-                return {
-                    "success": True,
-                    "message_id": message_id,
-                    "to": to,
-                }
+            return {
+                "success": True,
+                "message_id": message_id,
+                "to": to,
+            }
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error while sending WhatsApp message: {e}")
@@ -150,6 +159,8 @@ class WhatsAppService:
 
         Raises:
             WhatsAppServiceError: If sending fails
+            CircuitOpen: If the provider circuit breaker is open
+            RateLimited: If WhatsApp capacity is not available in time
         """
         # Validate
         if not to:
@@ -180,46 +191,48 @@ class WhatsAppService:
             "Content-Type": "application/json",
         }
 
+        # Wait for capacity of this business phone number
+        await rate_governor.acquire("whatsapp", credential=self.phone_number_id)
+
         # Send request
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0,
+            client = get_http_client("whatsapp")
+            response = await client.post(
+                self.api_url,
+                json=payload,
+                headers=headers,
+            )
+
+            # Check HTTP status
+            if response.status_code != 200:
+                raise WhatsAppServiceError(
+                    f"WhatsApp API returned status {response.status_code}: {response.text}"
                 )
 
-                # Check HTTP status
-                if response.status_code != 200:
-                    raise WhatsAppServiceError(
-                        f"WhatsApp API returned status {response.status_code}: {response.text}"
-                    )
-
-                # Parse response
-                result = response.json()
-
-                # Check for errors
-                if "error" in result:
-                    error = result["error"]
-                    error_msg = error.get("message", "Unknown error")
-                    error_code = error.get("code", 0)
-                    raise WhatsAppServiceError(
-                        f"WhatsApp API error {error_code}: {error_msg}"
-                    )
-
-                # Extract message ID
-                messages = result.get("messages", [])
-                message_id = messages[0].get("id") if messages else None
-
-                logger.info(f"WhatsApp template message sent. Message ID: {message_id}")
-
-                return {
-                    "success": True,
-                    "message_id": message_id,
-                    "to": to,
-                    "template": template_name,
-                }
+            # Parse response
+            result = response.json()
+
+            # Check for errors
+            if "error" in result:
+                error = result["error"]
+                error_msg = error.get("message", "Unknown error")
+                error_code = error.get("code", 0)
+                raise WhatsAppServiceError(
+                    f"WhatsApp API error {error_code}: {error_msg}"
+                )
+
+            # Extract message ID
+            messages = result.get("messages", [])
+            message_id = messages[0].get("id") if messages else None
+
+            logger.info(f"WhatsApp template message sent. Message ID: {message_id}")
+
+            return {
+                "success": True,
+                "message_id": message_id,
+                "to": to,
+                "template": template_name,
+            }
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error while sending WhatsApp template: {e}")
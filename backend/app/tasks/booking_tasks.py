@@ -0,0 +1,104 @@
+"""Celery tasks for Cal.com bookings."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.async_runtime import run_async
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.rate_governor import ThrottledTask
+from app.schemas.booking import CreateBookingRequest
+from app.services.booking_requests import PENDING, SUCCEEDED, booking_requests
+from app.services.booking_service import BookingError, BookingService
+from app.services.calcom_service import CREATE_BOOKING_TIMEOUT
+from app.services.slot_index import SlotHold, SlotUnavailable, slot_index
+
+logger = logging.getLogger(__name__)
+
+
+class BookingTask(ThrottledTask):
+    """Base task for booking operations (not retried: Cal.com bookings are not idempotent)."""
+
+
+@celery_app.task(base=BookingTask, name="create_booking")
+def create_booking_task(
+    request_id: str,
+    data: Dict[str, Any],
+    hold: Optional[List[Any]] = None,
+) -> dict:
+    """
+    Create a booking accepted asynchronously by the API.
+
+    The outcome is stored in the booking request, where the client polls
+    or streams it. Redeliveries of a finished request are skipped. The slot
+    hold is renewed first; if it expired and the slot was taken meanwhile,
+    the request fails with 409.
+
+    Args:
+        request_id: Booking request ID
+        data: Booking request (``CreateBookingRequest`` fields)
+        hold: Slot hold taken by the API (event type ID, slot, token)
+
+    Returns:
+        Dict with booking result
+    """
+    logger.info(f"Creating booking for request {request_id}")
+    return run_async(_create_booking(
+        request_id,
+        CreateBookingRequest(**data),
+        SlotHold(*hold) if hold else None,
+    ))
+
+
+async def _create_booking(
+    request_id: str,
+    data: CreateBookingRequest,
+    hold: Optional[SlotHold],
+) -> dict:
+    """Book the lead and store the outcome in the booking request."""
+    try:
+        request = await booking_requests.get(request_id)
+    except Exception as e:
+        logger.warning(f"Booking request {request_id} unavailable: {e}")
+        request = None
+
+    if request is not None and request["status"] != PENDING:
+        logger.info(f"Booking request {request_id} already {request['status']}, skipping")
+        return {"success": request["status"] == SUCCEEDED, "request_id": request_id, "skipped": True}
+
+    # The hold was taken when the request was accepted and may have expired
+    # while the task was queued; extend it over the Cal.com call
+    try:
+        await slot_index.renew(hold, CREATE_BOOKING_TIMEOUT + settings.slot_hold_ttl)
+    except SlotUnavailable as e:
+        logger.info(f"Booking request {request_id} failed: {e}")
+        await booking_requests.finish(request_id, error=str(e), error_status=409)
+        return {"success": False, "request_id": request_id, "error": str(e)}
+
+    try:
+        async with async_session_maker() as db:
+            service = BookingService(db)
+            lead = await service.get_bookable_lead(data.lead_id)
+            booking = await service.create_booking(lead, data, hold)
+
+    except BookingError as e:
+        await slot_index.release(hold)
+        logger.info(f"Booking request {request_id} failed: {e}")
+        await booking_requests.finish(request_id, error=str(e), error_status=e.status_code)
+        return {"success": False, "request_id": request_id, "error": str(e)}
+
+    except Exception as e:
+        await slot_index.release(hold)
+        logger.error(f"Booking request {request_id} failed: {e}")
+        await booking_requests.finish(request_id, error="Failed to create booking", error_status=500)
+        raise
+
+    await booking_requests.finish(request_id, booking=booking.model_dump())
+
+    return {
+        "success": True,
+        "request_id": request_id,
+        "booking_id": booking.booking_id,
+        "lead_id": booking.lead_id,
+    }
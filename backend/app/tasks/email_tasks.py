@@ -1,18 +1,21 @@
 """Celery tasks for Email operations."""
 
 import logging
-from typing import Optional
-
-from celery import Task
+from typing import Optional, List, Dict, Any
 
+from app.core.async_runtime import run_async
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.rate_governor import ThrottledTask
+from app.models.lead import LeadChannel
 from app.services.email_service import EmailService, EmailServiceError
+from app.services.template_service import template_service
 
 logger = logging.getLogger(__name__)
 
 
-class EmailTask(Task):
-    """Base task for Email operations with retry logic."""
+class EmailTask(ThrottledTask):
+    """Base task for Email operations with retry logic (bulk tasks yield to first contact)."""
 
     autoretry_for = (EmailServiceError, ConnectionError)
     retry_kwargs = {"max_retries": 3}
@@ -64,11 +67,46 @@ def send_email_task(
         raise
 
 
+@celery_app.task(base=EmailTask, bulk=True, name="send_email_batch")
+def send_email_batch_task(emails: List[Dict[str, Any]]) -> dict:
+    """
+    Send many emails from one task.
+
+    With EMAIL_ASYNC_ENABLED the messages are in flight concurrently (up to
+    SMTP_ASYNC_MAX_CONNECTIONS_PER_HOST per host), otherwise they go out
+    back to back over one pooled SMTP session.
+
+    Args:
+        emails: Dicts with send_email arguments (to_email, subject,
+            body_html, body_text, reply_to)
+
+    Returns:
+        Dict with sent/failed counts and per-email results
+    """
+    logger.info(f"Sending email batch to {len(emails)} recipient(s)")
+
+    email_service = EmailService()
+
+    if settings.email_async_enabled:
+        results = run_async(email_service.send_emails_async(emails))
+    else:
+        results = email_service.send_emails(emails)
+
+    sent = sum(1 for result in results if result["success"])
+    return {
+        "success": sent == len(results),
+        "sent": sent,
+        "failed": len(results) - sent,
+        "results": results,
+    }
+
+
 @celery_app.task(base=EmailTask, name="send_welcome_email")
 def send_welcome_email_task(
     to_email: str,
     name: str,
     lead_id: Optional[int] = None,
+    tenant_id: Optional[int] = None,
 ) -> dict:
     """
     Send welcome email to new lead.
@@ -77,6 +115,7 @@ def send_welcome_email_task(
         to_email: Recipient email
         name: Lead name
         lead_id: Lead ID (optional)
+        tenant_id: Tenant ID for the tenant's template (optional)
 
     Returns:
         Dict with success status
@@ -86,10 +125,8 @@ def send_welcome_email_task(
     email_service = EmailService()
 
     try:
-        result = email_service.send_welcome_email(
-            to_email=to_email,
-            name=name,
-        )
+        email = _render_email(tenant_id, "welcome", to_email, {"name": name})
+        result = _send(email_service, email)
 
         logger.info(f"Welcome email sent to {to_email}")
         return result
@@ -106,6 +143,7 @@ def send_booking_confirmation_email_task(
     booking_url: str,
     booking_time: str,
     lead_id: Optional[int] = None,
+    tenant_id: Optional[int] = None,
 ) -> dict:
     """
     Send booking confirmation email.
@@ -116,6 +154,7 @@ def send_booking_confirmation_email_task(
         booking_url: Cal.com booking URL
         booking_time: Booking time (human-readable)
         lead_id: Lead ID (optional)
+        tenant_id: Tenant ID for the tenant's template (optional)
 
     Returns:
         Dict with success status
@@ -125,12 +164,13 @@ def send_booking_confirmation_email_task(
     email_service = EmailService()
 
     try:
-        result = email_service.send_booking_confirmation(
-            to_email=to_email,
-            name=name,
-            booking_url=booking_url,
-            booking_time=booking_time,
+        email = _render_email(
+            tenant_id,
+            "booking_confirmation",
+            to_email,
+            {"name": name, "booking_url": booking_url, "booking_time": booking_time},
         )
+        result = _send(email_service, email)
 
         logger.info(f"Booking confirmation sent to {to_email}")
         return result
@@ -138,3 +178,32 @@ def send_booking_confirmation_email_task(
     except EmailServiceError as e:
         logger.error(f"Failed to send booking confirmation: {e}")
         raise
+
+
+# Helper functions
+
+def _render_email(
+    tenant_id: Optional[int],
+    template: str,
+    to_email: str,
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Render an email template into send_email arguments."""
+    message = run_async(
+        template_service.render(tenant_id, LeadChannel.EMAIL, template, context)
+    )
+
+    return {
+        "to_email": to_email,
+        "subject": message.subject,
+        "body_html": message.body_html,
+        "body_text": message.body,
+    }
+
+
+def _send(email_service: EmailService, email: Dict[str, Any]) -> dict:
+    """Send one email with the async engine or the pooled smtplib sender."""
+    if settings.email_async_enabled:
+        return run_async(email_service.send_email_async(**email))
+
+    return email_service.send_email(**email)
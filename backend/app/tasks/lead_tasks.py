@@ -2,21 +2,32 @@
 
 import asyncio
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 
-from celery import Task
 from sqlalchemy import select, update
 
-from app.core.celery_app import celery_app
+from app.core.async_runtime import run_async
+from app.core.celery_app import CHANNEL_QUEUES, PRIORITY_FIRST_CONTACT, celery_app
+from app.core.circuit_breaker import CircuitOpen
+from app.core.config import settings
 from app.core.database import async_session_maker
+from app.core.rate_governor import RateLimited, ThrottledTask
+from app.core.speed_to_lead import speed_to_lead
 from app.models.lead import Lead, LeadStatus, LeadChannel
-from app.tasks.sms_tasks import send_sms_task
+from app.services.email_service import EmailService
+from app.services.lead_status_buffer import lead_status_buffer
+from app.services.sms_service import SMSService, SMSServiceError
+from app.services.template_service import template_service
+from app.services.tenant_service import tenant_resolver
+from app.services.whatsapp_service import WhatsAppService
+from app.tasks.sms_tasks import _update_lead_sms_failed, _update_lead_sms_status
 
 logger = logging.getLogger(__name__)
 
 
-class LeadTask(Task):
-    """Base task for lead operations."""
+class LeadTask(ThrottledTask):
+    """Base task for lead operations (deferred while a channel is rate limited)."""
 
     autoretry_for = (ConnectionError,)
     retry_kwargs = {"max_retries": 3}
@@ -29,7 +40,10 @@ def process_new_lead_task(lead_id: int) -> dict:
     Process a new lead based on channel.
 
     This is the main orchestrator task that determines what action
-    to take based on the lead's channel.
+    to take based on the lead's channel. For channels that are contacted
+    automatically (SMS, WhatsApp, email) it starts the lead's contact chain
+    and makes the first attempt right away, or hands it to the channel's
+    queue for messengers.
 
     Args:
         lead_id: Lead ID
@@ -39,101 +53,277 @@ def process_new_lead_task(lead_id: int) -> dict:
     """
     logger.info(f"Processing new lead: {lead_id}")
 
+    try:
+        return _process_lead(lead_id)
+    finally:
+        # Persist buffered status transitions before the task is acknowledged
+        run_async(lead_status_buffer.flush())
+
+
+@celery_app.task(base=LeadTask, name="attempt_contact")
+def attempt_contact_task(lead_id: int, step: int) -> dict:
+    """
+    Contact a lead through the next channel of its contact chain.
+
+    Enqueued by the orchestrator for messenger channels (on the channel's
+    queue) and when the previous channel failed or timed out. Stale
+    deliveries (the chain already moved on) are skipped.
+
+    Args:
+        lead_id: Lead ID
+        step: Position in the lead's contact chain
+
+    Returns:
+        Dict with contact result
+    """
+    logger.info(f"Contact attempt {step} for lead {lead_id}")
+
+    try:
+        lead = run_async(_get_lead(lead_id))
+
+        if (
+            not lead
+            or not lead.contact_chain
+            or lead.contact_chain.get("step") != step
+            or lead.status not in (LeadStatus.NEW, LeadStatus.PROCESSING)
+        ):
+            logger.info(f"Skipping stale contact attempt {step} for lead {lead_id}")
+            return {"success": True, "action": "skipped", "message": "Contact attempt is stale"}
+
+        return _attempt_contact(lead, dict(lead.contact_chain), step)
+    finally:
+        run_async(lead_status_buffer.flush())
+
+
+def _process_lead(lead_id: int) -> dict:
+    """Load the lead and dispatch it to the channel handler."""
     # Get lead from database
-    lead = asyncio.run(_get_lead(lead_id))
+    lead = run_async(_get_lead(lead_id))
 
     if not lead:
         logger.error(f"Lead {lead_id} not found")
         return {"success": False, "error": "Lead not found"}
 
+    # Outbox delivery is at-least-once: skip leads that were already processed
+    if lead.status not in (LeadStatus.NEW, LeadStatus.PROCESSING):
+        logger.info(f"Lead {lead_id} already processed (status: {lead.status.value})")
+        return {"success": True, "action": "skipped", "message": "Lead already processed"}
+
     # Update status to processing
-    asyncio.run(_update_lead_status(lead_id, LeadStatus.PROCESSING))
+    run_async(_update_lead_status(lead_id, LeadStatus.PROCESSING))
 
     # Process based on channel
     try:
-        if lead.channel == LeadChannel.SMS:
-            return _process_sms_lead(lead)
-        elif lead.channel == LeadChannel.EMAIL:
-            return _process_email_lead(lead)
+        if lead.contact_chain or lead.channel.value in CHANNEL_SENDERS:
+            # Resume a chain after a deferred retry, or start a new one
+            chain = dict(lead.contact_chain or run_async(_start_contact_chain(lead)))
+            step = chain["step"]
+            if step < len(chain["channels"]) and chain["channels"][step] in CHANNEL_QUEUES:
+                # Messenger attempts run on the channel's own queue
+                _enqueue_attempt(lead.id, step, chain["channels"][step])
+                return {"success": True, "action": "queued", "channel": chain["channels"][step]}
+            return _attempt_contact(lead, chain, step)
         elif lead.channel == LeadChannel.VK:
             return _process_vk_lead(lead)
         elif lead.channel == LeadChannel.TELEGRAM:
             return _process_telegram_lead(lead)
-        elif lead.channel == LeadChannel.WHATSAPP:
-            return _process_whatsapp_lead(lead)
         elif lead.channel == LeadChannel.WEB:
             return _process_web_lead(lead)
         else:
             logger.warning(f"Unknown channel: {lead.channel}")
-            asyncio.run(_update_lead_status(lead_id, LeadStatus.NEW))
+            run_async(_update_lead_status(lead_id, LeadStatus.NEW))
             return {"success": False, "error": "Unknown channel"}
 
+    except (RateLimited, CircuitOpen):
+        # Lead stays in PROCESSING and the task is retried later
+        raise
     except Exception as e:
         logger.error(f"Error processing lead {lead_id}: {e}")
-        asyncio.run(_update_lead_status(lead_id, LeadStatus.FAILED))
+        run_async(_update_lead_status(lead_id, LeadStatus.FAILED))
         return {"success": False, "error": str(e)}
 
 
-def _process_sms_lead(lead: Lead) -> dict:
+# Contact chain
+
+def _can_contact(lead: Lead, channel: str) -> bool:
+    """Check that the lead has what an automatic channel needs."""
+    if channel == LeadChannel.SMS.value:
+        return bool(lead.phone)
+    if channel == LeadChannel.WHATSAPP.value:
+        # Falling back to WhatsApp requires marketing consent
+        return bool(lead.phone and (lead.channel == LeadChannel.WHATSAPP or lead.consent_marketing))
+    if channel == LeadChannel.EMAIL.value:
+        return bool(lead.email)
+    return False
+
+
+async def _start_contact_chain(lead: Lead) -> Dict[str, Any]:
     """
-    Process SMS channel lead.
+    Build and store the contact chain of a lead.
 
-    Sends a welcome SMS with next steps.
+    The lead's own channel comes first, followed by the tenant's fallback
+    channels (``widget_config["fallback_chain"]``, CONTACT_FALLBACK_CHAIN by
+    default). Channels the lead has no contact details for are left out.
     """
-    logger.info(f"Processing SMS lead: {lead.id}")
-
-    # Generate message
-    message = (
-        f"Здравствуйте, {lead.name}!\n\n"
-        f"Спасибо за интерес к нашим услугам. "
-        f"Наш специалист свяжется с вами в ближайшее время.\n\n"
-        f"С уважением, Fast Lead"
-    )
+    tenant = await tenant_resolver.get_by_id(lead.tenant_id)
+    fallback = (tenant.widget_config.get("fallback_chain") if tenant else None)
+    if fallback is None:
+        fallback = settings.contact_fallback_chain
 
-    # Send SMS asynchronously
-    send_sms_task.delay(
-        phone=lead.phone,
-        message=message,
-        lead_id=lead.id,
-    )
+    channels = []
+    for channel in [lead.channel.value, *fallback]:
+        if channel in CHANNEL_SENDERS and channel not in channels and _can_contact(lead, channel):
+            channels.append(channel)
 
-    # Update lead status
-    asyncio.run(_update_lead_status(lead.id, LeadStatus.CONTACTED))
+    chain = {"channels": channels, "step": 0, "attempts": []}
+    await _save_contact_chain(lead.id, chain)
+    return chain
+
+
+def _attempt_contact(lead: Lead, chain: Dict[str, Any], step: int) -> dict:
+    """
+    Contact the lead through one channel of its chain.
+
+    The attempt has CONTACT_STEP_TIMEOUT seconds. On failure or timeout the
+    next channel is enqueued as a separate ``attempt_contact`` task; after
+    the last channel the lead is FAILED. An open circuit counts as a failure
+    when there is a channel to fall back to, and defers the task otherwise.
+    """
+    channels = chain["channels"]
+
+    if step >= len(channels):
+        logger.warning(f"Lead {lead.id} has no contact details for an automatic channel")
+        run_async(_update_lead_status(lead.id, LeadStatus.FAILED))
+        return {"success": False, "error": f"No contact details for {lead.channel.value} channel"}
+
+    channel = channels[step]
+    send = CHANNEL_SENDERS[channel]
+
+    try:
+        result = run_async(asyncio.wait_for(send(lead), settings.contact_step_timeout))
+
+    except RateLimited:
+        raise
+    except Exception as e:
+        has_fallback = step + 1 < len(channels)
+        if isinstance(e, CircuitOpen) and not has_fallback:
+            raise
+
+        error = str(e) or f"{channel} did not respond in {settings.contact_step_timeout}s"
+        logger.warning(f"Failed to contact lead {lead.id} via {channel}: {error}")
+
+        chain["attempts"] = [*chain["attempts"], _attempt(channel, error=error)]
+
+        if has_fallback:
+            chain["step"] = step + 1
+            run_async(_save_contact_chain(lead.id, chain))
+            _enqueue_attempt(lead.id, step + 1, channels[step + 1])
+            return {
+                "success": False,
+                "action": "fallback",
+                "failed_channel": channel,
+                "next_channel": channels[step + 1],
+                "error": error,
+            }
+
+        run_async(_save_contact_chain(lead.id, chain))
+        run_async(_update_lead_status(lead.id, LeadStatus.FAILED))
+        return {"success": False, "error": error}
+
+    chain["attempts"] = [*chain["attempts"], _attempt(channel, message_id=result.get("message_id"))]
+    run_async(_save_contact_chain(lead.id, chain))
+    run_async(_update_lead_status(lead.id, LeadStatus.CONTACTED))
+    run_async(speed_to_lead.observe(channel, (datetime.utcnow() - lead.created_at).total_seconds()))
 
     return {
         "success": True,
-        "action": "sms_sent",
-        "message": "SMS queued for sending",
+        "action": f"{channel}_sent",
+        "message": f"Welcome message sent via {channel}",
+        "message_id": result.get("message_id"),
+        "fallback": step > 0,
     }
 
 
-def _process_email_lead(lead: Lead) -> dict:
-    """
-    Process Email channel lead.
+def _enqueue_attempt(lead_id: int, step: int, channel: str) -> None:
+    """Enqueue a contact attempt on the queue of its channel."""
+    attempt_contact_task.apply_async(
+        (lead_id, step),
+        queue=CHANNEL_QUEUES.get(channel, "contact"),
+        priority=PRIORITY_FIRST_CONTACT,
+    )
+
+
+def _attempt(channel: str, message_id: Any = None, error: Optional[str] = None) -> Dict[str, Any]:
+    """Build a contact attempt record."""
+    return {
+        "channel": channel,
+        "success": error is None,
+        "message_id": message_id,
+        "error": error,
+        "at": datetime.utcnow().isoformat(),
+    }
+
 
-    Sends a welcome email with next steps.
+async def _send_sms(lead: Lead) -> Dict[str, Any]:
+    """Send the welcome SMS."""
+    message = await template_service.render(
+        lead.tenant_id, LeadChannel.SMS, "welcome", {"name": lead.name}
+    )
+
+    try:
+        result = await SMSService().send_sms(phone=lead.phone, message=message.body)
+    except SMSServiceError as e:
+        await _update_lead_sms_failed(lead.id, str(e))
+        raise
+
+    await _update_lead_sms_status(lead.id, result)
+    return result
+
+
+async def _send_whatsapp(lead: Lead) -> Dict[str, Any]:
     """
-    logger.info(f"Processing Email lead: {lead.id}")
+    Send the welcome message via WhatsApp Business API.
 
-    # Import here to avoid circular dependency
-    from app.tasks.email_tasks import send_welcome_email_task
+    Note: WhatsApp requires phone number in international format without '+'.
+    """
+    message = await template_service.render(
+        lead.tenant_id, LeadChannel.WHATSAPP, "welcome", {"name": lead.name}
+    )
 
-    # Send welcome email asynchronously
-    send_welcome_email_task.delay(
-        to_email=lead.email,
-        name=lead.name,
-        lead_id=lead.id,
+    return await WhatsAppService().send_message(
+        to=lead.phone.replace("+", ""),
+        message=message.body,
     )
 
-    # Update lead status
-    asyncio.run(_update_lead_status(lead.id, LeadStatus.CONTACTED))
 
-    return {
-        "success": True,
-        "action": "email_sent",
-        "message": "Welcome email queued for sending",
+async def _send_email(lead: Lead) -> Dict[str, Any]:
+    """Send the welcome email."""
+    message = await template_service.render(
+        lead.tenant_id, LeadChannel.EMAIL, "welcome", {"name": lead.name}
+    )
+    email = {
+        "to_email": lead.email,
+        "subject": message.subject,
+        "body_html": message.body_html,
+        "body_text": message.body,
     }
 
+    email_service = EmailService()
+    if settings.email_async_enabled:
+        return await email_service.send_email_async(**email)
+
+    return await asyncio.to_thread(email_service.send_email, **email)
+
+
+# Channels contacted automatically, with their welcome message senders
+CHANNEL_SENDERS = {
+    LeadChannel.SMS.value: _send_sms,
+    LeadChannel.WHATSAPP.value: _send_whatsapp,
+    LeadChannel.EMAIL.value: _send_email,
+}
+
+
+# Manual channels
 
 def _process_vk_lead(lead: Lead) -> dict:
     """
@@ -146,7 +336,7 @@ def _process_vk_lead(lead: Lead) -> dict:
     logger.info(f"Processing VK lead: {lead.id}")
 
     # Update lead status
-    asyncio.run(_update_lead_status(lead.id, LeadStatus.CONTACTED))
+    run_async(_update_lead_status(lead.id, LeadStatus.CONTACTED))
 
     return {
         "success": True,
@@ -166,7 +356,7 @@ def _process_telegram_lead(lead: Lead) -> dict:
     logger.info(f"Processing Telegram lead: {lead.id}")
 
     # Update lead status
-    asyncio.run(_update_lead_status(lead.id, LeadStatus.CONTACTED))
+    run_async(_update_lead_status(lead.id, LeadStatus.CONTACTED))
 
     return {
         "success": True,
@@ -175,62 +365,6 @@ def _process_telegram_lead(lead: Lead) -> dict:
     }
 
 
-def _process_whatsapp_lead(lead: Lead) -> dict:
-    """
-    Process WhatsApp channel lead.
-
-    Sends a welcome message via WhatsApp Business API.
-    Note: WhatsApp requires phone number in international format without '+'.
-    """
-    logger.info(f"Processing WhatsApp lead: {lead.id}")
-
-    if not lead.phone:
-        logger.warning(f"WhatsApp lead {lead.id} has no phone number")
-        asyncio.run(_update_lead_status(lead.id, LeadStatus.FAILED))
-        return {
-            "success": False,
-            "error": "No phone number provided",
-        }
-
-    # Import WhatsApp service
-    from app.services.whatsapp_service import WhatsAppService
-
-    # Send welcome message
-    try:
-        service = WhatsAppService()
-
-        # Format phone number (remove '+' if present)
-        phone = lead.phone.replace("+", "")
-
-        message = f"Здравствуйте, {lead.name}! Спасибо за обращение. Мы свяжемся с вами в ближайшее время."
-
-        # Send async message
-        result = asyncio.run(service.send_message(
-            to=phone,
-            message=message,
-        ))
-
-        logger.info(f"WhatsApp message sent to {phone}: {result}")
-
-        # Update status
-        asyncio.run(_update_lead_status(lead.id, LeadStatus.CONTACTED))
-
-        return {
-            "success": True,
-            "action": "whatsapp_sent",
-            "message": "Welcome message sent via WhatsApp",
-            "whatsapp_message_id": result.get("message_id"),
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to send WhatsApp message to lead {lead.id}: {e}")
-        asyncio.run(_update_lead_status(lead.id, LeadStatus.FAILED))
-        return {
-            "success": False,
-            "error": str(e),
-        }
-
-
 def _process_web_lead(lead: Lead) -> dict:
     """
     Process Web channel lead.
@@ -240,7 +374,7 @@ def _process_web_lead(lead: Lead) -> dict:
     """
     logger.info(f"Processing Web lead: {lead.id}")
 
-    asyncio.run(_update_lead_status(lead.id, LeadStatus.NEW))
+    run_async(_update_lead_status(lead.id, LeadStatus.NEW))
 
     return {
         "success": True,
@@ -260,14 +394,19 @@ async def _get_lead(lead_id: int) -> Optional[Lead]:
         return result.scalar_one_or_none()
 
 
-async def _update_lead_status(lead_id: int, status: LeadStatus) -> None:
-    """Update lead status."""
+async def _save_contact_chain(lead_id: int, chain: Dict[str, Any]) -> None:
+    """Store contact chain state on the lead."""
     async with async_session_maker() as session:
-        try:
-            stmt = update(Lead).where(Lead.id == lead_id).values(status=status)
-            await session.execute(stmt)
-            await session.commit()
-            logger.info(f"Lead {lead_id} status updated to {status.value}")
-        except Exception as e:
-            logger.error(f"Failed to update lead status: {e}")
-            await session.rollback()
+        await session.execute(
+            update(Lead)
+            .where(Lead.id == lead_id)
+            .values(contact_chain=chain)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+
+async def _update_lead_status(lead_id: int, status: LeadStatus) -> None:
+    """Record lead status transition (written in bulk by the status buffer)."""
+    await lead_status_buffer.record(lead_id, status)
+    logger.info(f"Lead {lead_id} status updated to {status.value}")
@@ -1,22 +1,26 @@
 """Celery tasks for SMS operations."""
 
 import asyncio
+import json
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 
-from celery import Task
-from sqlalchemy import select, update
+from sqlalchemy import Integer, Text, cast, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import JSONB
 
+from app.core.async_runtime import run_async
 from app.core.celery_app import celery_app
 from app.core.database import async_session_maker
+from app.core.rate_governor import ThrottledTask
 from app.models.lead import Lead
 from app.services.sms_service import SMSService, SMSServiceError
 
 logger = logging.getLogger(__name__)
 
 
-class SMSTask(Task):
-    """Base task for SMS operations with retry logic."""
+class SMSTask(ThrottledTask):
+    """Base task for SMS operations with retry logic (deferred while SMSC is rate limited)."""
 
     autoretry_for = (SMSServiceError, ConnectionError)
     retry_kwargs = {"max_retries": 3}
@@ -49,9 +53,9 @@ def send_sms_task(
     # Create SMS service
     sms_service = SMSService()
 
-    # Send SMS (using asyncio.run for async function)
+    # Send SMS on the worker async runtime
     try:
-        result = asyncio.run(
+        result = run_async(
             sms_service.send_sms(
                 phone=phone,
                 message=message,
@@ -61,7 +65,7 @@ def send_sms_task(
 
         # Update lead if lead_id is provided
         if lead_id:
-            asyncio.run(_update_lead_sms_status(lead_id, result))
+            run_async(_update_lead_sms_status(lead_id, result))
 
         logger.info(f"SMS sent successfully. Message ID: {result['message_id']}")
         return result
@@ -70,10 +74,64 @@ def send_sms_task(
         logger.error(f"Failed to send SMS: {e}")
         # Update lead status to failed
         if lead_id:
-            asyncio.run(_update_lead_sms_failed(lead_id, str(e)))
+            run_async(_update_lead_sms_failed(lead_id, str(e)))
         raise
 
 
+@celery_app.task(base=SMSTask, bind=True, bulk=True, name="send_sms_batch")
+def send_sms_batch_task(
+    self,
+    messages: List[Dict[str, Any]],
+    sender: Optional[str] = None,
+) -> dict:
+    """
+    Send SMS to many recipients via SMSC.ru batch requests.
+
+    Used for reminder and campaign blasts. Messages are grouped by text
+    (personalized ones go in one ``list`` request), and the resulting
+    message IDs are written back to the leads with a single UPDATE.
+    Recipients of failed requests are retried; the rest are not resent.
+
+    Args:
+        messages: Dicts with "phone", "message" and optional "lead_id"
+        sender: Sender name for all messages (optional)
+
+    Returns:
+        Dict with sent/failed counts and per-message results
+    """
+    logger.info(f"Sending SMS batch to {len(messages)} recipient(s)")
+
+    sms_service = SMSService()
+    results = run_async(sms_service.send_sms_batch(messages, sender=sender))
+
+    # Record outcome on leads, except for recipients that will be retried
+    final = self.request.retries >= self.max_retries
+    lead_results = [
+        (message["lead_id"], result)
+        for message, result in zip(messages, results)
+        if message.get("lead_id") and (final or not result["retryable"])
+    ]
+    if lead_results:
+        run_async(_update_leads_sms_batch(lead_results))
+
+    retry_messages = [
+        message
+        for message, result in zip(messages, results)
+        if result["retryable"]
+    ]
+    if retry_messages and not final:
+        logger.warning(f"Retrying {len(retry_messages)} SMS batch recipient(s)")
+        raise self.retry(kwargs={"messages": retry_messages, "sender": sender})
+
+    sent = sum(1 for result in results if result["success"])
+    return {
+        "success": sent == len(results),
+        "sent": sent,
+        "failed": len(results) - sent,
+        "results": results,
+    }
+
+
 @celery_app.task(base=SMSTask, name="send_verification_code")
 def send_verification_code_task(phone: str, code: str, lead_id: Optional[int] = None) -> dict:
     """
@@ -92,7 +150,7 @@ def send_verification_code_task(phone: str, code: str, lead_id: Optional[int] =
     return send_sms_task(phone=phone, message=message, lead_id=lead_id)
 
 
-@celery_app.task(base=SMSTask, name="send_appointment_reminder")
+@celery_app.task(base=SMSTask, bulk=True, name="send_appointment_reminder")
 def send_appointment_reminder_task(
     phone: str,
     appointment_time: str,
@@ -133,11 +191,11 @@ def check_sms_status_task(message_id: int, phone: str, lead_id: Optional[int] =
     sms_service = SMSService()
 
     try:
-        status = asyncio.run(sms_service.get_status(message_id, phone))
+        status = run_async(sms_service.get_status(message_id, phone))
 
         # Update lead if status indicates delivery
         if lead_id and status.get("status") in [1, 2]:  # Delivered or read
-            asyncio.run(_update_lead_sms_delivered(lead_id))
+            run_async(_update_lead_sms_delivered(lead_id))
 
         return status
 
@@ -180,6 +238,53 @@ async def _update_lead_sms_status(lead_id: int, sms_result: dict) -> None:
             await session.rollback()
 
 
+async def _update_leads_sms_batch(lead_results: List[Tuple[int, dict]]) -> None:
+    """
+    Update leads with SMS batch results in one statement.
+
+    Args:
+        lead_results: Pairs of (lead ID, per-message result from send_sms_batch)
+    """
+    sent_at = datetime.utcnow().isoformat()
+    rows = []
+    for lead_id, result in lead_results:
+        if result["success"]:
+            info = {
+                "sms_message_id": result["message_id"],
+                "sms_sent_at": sent_at,
+                "sms_status": "sent",
+            }
+        else:
+            info = {"sms_status": "failed", "sms_error": result["error"]}
+        rows.append((lead_id, json.dumps(info)))
+
+    sms_info = values(
+        column("id", Integer),
+        column("info", Text),
+        name="sms_info",
+    ).data(rows)
+
+    payload = cast(
+        func.coalesce(cast(Lead.payload, JSONB), cast("{}", JSONB))
+        .op("||")(cast(sms_info.c.info, JSONB)),
+        Lead.payload.type,
+    )
+
+    async with async_session_maker() as session:
+        try:
+            await session.execute(
+                update(Lead)
+                .where(Lead.id == sms_info.c.id)
+                .values(payload=payload)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        except Exception as e:
+            logger.error(f"Failed to update leads with SMS batch results: {e}")
+            await session.rollback()
+
+
 async def _update_lead_sms_failed(lead_id: int, error: str) -> None:
     """
     Update lead with SMS failure info.
@@ -0,0 +1,59 @@
+"""Webhook consumer process - applies queued webhook events.
+
+Several consumers can run at once; each stream partition is consumed by one
+of them at a time (see ``app.services.webhook_queue``).
+
+Usage:
+    python -m app.webhook_consumer                       # consume until stopped
+    python -m app.webhook_consumer --replay-dead-letters 100
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.database import close_db
+from app.core.redis import close_redis
+from app.services.webhook_queue import webhook_queue
+
+logger = logging.getLogger("webhook_consumer")
+
+
+async def main(replay: int = 0) -> None:
+    """Run the webhook consumer until SIGINT/SIGTERM (or replay dead letters)."""
+    try:
+        if replay:
+            replayed = await webhook_queue.replay_dead_letters(replay)
+            logger.info(f"Re-queued {replayed} dead-lettered webhook event(s)")
+            return
+
+        stop_event = asyncio.Event()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+
+        await webhook_queue.run(stop_event)
+    finally:
+        await close_redis()
+        await close_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s: %(levelname)s/%(name)s] %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--replay-dead-letters",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Re-queue up to N dead-lettered events and exit",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.replay_dead_letters))
@@ -0,0 +1,150 @@
+"""Celery worker launcher - starts one worker per pool in WORKER_POOLS.
+
+Each pool gets its own ``celery worker`` process with the pool type,
+concurrency and prefetch multiplier configured for its queues (see
+``app.core.celery_app``; override with CELERY_WORKER_POOLS). If one worker
+exits, the others are stopped too, so a process supervisor restarts the set.
+
+Usage:
+    python -m app.worker_launcher                  # all pools
+    python -m app.worker_launcher contact sms      # selected pools
+    python -m app.worker_launcher --dry-run        # print the commands
+"""
+
+import argparse
+import logging
+import signal
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from app.core.celery_app import get_worker_pools
+
+logger = logging.getLogger("worker_launcher")
+
+# Pools that work with the per-process async runtime. gevent/eventlet
+# monkey-patching does not mix with the runtime's event loop thread.
+SUPPORTED_POOLS = ("prefork", "threads", "solo")
+
+# Seconds to wait for workers to finish their tasks after SIGTERM
+STOP_TIMEOUT = 60
+
+
+def build_command(name: str, pool: Dict[str, Any], loglevel: str) -> List[str]:
+    """
+    Build the celery worker command for a pool.
+
+    Args:
+        name: Pool name (used as worker node name)
+        pool: Pool definition (queues, pool, concurrency, prefetch)
+        loglevel: Worker log level
+
+    Returns:
+        Command line
+
+    Raises:
+        ValueError: If the pool definition is invalid
+    """
+    pool_type = pool.get("pool", "prefork")
+    if pool_type not in SUPPORTED_POOLS:
+        raise ValueError(f"Pool {name}: unsupported pool type {pool_type!r} (use one of {SUPPORTED_POOLS})")
+    if not pool.get("queues"):
+        raise ValueError(f"Pool {name}: no queues")
+
+    return [
+        sys.executable, "-m", "celery",
+        "-A", "app.core.celery_app:celery_app",
+        "worker",
+        f"--loglevel={loglevel}",
+        f"--pool={pool_type}",
+        f"--concurrency={pool.get('concurrency', 4)}",
+        f"--prefetch-multiplier={pool.get('prefetch', 4)}",
+        f"--queues={','.join(pool['queues'])}",
+        f"--hostname={name}@%h",
+    ]
+
+
+def run(commands: Dict[str, List[str]]) -> int:
+    """
+    Run worker processes until one exits or SIGINT/SIGTERM is received.
+
+    Returns:
+        Exit code (0 after a requested stop)
+    """
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    workers = {}
+    for name, command in commands.items():
+        logger.info(f"Starting {name} worker: {' '.join(command[2:])}")
+        workers[name] = subprocess.Popen(command)
+
+    exit_code = 0
+    while not stopping:
+        exited = {name: proc.returncode for name, proc in workers.items() if proc.poll() is not None}
+        if exited:
+            logger.error(f"Worker exited, stopping the others: {exited}")
+            exit_code = 1
+            break
+        time.sleep(0.5)
+
+    # Warm shutdown: workers finish the tasks they are running
+    for proc in workers.values():
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGTERM)
+
+    deadline = time.monotonic() + STOP_TIMEOUT
+    for name, proc in workers.items():
+        try:
+            proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            logger.warning(f"{name} worker did not stop in {STOP_TIMEOUT}s, killing")
+            proc.kill()
+            proc.wait()
+
+    return exit_code
+
+
+def main() -> int:
+    """Parse arguments and start the worker pools."""
+    pools = get_worker_pools()
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pools", nargs="*", help=f"Pools to start (default: all of {', '.join(pools)})")
+    parser.add_argument("--loglevel", default="info", help="Worker log level")
+    parser.add_argument("--dry-run", action="store_true", help="Print worker commands and exit")
+    args = parser.parse_args()
+
+    unknown = set(args.pools) - set(pools)
+    if unknown:
+        parser.error(f"unknown pools: {', '.join(sorted(unknown))}")
+
+    try:
+        commands = {
+            name: build_command(name, pools[name], args.loglevel)
+            for name in (args.pools or pools)
+        }
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.dry_run:
+        for command in commands.values():
+            print(" ".join(command[2:]))
+        return 0
+
+    return run(commands)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s: %(levelname)s/%(name)s] %(message)s",
+    )
+    sys.exit(main())
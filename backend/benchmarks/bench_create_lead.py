@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /api/v1/leads latency against local PostgreSQL.
+
+Runs the FastAPI app in-process (ASGI transport, no network hop) and counts
+DB round-trips per request (statements + COMMITs). Celery uses an in-memory
+broker, so the numbers cover only the handler and the database. All
+requests come from one client, so lead rate limiting is switched off for
+the run (pass --rate-limit to measure with the limiter on).
+
+Usage:
+    python benchmarks/bench_create_lead.py --requests 1000 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.database import engine, init_db
+from app.main import app
+from common import get_bench_tenant_id, percentile, summarize, write_results
+
+LEAD_PAYLOAD = {
+    "name": "Бенчмарк",
+    "channel": "web",
+    "consent": {"gdpr": True, "marketing": False},
+}
+
+# Unique phone per request (repeats within LEAD_DEDUP_WINDOW are duplicates,
+# not inserts); the random start keeps consecutive runs apart
+_phone_numbers = itertools.count(random.randrange(10_000_000))
+
+
+def lead_payload() -> dict:
+    """Build a lead payload with a phone not used before in this run."""
+    return {**LEAD_PAYLOAD, "phone": f"+7998{next(_phone_numbers) % 10_000_000:07d}"}
+
+round_trips = {"statements": 0, "commits": 0}
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(*args):
+    round_trips["statements"] += 1
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _count_commit(*args):
+    round_trips["commits"] += 1
+
+
+async def run_benchmark(requests: int, concurrency: int) -> dict:
+    """Send requests, print latency percentiles and return results."""
+    await init_db()
+    tenant_id = await get_bench_tenant_id()
+
+    latencies = []
+    errors = 0
+    duplicates = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def send_one() -> None:
+            nonlocal errors, duplicates
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/leads",
+                    json=lead_payload(),
+                    headers={"X-Tenant-Id": str(tenant_id)},
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code == 200:
+                    duplicates += 1
+                elif response.status_code != 201:
+                    errors += 1
+
+        # Warm up the connection pool
+        await asyncio.gather(*(send_one() for _ in range(concurrency)))
+        latencies.clear()
+        errors = duplicates = 0
+        round_trips.update(statements=0, commits=0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send_one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    await engine.dispose()
+
+    print("=" * 60)
+    print(f"Requests:           {requests} (concurrency {concurrency}, errors {errors}, duplicates {duplicates})")
+    print(f"Throughput:         {requests / elapsed:.1f} req/sec")
+    print(f"Latency mean:       {statistics.mean(latencies):.2f} ms")
+    print(f"Latency p50:        {percentile(latencies, 50):.2f} ms")
+    print(f"Latency p95:        {percentile(latencies, 95):.2f} ms")
+    print(f"Latency p99:        {percentile(latencies, 99):.2f} ms")
+    print(f"Statements/request: {round_trips['statements'] / requests:.2f}")
+    print(f"COMMITs/request:    {round_trips['commits'] / requests:.2f}")
+    print("=" * 60)
+
+    return {
+        "params": {"requests": requests, "concurrency": concurrency},
+        "errors": errors,
+        "duplicates": duplicates,
+        "throughput_rps": round(requests / elapsed, 1),
+        "api_latency_ms": summarize(latencies),
+        "statements_per_request": round(round_trips["statements"] / requests, 2),
+        "commits_per_request": round(round_trips["commits"] / requests, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500, help="Number of requests")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep lead rate limiting on")
+    parser.add_argument("--output", help="Results JSON file (default: benchmarks/results/create_lead-<commit>.json)")
+    args = parser.parse_args()
+
+    # Keep the broker out of the measurement
+    celery_app.conf.broker_url = "memory://"
+    settings.rate_limit_enabled = args.rate_limit
+
+    print("🔍 Benchmarking POST /api/v1/leads\n")
+    results = asyncio.run(run_benchmark(args.requests, args.concurrency))
+    print(f"Results written to {write_results('create_lead', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark email throughput: blocking smtplib vs async SMTP engine.
+
+Sends the same burst of welcome emails three ways against the SMTP sink of
+benchmarks/stubs.py (start it first, e.g. --latency-ms 50):
+
+- connect:  new smtplib session per email (previous behaviour)
+- pool:     pooled smtplib session, emails back to back (EmailService.send_emails)
+- async:    aiosmtplib engine, many emails in flight (EmailService.send_emails_async)
+
+Usage:
+    python benchmarks/bench_email.py --emails 500 --smtp-port 8925
+"""
+
+import argparse
+import asyncio
+import os
+import smtplib
+import sys
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.async_smtp import AsyncSMTPEngine
+from app.core.smtp_pool import SMTPConnectionPool
+from app.services import email_service as email_module
+from app.services.email_service import EmailService
+from common import write_results
+
+
+def build_emails(service: EmailService, count: int) -> list:
+    """Build welcome emails for the burst."""
+    return [
+        service.welcome_email(f"bench{i}@example.com", f"Бенчмарк {i}")
+        for i in range(count)
+    ]
+
+
+def bench_connect(service: EmailService, emails: list, host: str, port: int) -> float:
+    """Send with a new SMTP session per email."""
+    start = time.perf_counter()
+    for email in emails:
+        with smtplib.SMTP(host, port, timeout=30) as server:
+            server.send_message(service.build_message(**email))
+    return time.perf_counter() - start
+
+
+def bench_pool(service: EmailService, emails: list) -> float:
+    """Send over a pooled smtplib session."""
+    start = time.perf_counter()
+    service.send_emails(emails)
+    return time.perf_counter() - start
+
+
+async def bench_async(service: EmailService, emails: list) -> float:
+    """Send concurrently with the async engine."""
+    start = time.perf_counter()
+    await service.send_emails_async(emails)
+    elapsed = time.perf_counter() - start
+    await email_module.async_smtp.aclose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--emails", type=int, default=200, help="Emails per mode")
+    parser.add_argument("--smtp-host", default="127.0.0.1", help="SMTP sink host")
+    parser.add_argument("--smtp-port", type=int, default=8925, help="SMTP sink port")
+    parser.add_argument("--concurrency", type=int, default=50, help="Async sessions per host")
+    parser.add_argument("--skip-connect", action="store_true", help="Skip the connection-per-email mode")
+    parser.add_argument("--output", help="Results JSON file (default: benchmarks/results/email-<commit>.json)")
+    args = parser.parse_args()
+
+    # Point the service at the sink
+    email_module.smtp_pool = SMTPConnectionPool(
+        host=args.smtp_host, port=args.smtp_port, user="", password="", use_tls=False,
+    )
+    email_module.async_smtp = AsyncSMTPEngine(max_connections_per_host=args.concurrency)
+    email_module.settings.smtp_host = args.smtp_host
+    email_module.settings.smtp_port = args.smtp_port
+    email_module.settings.smtp_user = ""
+    email_module.settings.smtp_password = ""
+    email_module.settings.smtp_use_tls = False
+
+    service = EmailService()
+    emails = build_emails(service, args.emails)
+
+    print(f"🔍 Benchmarking {args.emails} emails per mode\n")
+
+    timings = {}
+    if not args.skip_connect:
+        timings["connect"] = bench_connect(service, emails, args.smtp_host, args.smtp_port)
+    timings["pool"] = bench_pool(service, emails)
+    timings["async"] = asyncio.run(bench_async(service, emails))
+    email_module.smtp_pool.close()
+
+    results = {
+        "params": {"emails": args.emails, "concurrency": args.concurrency},
+        "emails_per_sec": {mode: round(args.emails / elapsed, 1) for mode, elapsed in timings.items()},
+    }
+
+    print("=" * 60)
+    for mode, rate in results["emails_per_sec"].items():
+        print(f"{mode:<10} {rate:>10.1f} emails/sec")
+    print("=" * 60)
+    print(f"Results written to {write_results('email', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Load-test the ingestion-to-first-contact pipeline.
+
+Sends POST /api/v1/leads at a fixed rate (open loop: requests are fired on
+schedule whether or not earlier ones finished) to a running API, then waits
+until the orchestrator marks the leads CONTACTED and reads created_at ->
+contacted_at from the database. Reports p50/p95/p99 for API latency and
+time-to-first-contact and writes them to a JSON file for comparison across
+commits (see benchmarks/compare.py).
+
+Expects the full stack to run locally: PostgreSQL, Redis, the API, a Celery
+worker, the outbox relay, and benchmarks/stubs.py in place of SMSC/WhatsApp/SMTP.
+All leads come from one IP and tenant: start the API with
+RATE_LIMIT_ENABLED=false (or limits above the load), otherwise most requests
+get 429. Rate-limited responses are reported separately from errors.
+
+With --fallback-chain the benchmark tenant falls back to other channels when
+the lead's channel fails; run the stubs with --whatsapp-error-rate or
+--whatsapp-latency-ms to see how many leads are still contacted, and via
+which channel.
+
+Usage:
+    python benchmarks/bench_pipeline.py --rps 50 --duration 30 --channels sms,whatsapp
+    python benchmarks/bench_pipeline.py --channels whatsapp --fallback-chain sms,email
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import select
+
+from app.core.database import async_session_maker, engine
+from app.models.lead import Lead, LeadStatus
+from app.models.tenant import Tenant
+from app.services.tenant_service import tenant_resolver
+from common import get_bench_tenant_id, summarize, write_results
+
+FINAL_STATUSES = (LeadStatus.CONTACTED, LeadStatus.FAILED)
+
+
+def lead_payload(channel: str, index: int) -> dict:
+    """Build lead payload for the channel (unique contact per lead)."""
+    payload = {
+        "name": f"Бенчмарк {index}",
+        "channel": channel,
+        "consent": {"gdpr": True, "marketing": True},
+        "email": f"bench{index}@example.com",
+    }
+
+    if channel == "vk":
+        payload["vk_id"] = f"bench{index}"
+    elif channel != "email":
+        # Phone leads carry an email too, so email can be a fallback channel
+        payload["phone"] = f"+7999{index % 10_000_000:07d}"
+
+    return payload
+
+
+async def drive_load(
+    api_url: str,
+    tenant_id: int,
+    rps: float,
+    duration: float,
+    channels: list,
+) -> dict:
+    """
+    Send leads at a fixed rate.
+
+    Returns:
+        Dict with API latencies (ms), created lead IDs, error and 429 counts
+    """
+    total = int(rps * duration)
+    latencies = []
+    lead_ids = []
+    errors = 0
+    rate_limited = 0
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+    async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=30.0) as client:
+
+        async def send_one(index: int) -> None:
+            nonlocal errors, rate_limited
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    "/api/v1/leads",
+                    json=lead_payload(channels[index % len(channels)], index),
+                    headers={"X-Tenant-Id": str(tenant_id)},
+                )
+            except httpx.HTTPError:
+                errors += 1
+                return
+
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code == 201:
+                lead_ids.append(response.json()["lead"]["id"])
+            elif response.status_code == 429:
+                rate_limited += 1
+            else:
+                errors += 1
+
+        tasks = []
+        start = time.perf_counter()
+        for index in range(total):
+            # Fire on schedule; don't wait for slow responses (no coordinated omission)
+            delay = start + index / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send_one(index)))
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "sent": total,
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "lead_ids": lead_ids,
+        "errors": errors,
+        "rate_limited": rate_limited,
+    }
+
+
+async def set_fallback_chain(tenant_id: int, channels: list) -> None:
+    """Set the benchmark tenant's contact fallback chain."""
+    async with async_session_maker() as session:
+        tenant = await session.get(Tenant, tenant_id)
+        tenant.widget_config = {**(tenant.widget_config or {}), "fallback_chain": channels}
+        await session.commit()
+
+    await tenant_resolver.invalidate(tenant_id)
+
+
+def contacted_via(row) -> str:
+    """Get the channel a lead was contacted through (from its contact chain)."""
+    for attempt in reversed((row.contact_chain or {}).get("attempts", [])):
+        if attempt.get("success"):
+            return attempt["channel"]
+    return "-"
+
+
+async def wait_for_contact(lead_ids: list, timeout: float) -> list:
+    """
+    Poll leads until all reach a final status or the timeout expires.
+
+    Returns:
+        Rows of (status, created_at, contacted_at, contact_chain)
+    """
+    deadline = time.monotonic() + timeout
+
+    while True:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Lead.status, Lead.created_at, Lead.contacted_at, Lead.contact_chain)
+                .where(Lead.id.in_(lead_ids))
+            )
+            rows = result.all()
+
+        pending = sum(1 for row in rows if row.status not in FINAL_STATUSES)
+        if not pending or time.monotonic() > deadline:
+            return rows
+
+        await asyncio.sleep(0.5)
+
+
+async def fetch_stub_stats(stubs_url: str) -> dict:
+    """Get received message counters from benchmarks/stubs.py."""
+    try:
+        async with httpx.AsyncClient(base_url=stubs_url, timeout=5.0) as client:
+            return (await client.get("/_stats")).json()
+    except httpx.HTTPError:
+        return {}
+
+
+async def run_benchmark(args) -> dict:
+    """Run the load and collect results."""
+    channels = args.channels.split(",")
+    fallback_chain = [c for c in args.fallback_chain.split(",") if c]
+    tenant_id = await get_bench_tenant_id()
+    await set_fallback_chain(tenant_id, fallback_chain)
+
+    print(f"Sending {int(args.rps * args.duration)} leads at {args.rps} req/sec ({', '.join(channels)})...")
+    load = await drive_load(args.api_url, tenant_id, args.rps, args.duration, channels)
+
+    print(f"Waiting for {len(load['lead_ids'])} leads to be contacted...")
+    rows = await wait_for_contact(load["lead_ids"], args.contact_timeout)
+
+    contact_latencies = [
+        (row.contacted_at - row.created_at).total_seconds() * 1000
+        for row in rows
+        if row.status == LeadStatus.CONTACTED and row.contacted_at
+    ]
+    statuses = {}
+    via = {}
+    for row in rows:
+        statuses[row.status.value] = statuses.get(row.status.value, 0) + 1
+        if row.status == LeadStatus.CONTACTED:
+            via[contacted_via(row)] = via.get(contacted_via(row), 0) + 1
+
+    await engine.dispose()
+
+    return {
+        "params": {
+            "rps": args.rps,
+            "duration": args.duration,
+            "channels": channels,
+            "fallback_chain": fallback_chain,
+        },
+        "requests": {
+            "sent": load["sent"],
+            "errors": load["errors"],
+            "rate_limited": load["rate_limited"],
+            "achieved_rps": round(load["sent"] / load["elapsed"], 1),
+        },
+        "api_latency_ms": summarize(load["latencies"]),
+        "time_to_contact_ms": summarize(contact_latencies),
+        "lead_statuses": statuses,
+        "contacted_via": via,
+        "stubs": await fetch_stub_stats(args.stubs_url),
+    }
+
+
+def print_summary(name: str, stats: dict) -> None:
+    """Print one latency summary line."""
+    if not stats.get("count"):
+        print(f"{name:<22} no samples")
+        return
+
+    print(
+        f"{name:<22} p50 {stats['p50']:>9.2f}  p95 {stats['p95']:>9.2f}  "
+        f"p99 {stats['p99']:>9.2f}  (n={stats['count']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--api-url", default="http://127.0.0.1:8000", help="Running API base URL")
+    parser.add_argument("--stubs-url", default="http://127.0.0.1:8900", help="benchmarks/stubs.py HTTP URL")
+    parser.add_argument("--rps", type=float, default=20, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="Load duration in seconds")
+    parser.add_argument("--channels", default="sms,whatsapp,email", help="Comma-separated lead channels")
+    parser.add_argument("--fallback-chain", default="", help="Comma-separated fallback channels for the tenant")
+    parser.add_argument("--contact-timeout", type=float, default=120, help="Seconds to wait for CONTACTED")
+    parser.add_argument("--output", help="Results JSON file (default: benchmarks/results/pipeline-<commit>.json)")
+    args = parser.parse_args()
+
+    print("🔍 Benchmarking lead ingestion -> first contact\n")
+    results = asyncio.run(run_benchmark(args))
+    path = write_results("pipeline", results, args.output)
+
+    print("=" * 60)
+    print(f"Requests:  {results['requests']['sent']} (errors {results['requests']['errors']}, "
+          f"achieved {results['requests']['achieved_rps']} req/sec)")
+    if results["requests"]["rate_limited"]:
+        print(f"WARNING:   {results['requests']['rate_limited']} requests got 429, "
+              f"start the API with RATE_LIMIT_ENABLED=false")
+    print(f"Statuses:  {results['lead_statuses']}")
+    print(f"Via:       {results['contacted_via']}")
+    print(f"Stubs:     {results['stubs']}")
+    print_summary("API latency, ms", results["api_latency_ms"])
+    print_summary("Time to contact, ms", results["time_to_contact_ms"])
+    print("=" * 60)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the worker async runtime.
+
+Compares the old task pattern (``asyncio.run()`` + a fresh connection for each
+DB call) with the persistent per-process runtime (``run_async()`` on one loop
+with a pooled engine). Each simulated task performs the same DB calls as
+``process_new_lead_task``: one lead lookup and two status updates.
+
+Usage:
+    python benchmarks/bench_worker_runtime.py --tasks 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+CALLS_PER_TASK = 3
+
+
+async def _query(session_maker) -> None:
+    """One short DB round-trip, like ``_get_lead`` / ``_update_lead_status``."""
+    async with session_maker() as session:
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+
+
+def bench_asyncio_run(tasks: int) -> float:
+    """Old pattern: new event loop and new connection for every call."""
+    engine = create_async_engine(settings.database_url_str, poolclass=NullPool)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    start = time.perf_counter()
+    for _ in range(tasks):
+        for _ in range(CALLS_PER_TASK):
+            asyncio.run(_query(session_maker))
+    elapsed = time.perf_counter() - start
+
+    asyncio.run(engine.dispose())
+    return elapsed
+
+
+def bench_runtime(tasks: int) -> float:
+    """New pattern: persistent runtime loop and pooled engine."""
+    from app.core.async_runtime import run_async, shutdown_runtime, start_runtime
+    from app.core.database import async_session_maker
+
+    start_runtime()
+    # Warm up the pool so connection setup is not counted
+    run_async(_query(async_session_maker))
+
+    start = time.perf_counter()
+    for _ in range(tasks):
+        for _ in range(CALLS_PER_TASK):
+            run_async(_query(async_session_maker))
+    elapsed = time.perf_counter() - start
+
+    shutdown_runtime()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200, help="Simulated tasks per mode")
+    args = parser.parse_args()
+
+    print(f"🔍 Benchmarking {args.tasks} tasks x {CALLS_PER_TASK} DB calls\n")
+
+    results = {
+        "asyncio.run() per call": bench_asyncio_run(args.tasks),
+        "persistent runtime": bench_runtime(args.tasks),
+    }
+
+    print("=" * 60)
+    for mode, elapsed in results.items():
+        print(f"{mode:<28} {args.tasks / elapsed:>10.1f} tasks/sec  ({elapsed:.2f}s)")
+    print("=" * 60)
+
+    baseline, runtime = results.values()
+    print(f"Speedup: {baseline / runtime:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Shared helpers for benchmark scripts."""
+
+import json
+import os
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import select
+
+from app.core.database import async_session_maker
+from app.models import Tenant
+
+BENCH_TENANT_SLUG = "bench"
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+async def get_bench_tenant_id() -> int:
+    """Get or create the tenant used for benchmark leads."""
+    async with async_session_maker() as session:
+        result = await session.execute(select(Tenant).where(Tenant.slug == BENCH_TENANT_SLUG))
+        tenant = result.scalar_one_or_none()
+
+        if not tenant:
+            tenant = Tenant(name="Benchmark", slug=BENCH_TENANT_SLUG)
+            session.add(tenant)
+            await session.commit()
+
+        return tenant.id
+
+
+def percentile(values, pct: float) -> float:
+    """Get percentile of a list of values (nearest-rank)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values: Iterable[float]) -> Dict[str, Any]:
+    """Summarize latencies (ms) as count/mean/p50/p95/p99/max."""
+    values = list(values)
+    if not values:
+        return {"count": 0}
+
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2),
+    }
+
+
+def git_revision() -> str:
+    """Get short hash of the checked out commit ("unknown" outside git)."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(name: str, results: Dict[str, Any], path: str = None) -> str:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        name: Benchmark name (used in the default file name)
+        results: Results to write (commit and timestamp are added)
+        path: Output file (default: benchmarks/results/<name>-<commit>.json)
+
+    Returns:
+        Path of the written file
+    """
+    revision = git_revision()
+    results = {
+        "benchmark": name,
+        "commit": revision,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        **results,
+    }
+
+    if not path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{revision}.json")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    return path
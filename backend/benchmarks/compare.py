@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files.
+
+Prints every latency summary (sections with p50/p95/p99) side by side with
+the relative change, and exits with status 1 if any percentile regressed by
+more than --threshold percent.
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/pipeline-abc123.json benchmarks/results/pipeline-def456.json
+"""
+
+import argparse
+import json
+import sys
+
+PERCENTILES = ("p50", "p95", "p99")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument("candidate", help="Candidate results JSON")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression, percent")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"Baseline:  {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"Candidate: {candidate.get('commit')} ({candidate.get('timestamp')})\n")
+
+    regressions = []
+
+    for section, before in baseline.items():
+        after = candidate.get(section)
+        if not isinstance(before, dict) or not isinstance(after, dict) or "p50" not in before:
+            continue
+
+        print(section)
+        for pct in PERCENTILES:
+            if pct not in after:
+                continue
+
+            change = (after[pct] - before[pct]) / before[pct] * 100 if before[pct] else 0.0
+            marker = ""
+            if change > args.threshold:
+                marker = "  ⚠ regression"
+                regressions.append(f"{section}.{pct}")
+
+            print(f"  {pct}: {before[pct]:>10.2f} -> {after[pct]:>10.2f}  ({change:+.1f}%){marker}")
+
+    if regressions:
+        print(f"\n❌ Regressed over {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Stub SMSC / WhatsApp / SMTP servers with injected latency.
+
+Accepts what the channel services send and answers like the real providers
+after a configurable delay, so benchmarks exercise the full send path
+without touching external APIs. Point the backend at the stubs:
+
+    SMSC_API_URL=http://127.0.0.1:8900/sys/send.php
+    WHATSAPP_API_URL=http://127.0.0.1:8900
+    SMTP_HOST=127.0.0.1 SMTP_PORT=8925 SMTP_USE_TLS=false
+
+Received message counters are served at GET /_stats. WhatsApp can be made
+slow or flaky (--whatsapp-latency-ms, --whatsapp-error-rate answered with
+503) to exercise circuit breakers and the orchestrator's fallback chain.
+
+Usage:
+    python benchmarks/stubs.py --latency-ms 50 --jitter-ms 20
+    python benchmarks/stubs.py --whatsapp-error-rate 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from http import HTTPStatus
+from typing import Tuple
+from urllib.parse import parse_qs
+
+logger = logging.getLogger("stubs")
+
+stats: Counter = Counter()
+
+# WhatsApp fault injection (extra latency, share of 503 responses)
+whatsapp_faults = {"latency_ms": 0.0, "error_rate": 0.0}
+
+
+class Latency:
+    """Injected response delay (base + uniform jitter)."""
+
+    def __init__(self, base_ms: float, jitter_ms: float):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+
+    async def wait(self) -> None:
+        delay = self.base_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+
+# ============================================
+# HTTP (SMSC.ru + WhatsApp Cloud API)
+# ============================================
+
+
+def route_http(method: str, path: str, body: bytes) -> Tuple[int, dict]:
+    """Build the provider response for a request."""
+    path = path.split("?", 1)[0]
+
+    if path == "/_stats":
+        return 200, dict(stats)
+
+    if method == "POST" and path.startswith("/sys/send.php"):
+        form = parse_qs(body.decode())
+        if "list" in form:
+            phones = [line.split(":", 1)[0] for line in form["list"][0].split("\n")]
+        else:
+            phones = form.get("phones", [""])[0].split(",")
+
+        stats["smsc"] += len(phones)
+        response = {"id": stats["smsc"], "cnt": len(phones), "cost": "0", "balance": "1000"}
+        if form.get("op") == ["1"]:
+            response["phones"] = [{"phone": phone, "status": "0", "cost": "0"} for phone in phones]
+        return 200, response
+
+    if path.startswith("/sys/balance.php"):
+        return 200, {"balance": "1000.00"}
+
+    if path.startswith("/sys/status.php"):
+        return 200, {"status": 1, "last_date": "", "last_timestamp": int(time.time())}
+
+    if method == "POST" and path.endswith("/messages"):
+        if random.random() < whatsapp_faults["error_rate"]:
+            stats["whatsapp_errors"] += 1
+            return 503, {"error": {"message": "Service temporarily unavailable", "code": 2}}
+
+        stats["whatsapp"] += 1
+        payload = json.loads(body or b"{}")
+        return 200, {
+            "messaging_product": "whatsapp",
+            "contacts": [{"input": payload.get("to"), "wa_id": payload.get("to")}],
+            "messages": [{"id": f"wamid.stub{stats['whatsapp']}"}],
+        }
+
+    return 404, {"error": f"No stub for {method} {path}"}
+
+
+async def handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: Latency) -> None:
+    """Serve HTTP/1.1 keep-alive requests on one connection."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            status, payload = route_http(method, path, body)
+            if path != "/_stats":
+                await latency.wait()
+            if path.endswith("/messages") and whatsapp_faults["latency_ms"]:
+                await asyncio.sleep(whatsapp_faults["latency_ms"] / 1000)
+
+            data = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"\r\n".encode() + data
+            )
+            await writer.drain()
+
+            if headers.get("connection", "").lower() == "close":
+                break
+
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+# ============================================
+# SMTP sink
+# ============================================
+
+
+async def handle_smtp(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    latency: Latency,
+    drop_after: int = 0,
+) -> None:
+    """Accept SMTP sessions and discard the messages.
+
+    With drop_after > 0 the session is closed with 421 after that many
+    messages, to exercise client reconnects.
+    """
+
+    async def reply(line: str) -> None:
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    received = 0
+
+    try:
+        await reply("220 stub ESMTP ready")
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            command = line.decode("latin-1").strip().upper()
+
+            if command.startswith("EHLO"):
+                writer.write(b"250-stub\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 AUTH PLAIN LOGIN\r\n")
+                await writer.drain()
+            elif command.startswith("HELO"):
+                await reply("250 stub")
+            elif command.startswith("AUTH"):
+                await reply("235 Authentication successful")
+            elif command.startswith("MAIL") and drop_after and received >= drop_after:
+                stats["smtp_dropped"] += 1
+                await reply("421 Too many messages, closing connection")
+                break
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                await reply("250 OK")
+            elif command == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                    pass
+                await latency.wait()
+                stats["smtp"] += 1
+                received += 1
+                await reply("250 OK queued")
+            elif command == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str, http_port: int, smtp_port: int, latency: Latency, smtp_drop_after: int = 0) -> None:
+    """Run HTTP and SMTP stubs until interrupted."""
+    http_server = await asyncio.start_server(
+        lambda r, w: handle_http(r, w, latency), host, http_port
+    )
+    smtp_server = await asyncio.start_server(
+        lambda r, w: handle_smtp(r, w, latency, smtp_drop_after), host, smtp_port
+    )
+
+    logger.info(
+        f"HTTP stub on http://{host}:{http_port}, SMTP stub on {host}:{smtp_port} "
+        f"(latency {latency.base_ms}ms + {latency.jitter_ms}ms jitter)"
+    )
+
+    async with http_server, smtp_server:
+        await asyncio.gather(http_server.serve_forever(), smtp_server.serve_forever())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--http-port", type=int, default=8900, help="SMSC/WhatsApp stub port")
+    parser.add_argument("--smtp-port", type=int, default=8925, help="SMTP stub port")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra random latency (0..N)")
+    parser.add_argument("--smtp-drop-after", type=int, default=0, help="Close SMTP sessions with 421 after N messages")
+    parser.add_argument("--whatsapp-latency-ms", type=float, default=0, help="Extra WhatsApp latency")
+    parser.add_argument("--whatsapp-error-rate", type=float, default=0, help="Share of WhatsApp sends answered with 503")
+    args = parser.parse_args()
+
+    whatsapp_faults["latency_ms"] = args.whatsapp_latency_ms
+    whatsapp_faults["error_rate"] = args.whatsapp_error_rate
+
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s: %(levelname)s/%(name)s] %(message)s")
+
+    try:
+        asyncio.run(serve(
+            args.host,
+            args.http_port,
+            args.smtp_port,
+            Latency(args.latency_ms, args.jitter_ms),
+            args.smtp_drop_after,
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -86,4 +86,32 @@ curl -X POST "${BASE_URL}/api/v1/leads" \
     }
   }' | jq
 
+echo -e "\n---\n"
+
+# Example 5: Batch import (e.g. from a partner CRM)
+echo "Creating leads in batch..."
+curl -X POST "${BASE_URL}/api/v1/leads/batch" \
+  -H "Content-Type: application/json" \
+  -H "X-Tenant-Id: 1" \
+  -d '{
+    "leads": [
+      {
+        "name": "Ольга Новикова",
+        "phone": "+79161112233",
+        "channel": "sms",
+        "utm": {"source": "vk_ads", "medium": "lead_form"}
+      },
+      {
+        "name": "Дмитрий Орлов",
+        "email": "dmitry@example.com",
+        "channel": "email",
+        "utm": {"source": "yandex_direct", "medium": "cpc"}
+      },
+      {
+        "name": "Без контактов",
+        "channel": "sms"
+      }
+    ]
+  }' | jq
+
 echo -e "\nDone! ✅"
@@ -4,23 +4,25 @@
 
 set -e
 
-echo "Starting Celery worker..."
+echo "Starting Celery workers..."
 
 # Activate virtual environment if exists
 if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
-# Run Celery worker
-celery -A app.core.celery_app:celery_app worker \
-    --loglevel=info \
-    --concurrency=4 \
-    --queues=leads,sms \
-    --hostname=worker@%h
+# Run one Celery worker per pool (all pools, or the ones given as arguments)
+exec python -m app.worker_launcher --loglevel=info "$@"
 
-# Options explained:
-# -A app.core.celery_app:celery_app - Celery app location
-# --loglevel=info - Logging level
-# --concurrency=4 - Number of worker processes
-# --queues=leads,sms - Queues to consume from
-# --hostname=worker@%h - Worker hostname
+# Pools (see WORKER_POOLS in app/core/celery_app.py):
+# contact    - first contact with new leads (threads)
+# sms        - SMS reminders, batches, status checks (threads)
+# email      - confirmations and batches (threads)
+# messengers - first contact via WhatsApp, Telegram, VK (threads)
+# calcom     - Cal.com calls (threads)
+# default    - maintenance tasks (prefork)
+#
+# Examples:
+# ./run_celery_worker.sh contact sms   - start selected pools only
+# ./run_celery_worker.sh --dry-run     - print the celery worker commands
+# CELERY_WORKER_POOLS='{"contact": {"concurrency": 100}}' - tune a pool
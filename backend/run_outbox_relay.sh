@@ -0,0 +1,21 @@
+#!/bin/bash
+
+# Fast Lead - Outbox Relay Startup Script (publishes queued tasks to Celery)
+
+set -e
+
+echo "Starting outbox relay..."
+
+# Activate virtual environment if exists
+if [ -d "venv" ]; then
+    source venv/bin/activate
+fi
+
+# Run outbox relay
+python -m app.outbox_relay
+
+# Notes:
+# - Leads and their orchestrator tasks are written in one transaction;
+#   this process publishes the tasks to the broker in batches
+# - Several relays can run at once (rows are claimed with SKIP LOCKED)
+# - Tuning: OUTBOX_BATCH_SIZE, OUTBOX_POLL_INTERVAL, OUTBOX_RETENTION_HOURS
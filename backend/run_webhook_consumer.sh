@@ -0,0 +1,23 @@
+#!/bin/bash
+
+# Fast Lead - Webhook Consumer Startup Script (applies queued webhook events)
+
+set -e
+
+echo "Starting webhook consumer..."
+
+# Activate virtual environment if exists
+if [ -d "venv" ]; then
+    source venv/bin/activate
+fi
+
+# Run webhook consumer
+python -m app.webhook_consumer "$@"
+
+# Notes:
+# - Webhook endpoints only verify and queue events (Redis streams); this
+#   process applies them, in order per booking, with retries
+# - Several consumers can run at once (partitions are leased, a stopped
+#   consumer's partitions are taken over)
+# - Failed events: ./run_webhook_consumer.sh --replay-dead-letters 100
+# - Tuning: WEBHOOK_STREAM_PARTITIONS, WEBHOOK_MAX_ATTEMPTS, WEBHOOK_RETRY_BACKOFF
@@ -0,0 +1,80 @@
+"""AsyncSMTPEngine against the local SMTP sink (benchmarks/stubs.py)."""
+
+import asyncio
+from email.message import EmailMessage
+
+import pytest
+
+from app.core.async_smtp import AsyncSMTPEngine, SMTPHostConfig
+from benchmarks.stubs import Latency, handle_smtp, stats
+
+
+@pytest.fixture
+def smtp_sink(event_loop):
+    """Start SMTP sinks on free ports; yields a factory taking ``drop_after``."""
+    servers = []
+
+    async def start(drop_after: int = 0) -> SMTPHostConfig:
+        server = await asyncio.start_server(
+            lambda r, w: handle_smtp(r, w, Latency(0, 0), drop_after), "127.0.0.1", 0
+        )
+        servers.append(server)
+        port = server.sockets[0].getsockname()[1]
+        return SMTPHostConfig(host="127.0.0.1", port=port, use_tls=False, timeout=5.0)
+
+    yield start
+
+    for server in servers:
+        server.close()
+        event_loop.run_until_complete(server.wait_closed())
+
+
+def make_messages(count: int):
+    messages = []
+    for i in range(count):
+        msg = EmailMessage()
+        msg["From"] = "noreply@fast-lead.ru"
+        msg["To"] = f"lead{i}@example.com"
+        msg["Subject"] = f"Message {i}"
+        msg.set_content("Hello")
+        messages.append(msg)
+    return messages
+
+
+async def test_send_many_delivers_all_messages(smtp_sink):
+    config = await smtp_sink()
+    engine = AsyncSMTPEngine(max_connections_per_host=3)
+    before = stats["smtp"]
+
+    errors = await engine.send_many(make_messages(10), config)
+    await engine.aclose()
+
+    assert errors == [None] * 10
+    assert stats["smtp"] - before == 10
+
+
+async def test_sessions_are_reused(smtp_sink):
+    config = await smtp_sink()
+    engine = AsyncSMTPEngine(max_connections_per_host=1)
+
+    for msg in make_messages(3):
+        await engine.send(msg, config)
+
+    pool = engine.get_pool(config)
+    assert len(pool._idle) == 1
+    assert pool._idle[0].messages_sent == 3
+    await engine.aclose()
+
+
+async def test_reconnects_after_server_drops_session(smtp_sink):
+    # The sink answers 421 and closes the session after every 2 messages
+    config = await smtp_sink(drop_after=2)
+    engine = AsyncSMTPEngine(max_connections_per_host=1)
+    before, dropped_before = stats["smtp"], stats["smtp_dropped"]
+
+    for msg in make_messages(5):
+        await engine.send(msg, config)
+    await engine.aclose()
+
+    assert stats["smtp"] - before == 5
+    assert stats["smtp_dropped"] - dropped_before == 2
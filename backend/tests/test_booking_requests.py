@@ -0,0 +1,52 @@
+"""Asynchronous booking requests: outcome storage and waiter wake-ups."""
+
+import asyncio
+
+from app.services import booking_requests as booking_requests_module
+from app.services.booking_requests import FAILED, PENDING, SUCCEEDED, BookingRequests
+
+
+async def test_finish_stores_outcome(redis):
+    requests = BookingRequests()
+    request = await requests.create(lead_id=1)
+    assert request["status"] == PENDING
+
+    await requests.finish(request["request_id"], booking={"booking_id": 5})
+    assert (await requests.get(request["request_id"]))["status"] == SUCCEEDED
+
+    failed = await requests.create(lead_id=2)
+    await requests.finish(failed["request_id"], error="Slot taken", error_status=409)
+    record = await requests.get(failed["request_id"])
+    assert record["status"] == FAILED
+    assert record["error_status"] == 409
+
+
+async def test_wait_returns_on_done_message(redis, monkeypatch):
+    # Without a wake-up the waiter would only notice on its next poll
+    monkeypatch.setattr(booking_requests_module, "POLL_INTERVAL", 10.0)
+    requests = BookingRequests()
+    request_id = (await requests.create(lead_id=1))["request_id"]
+
+    waiter = asyncio.create_task(requests.wait(request_id, timeout=10.0))
+    await asyncio.sleep(0.05)
+    await requests.finish(request_id, booking={"booking_id": 5})
+    requests._wake(request_id)
+
+    record = await asyncio.wait_for(waiter, 1.0)
+    assert record["status"] == SUCCEEDED
+    assert not requests._waiters
+
+
+async def test_reconnect_wakes_all_waiters(redis, monkeypatch):
+    monkeypatch.setattr(booking_requests_module, "POLL_INTERVAL", 10.0)
+    requests = BookingRequests()
+    request_ids = [(await requests.create(lead_id=i))["request_id"] for i in range(3)]
+
+    waiters = [asyncio.create_task(requests.wait(r, timeout=10.0)) for r in request_ids]
+    await asyncio.sleep(0.05)
+    for request_id in request_ids:
+        await requests.finish(request_id, booking={})
+    requests._wake_all()
+
+    records = await asyncio.wait_for(asyncio.gather(*waiters), 1.0)
+    assert [r["status"] for r in records] == [SUCCEEDED] * 3
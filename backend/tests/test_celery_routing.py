@@ -0,0 +1,52 @@
+"""Queue topology: routes, worker pools and contact attempt queues."""
+
+from unittest import mock
+
+import pytest
+
+from app.core.celery_app import (
+    CHANNEL_QUEUES,
+    PRIORITY_FIRST_CONTACT,
+    QUEUES,
+    TASK_ROUTES,
+    celery_app,
+    get_worker_pools,
+)
+from app.tasks import lead_tasks
+
+
+def consumed_queues():
+    return {queue for pool in get_worker_pools().values() for queue in pool["queues"]}
+
+
+def test_every_queue_has_a_worker_pool():
+    assert consumed_queues() == set(QUEUES)
+
+
+def test_routes_and_channel_queues_are_declared():
+    declared = {queue.name for queue in celery_app.conf.task_queues}
+    assert {queue for queue, _ in TASK_ROUTES.values()} <= declared
+    assert set(CHANNEL_QUEUES.values()) <= declared
+
+
+def test_messenger_pool_is_separate_from_contact():
+    pools = get_worker_pools()
+    messenger_pools = {
+        name for name, pool in pools.items()
+        if set(pool["queues"]) & set(CHANNEL_QUEUES.values())
+    }
+    assert "contact" not in messenger_pools
+
+
+@pytest.mark.parametrize("channel, queue", [
+    ("whatsapp", "whatsapp"),
+    ("telegram", "telegram"),
+    ("vk", "vk"),
+    ("sms", "contact"),
+    ("email", "contact"),
+])
+def test_contact_attempt_goes_to_channel_queue(channel, queue):
+    with mock.patch.object(lead_tasks.attempt_contact_task, "apply_async") as apply_async:
+        lead_tasks._enqueue_attempt(1, 2, channel)
+
+    apply_async.assert_called_once_with((1, 2), queue=queue, priority=PRIORITY_FIRST_CONTACT)
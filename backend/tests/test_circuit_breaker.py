@@ -0,0 +1,129 @@
+"""Circuit breaker scripts and the recording transport."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import circuit_breaker as breaker_module
+from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerTransport, CircuitOpen
+from app.core.config import settings
+
+
+@pytest.fixture
+def breaker(redis, monkeypatch):
+    monkeypatch.setattr(settings, "circuit_breaker_enabled", True)
+    monkeypatch.setattr(settings, "circuit_breaker_failure_threshold", 3)
+    monkeypatch.setattr(settings, "circuit_breaker_failure_window", 60.0)
+    monkeypatch.setattr(settings, "circuit_breaker_open_seconds", 0.2)
+    monkeypatch.setattr(settings, "circuit_breaker_max_open_seconds", 10.0)
+    monkeypatch.setattr(settings, "circuit_breaker_probe_timeout", 5.0)
+    return CircuitBreaker()
+
+
+async def trip(breaker: CircuitBreaker, provider: str = "smsc") -> None:
+    for _ in range(settings.circuit_breaker_failure_threshold):
+        await breaker.record_failure(provider)
+
+
+async def test_opens_after_threshold_failures(breaker):
+    for _ in range(2):
+        await breaker.record_failure("smsc")
+    await breaker.check("smsc")
+
+    await breaker.record_failure("smsc")
+
+    with pytest.raises(CircuitOpen) as exc_info:
+        await breaker.check("smsc")
+    assert 0 < exc_info.value.retry_after <= 0.2
+    assert (await breaker.get_state("smsc"))["state"] == "open"
+    # Other providers are unaffected
+    await breaker.check("telegram")
+
+
+async def test_success_resets_failure_count(breaker):
+    for _ in range(2):
+        await breaker.record_failure("smsc")
+    await breaker.record_success("smsc")
+    for _ in range(2):
+        await breaker.record_failure("smsc")
+
+    await breaker.check("smsc")
+
+
+async def test_half_open_lets_one_probe_through(breaker):
+    await trip(breaker)
+    await asyncio.sleep(0.25)
+
+    assert (await breaker.get_state("smsc"))["state"] == "half_open"
+    await breaker.check("smsc")
+    with pytest.raises(CircuitOpen):
+        await breaker.check("smsc")
+
+    await breaker.record_success("smsc")
+
+    assert await breaker.get_state("smsc") == {
+        "state": "closed", "failures": 0, "trips": 0, "retry_in": None,
+    }
+    await breaker.check("smsc")
+
+
+async def test_failed_probe_reopens_for_longer(breaker, redis):
+    await trip(breaker)
+    await asyncio.sleep(0.25)
+    await breaker.check("smsc")
+
+    # A single failure in half-open state is enough
+    await breaker.record_failure("smsc")
+
+    state = await breaker.get_state("smsc")
+    assert state["state"] == "open"
+    assert state["trips"] == 2
+    assert 200 < await redis.pttl(breaker_module.OPEN_KEY.format("smsc")) <= 400
+
+
+async def test_stays_closed_without_redis(breaker, monkeypatch):
+    def unavailable():
+        raise ConnectionError("Redis down")
+
+    await trip(breaker)
+    monkeypatch.setattr(breaker_module, "get_redis", unavailable)
+    breaker._scripts = None
+
+    await breaker.check("smsc")
+
+
+def transport_for(breaker, handler) -> httpx.AsyncClient:
+    transport = CircuitBreakerTransport("smsc", httpx.MockTransport(handler), breaker)
+    return httpx.AsyncClient(transport=transport)
+
+
+async def test_transport_records_server_errors_and_transport_errors(breaker):
+    async def handler(request):
+        if request.url.path == "/down":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(503 if request.url.path == "/error" else 200)
+
+    async with transport_for(breaker, handler) as client:
+        await client.get("http://smsc.test/ok")
+        await client.get("http://smsc.test/error")
+        await client.get("http://smsc.test/error")
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://smsc.test/down")
+
+    with pytest.raises(CircuitOpen):
+        await breaker.check("smsc")
+
+
+async def test_transport_records_cancelled_calls(breaker):
+    async def hang(request):
+        await asyncio.sleep(60)
+
+    async with transport_for(breaker, hang) as client:
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get("http://smsc.test/"), 0.01)
+        await asyncio.sleep(0.01)
+
+    with pytest.raises(CircuitOpen):
+        await breaker.check("smsc")
@@ -0,0 +1,144 @@
+"""Idempotency-Key middleware: lock, renewal and replays."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core import idempotency
+from app.core.config import settings
+from app.core.idempotency import LOCK_KEY, RENEW_SCRIPT, IdempotencyMiddleware
+
+PATH = f"{settings.api_v1_prefix}/leads"
+
+
+class Endpoint:
+    """ASGI app creating a "lead" per call, optionally slowly."""
+
+    def __init__(self, delay: float = 0, status: int = 201):
+        self.delay = delay
+        self.status = status
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        body = (await receive())["body"]
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        payload = json.dumps({"id": self.calls, "request": json.loads(body)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": self.status,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+
+def client_for(endpoint) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=IdempotencyMiddleware(endpoint))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def post(client, body: dict, key: str = "key-1"):
+    return client.post(PATH, json=body, headers={"Idempotency-Key": key, "X-Tenant-Id": "1"})
+
+
+async def test_retry_replays_stored_response(redis):
+    endpoint = Endpoint()
+
+    async with client_for(endpoint) as client:
+        first = await post(client, {"phone": "1"})
+        retry = await post(client, {"phone": "1"})
+        other_key = await post(client, {"phone": "1"}, key="key-2")
+
+    assert endpoint.calls == 2
+    assert retry.status_code == first.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert other_key.json()["id"] == 2
+
+
+async def test_key_reused_with_other_body_is_rejected(redis):
+    async with client_for(Endpoint()) as client:
+        await post(client, {"phone": "1"})
+        response = await post(client, {"phone": "2"})
+
+    assert response.status_code == 422
+
+
+async def test_lock_is_renewed_while_handler_runs(redis, monkeypatch):
+    # The handler outlives the lock TTL several times over
+    monkeypatch.setattr(settings, "idempotency_lock_ttl", 0.2)
+    endpoint = Endpoint(delay=1.0)
+
+    async with client_for(endpoint) as client:
+        first = asyncio.create_task(post(client, {"phone": "1"}))
+        await asyncio.sleep(0.5)
+        concurrent = await post(client, {"phone": "1"})
+        first = await first
+        retry = await post(client, {"phone": "1"})
+
+    assert endpoint.calls == 1
+    assert first.status_code == 201
+    assert concurrent.status_code == 409
+    assert retry.json() == first.json()
+    assert await redis.keys(LOCK_KEY.format("*")) == []
+
+
+async def test_concurrent_retry_waits_for_response(redis):
+    endpoint = Endpoint(delay=0.2)
+
+    async with client_for(endpoint) as client:
+        first, concurrent = await asyncio.gather(
+            post(client, {"phone": "1"}),
+            post(client, {"phone": "1"}),
+        )
+
+    assert endpoint.calls == 1
+    assert concurrent.json() == first.json()
+    assert concurrent.headers["idempotent-replayed"] == "true"
+
+
+async def test_server_errors_are_not_stored(redis):
+    endpoint = Endpoint(status=503)
+
+    async with client_for(endpoint) as client:
+        await post(client, {"phone": "1"})
+        retry = await post(client, {"phone": "1"})
+
+    assert endpoint.calls == 2
+    assert "idempotent-replayed" not in retry.headers
+
+
+async def test_renew_only_extends_own_lock(redis):
+    renew = redis.register_script(RENEW_SCRIPT)
+    await redis.set("lock", "ours", px=1000)
+
+    assert await renew(keys=["lock"], args=["theirs", 60000]) == 0
+    assert await redis.pttl("lock") <= 1000
+    assert await renew(keys=["lock"], args=["ours", 60000]) == 1
+    assert await redis.pttl("lock") > 1000
+    assert await renew(keys=["missing"], args=["ours", 60000]) == 0
+
+
+async def test_runs_request_without_redis(monkeypatch):
+    def unavailable():
+        raise ConnectionError("Redis down")
+
+    monkeypatch.setattr(idempotency, "get_redis", unavailable)
+    endpoint = Endpoint()
+
+    async with client_for(endpoint) as client:
+        first = await post(client, {"phone": "1"})
+        retry = await post(client, {"phone": "1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert endpoint.calls == 2
+
+
+@pytest.mark.parametrize("key", ["", "x" * 256])
+async def test_invalid_key_is_rejected(redis, key):
+    async with client_for(Endpoint()) as client:
+        response = await post(client, {"phone": "1"}, key=key)
+
+    assert response.status_code == 400
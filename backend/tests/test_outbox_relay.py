@@ -0,0 +1,99 @@
+"""Outbox relay: publishing, retries and dead rows."""
+
+from contextlib import contextmanager
+
+import pytest
+from kombu.exceptions import OperationalError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models.outbox import OutboxMessage
+from app.services import outbox_service
+from app.services.outbox_service import OutboxRelay
+
+
+@pytest.fixture
+def session_maker(event_loop, monkeypatch):
+    """SQLite database with the outbox table, used by the relay."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: OutboxMessage.__table__.create(sync_conn))
+
+    event_loop.run_until_complete(create())
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(outbox_service, "async_session_maker", maker)
+    yield maker
+    event_loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """Fake broker: records sent tasks, raises what ``errors`` maps a task name to."""
+    state = {"sent": [], "errors": {}}
+
+    def send_task(name, args=None, kwargs=None, producer=None, **options):
+        if name in state["errors"]:
+            raise state["errors"][name]
+        state["sent"].append((name, args))
+
+    @contextmanager
+    def producer_or_acquire():
+        yield None
+
+    monkeypatch.setattr(outbox_service.celery_app, "send_task", send_task)
+    monkeypatch.setattr(outbox_service.celery_app, "producer_or_acquire", producer_or_acquire)
+    return state
+
+
+async def add_rows(session_maker, *task_names):
+    async with session_maker() as session:
+        await session.execute(
+            insert(OutboxMessage),
+            [{"task_name": name, "args": [i]} for i, name in enumerate(task_names)],
+        )
+        await session.commit()
+
+
+async def get_rows(session_maker):
+    async with session_maker() as session:
+        return (await session.execute(select(OutboxMessage).order_by(OutboxMessage.id))).scalars().all()
+
+
+async def test_publishes_pending_rows(session_maker, broker):
+    await add_rows(session_maker, "process_new_lead", "create_booking")
+
+    assert await OutboxRelay(batch_size=10).relay_batch() == 2
+    assert await OutboxRelay(batch_size=10).relay_batch() == 0
+
+    assert broker["sent"] == [("process_new_lead", [0]), ("create_booking", [1])]
+    assert all(row.published_at for row in await get_rows(session_maker))
+
+
+async def test_failing_row_is_marked_dead_after_max_attempts(session_maker, broker, monkeypatch):
+    monkeypatch.setattr(settings, "outbox_max_attempts", 3)
+    broker["errors"]["poison"] = TypeError("Object of type set is not JSON serializable")
+    await add_rows(session_maker, "poison", "process_new_lead")
+    relay = OutboxRelay(batch_size=10)
+
+    for _ in range(5):
+        await relay.relay_batch()
+
+    poison, good = await get_rows(session_maker)
+    assert poison.attempts == 3
+    assert poison.dead_at is not None and poison.published_at is None
+    assert "not JSON serializable" in poison.last_error
+    assert good.published_at is not None
+    assert broker["sent"] == [("process_new_lead", [1])]
+
+
+async def test_broker_outage_does_not_charge_attempts(session_maker, broker):
+    broker["errors"]["process_new_lead"] = OperationalError("Connection refused")
+    await add_rows(session_maker, "process_new_lead")
+
+    assert await OutboxRelay(batch_size=10).relay_batch() == 0
+
+    (row,) = await get_rows(session_maker)
+    assert row.attempts == 0 and row.dead_at is None
@@ -0,0 +1,154 @@
+"""Rate limiting: Redis token buckets, local fallback and client IPs."""
+
+import ipaddress
+import json
+import time
+
+import httpx
+import pytest
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import (
+    LocalTokenBuckets,
+    RateLimiter,
+    RateLimitMiddleware,
+    client_ip,
+    normalize_phone,
+    per_minute,
+)
+
+
+class Clock:
+    """Stand-in for the ``time`` module of rate_limit."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+async def test_bucket_allows_capacity_then_limits(redis, clock):
+    limiter = RateLimiter()
+    bucket = [per_minute("phone:1", 3)]
+
+    assert [await limiter.acquire(bucket) for _ in range(3)] == [0, 0, 0]
+    # One token per 20s
+    assert await limiter.acquire(bucket) == pytest.approx(20, abs=0.01)
+
+    clock.now += 20
+    assert await limiter.acquire(bucket) == 0
+
+
+async def test_denied_request_consumes_no_tokens(redis, clock):
+    limiter = RateLimiter()
+    tenant, phone = per_minute("tenant:1", 10), per_minute("phone:1", 1)
+
+    assert await limiter.acquire([tenant, phone]) == 0
+    for _ in range(5):
+        assert await limiter.acquire([tenant, phone]) > 0
+
+    # Only the allowed request took a tenant token
+    tokens = float(await redis.hget(rate_limit.KEY_PREFIX + "tenant:1", "tokens"))
+    assert tokens == pytest.approx(9)
+
+
+async def test_buckets_are_shared_between_limiters(redis, clock):
+    bucket = [per_minute("ip:10.0.0.1", 2)]
+
+    assert await RateLimiter().acquire(bucket) == 0
+    assert await RateLimiter().acquire(bucket) == 0
+    assert await RateLimiter().acquire(bucket) > 0
+
+
+async def test_falls_back_to_local_buckets_without_redis(clock, monkeypatch):
+    def unavailable():
+        raise ConnectionError("Redis down")
+
+    monkeypatch.setattr(rate_limit, "get_redis", unavailable)
+    limiter = RateLimiter()
+    bucket = [per_minute("phone:1", 2)]
+
+    assert await limiter.acquire(bucket) == 0
+    assert await limiter.acquire(bucket) == 0
+    assert await limiter.acquire(bucket) == pytest.approx(30)
+
+
+def test_local_buckets_refill(clock):
+    buckets = LocalTokenBuckets()
+    bucket = [per_minute("phone:1", 1)]
+
+    assert buckets.acquire(bucket) == 0
+    assert buckets.acquire(bucket) == pytest.approx(60)
+    clock.now += 60
+    assert buckets.acquire(bucket) == 0
+
+
+@pytest.mark.parametrize("phone, normalized", [
+    ("+7 (999) 123-45-67", "79991234567"),
+    ("8 999 123 45 67", "79991234567"),
+    ("12-34", None),
+])
+def test_normalize_phone(phone, normalized):
+    assert normalize_phone(phone) == normalized
+
+
+PROXIES = [ipaddress.ip_network("10.0.0.0/8")]
+
+
+@pytest.mark.parametrize("peer, forwarded, expected", [
+    # Untrusted peers can't choose their address
+    ("203.0.113.5", "1.2.3.4", "203.0.113.5"),
+    # Right-most address not belonging to a proxy
+    ("10.0.0.2", "1.2.3.4, 198.51.100.7", "198.51.100.7"),
+    ("10.0.0.2", "1.2.3.4, 198.51.100.7, 10.0.0.3", "198.51.100.7"),
+    # Only proxies: the left-most one
+    ("10.0.0.2", "10.0.0.4, 10.0.0.3", "10.0.0.4"),
+    ("10.0.0.2", "", "10.0.0.2"),
+])
+def test_client_ip_behind_trusted_proxies(peer, forwarded, expected):
+    headers = {"x-forwarded-for": forwarded} if forwarded else {}
+    assert client_ip({"client": (peer, 1234)}, headers, PROXIES) == expected
+
+
+def test_client_ip_ignores_forwarded_without_trusted_proxies():
+    assert client_ip({"client": ("10.0.0.2", 1)}, {"x-forwarded-for": "1.2.3.4"}, []) == "10.0.0.2"
+
+
+async def test_middleware_answers_429_with_retry_after(redis, clock, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 0)
+    monkeypatch.setattr(settings, "rate_limit_per_phone_per_minute", 1)
+
+    async def endpoint(scope, receive, send):
+        body = await receive()
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": body["body"]})
+
+    app = RateLimitMiddleware(endpoint)
+    transport = httpx.ASGITransport(app=app)
+    lead = json.dumps({"phone": "+79991234567"})
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post(f"{settings.api_v1_prefix}/leads", content=lead)
+        second = await client.post(f"{settings.api_v1_prefix}/leads", content=lead)
+        other_phone = await client.post(
+            f"{settings.api_v1_prefix}/leads", content=json.dumps({"phone": "+79990000000"})
+        )
+
+    assert first.status_code == 201
+    assert first.content == lead.encode()  # body replayed to the endpoint
+    assert second.status_code == 429
+    assert second.headers["retry-after"] == "60"
+    assert other_phone.status_code == 201
@@ -0,0 +1,152 @@
+"""Shared pub/sub subscription against a minimal RESP server."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from app.core import redis as redis_module
+from app.core.config import settings
+
+
+def encode(*items: str) -> bytes:
+    """Encode a RESP array of bulk strings (integers given as ints)."""
+    out = f"*{len(items)}\r\n"
+    for item in items:
+        if isinstance(item, int):
+            out += f":{item}\r\n"
+        else:
+            out += f"${len(item.encode())}\r\n{item}\r\n"
+    return out.encode()
+
+
+class PubSubServer:
+    """Just enough Redis for SUBSCRIBE, PING and PUBLISH to subscribers."""
+
+    def __init__(self):
+        self.connections = 0
+        self.writers: List[asyncio.StreamWriter] = []
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"redis://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/0"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+
+                command = args[0].upper()
+                if command == "SUBSCRIBE":
+                    self.writers.append(writer)
+                    writer.write(encode("subscribe", args[1], 1))
+                elif command == "PING" and writer in self.writers:
+                    writer.write(encode("pong", args[1] if len(args) > 1 else ""))
+                elif command == "PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if writer in self.writers:
+                self.writers.remove(writer)
+            writer.close()
+
+    async def publish(self, channel: str, data: str) -> None:
+        for writer in self.writers:
+            writer.write(encode("message", channel, data))
+            await writer.drain()
+
+    def drop_connections(self) -> None:
+        for writer in list(self.writers):
+            writer.transport.abort()
+
+    def close(self) -> None:
+        self.drop_connections()
+        self.server.close()
+
+
+@pytest.fixture
+def pubsub_server(event_loop, monkeypatch):
+    server = PubSubServer()
+    monkeypatch.setattr(settings, "redis_url", event_loop.run_until_complete(server.start()))
+    monkeypatch.setattr(settings, "redis_socket_timeout", 0.1)
+    monkeypatch.setattr(redis_module, "PUBSUB_RECONNECT_DELAY", 0.05)
+    yield server
+    server.close()
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def stop(task: asyncio.Task) -> None:
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_idle_subscription_is_kept(pubsub_server):
+    received, reconnects = [], []
+    listener = asyncio.create_task(redis_module.subscribe(
+        "test", received.append, on_reconnect=lambda: reconnects.append(1)
+    ))
+    try:
+        await wait_for(lambda: pubsub_server.writers)
+
+        # Idle far longer than the socket timeout of the shared client
+        await asyncio.sleep(1.0)
+        assert pubsub_server.connections == 1
+        assert reconnects == []
+
+        await pubsub_server.publish("test", "42")
+        await wait_for(lambda: received == ["42"])
+    finally:
+        await stop(listener)
+
+
+async def test_resubscribes_after_disconnect(pubsub_server):
+    received, reconnects = [], []
+    listener = asyncio.create_task(redis_module.subscribe(
+        "test", received.append, on_reconnect=lambda: reconnects.append(1)
+    ))
+    try:
+        await wait_for(lambda: pubsub_server.writers)
+        pubsub_server.drop_connections()
+
+        await wait_for(lambda: reconnects == [1] and pubsub_server.writers)
+        await pubsub_server.publish("test", "7")
+        await wait_for(lambda: received == ["7"])
+    finally:
+        await stop(listener)
+
+
+async def test_handler_error_does_not_drop_subscription(pubsub_server):
+    received = []
+
+    def handle(data: str) -> None:
+        if data == "bad":
+            raise ValueError(data)
+        received.append(data)
+
+    listener = asyncio.create_task(redis_module.subscribe("test", handle))
+    try:
+        await wait_for(lambda: pubsub_server.writers)
+        await pubsub_server.publish("test", "bad")
+        await pubsub_server.publish("test", "good")
+        await wait_for(lambda: received == ["good"])
+        assert pubsub_server.connections == 1
+    finally:
+        await stop(listener)
@@ -0,0 +1,84 @@
+"""Single-flight coalescing within and across processes."""
+
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SharedCallError, SingleFlight
+from app.services import calcom_service
+from app.services.calcom_service import CalcomService, CalcomServiceError, CalcomUnavailable
+
+
+async def test_concurrent_calls_run_once():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+
+
+async def test_shared_result_is_reused_by_other_process(redis):
+    leader, waiter = SingleFlight("test"), SingleFlight("test")
+
+    async def fetch():
+        return {"slots": [1, 2]}
+
+    async def unexpected():
+        raise AssertionError("waiter called upstream")
+
+    assert await leader.do("key", fetch, shared=True) == {"slots": [1, 2]}
+    assert await waiter.do("key", unexpected, shared=True) == {"slots": [1, 2]}
+
+
+async def test_shared_error_keeps_type_and_retry_after(redis):
+    leader, waiter = SingleFlight("test"), SingleFlight("test")
+
+    async def fail():
+        raise CalcomUnavailable(12)
+
+    with pytest.raises(CalcomUnavailable):
+        await leader.do("key", fail, shared=True)
+
+    with pytest.raises(SharedCallError) as info:
+        await waiter.do("key", fail, shared=True)
+    assert info.value.error_type == "CalcomUnavailable"
+    assert info.value.retry_after == 12
+
+
+async def test_calcom_waiters_fail_fast_when_leader_circuit_is_open(redis, monkeypatch):
+    leader = SingleFlight("calcom")
+
+    async def fail():
+        raise CalcomUnavailable(12)
+
+    with pytest.raises(CalcomUnavailable):
+        await leader.do("booking:1", fail, shared=True)
+
+    # Another process joins the failed call
+    monkeypatch.setattr(calcom_service, "calcom_reads", SingleFlight("calcom"))
+    with pytest.raises(CalcomUnavailable) as info:
+        await CalcomService()._coalesce("booking:1", fail)
+    assert info.value.retry_after == 12
+
+
+async def test_calcom_waiters_get_generic_error_for_other_failures(redis, monkeypatch):
+    leader = SingleFlight("calcom")
+
+    async def fail():
+        raise CalcomServiceError("HTTP 500")
+
+    with pytest.raises(CalcomServiceError):
+        await leader.do("booking:1", fail, shared=True)
+
+    monkeypatch.setattr(calcom_service, "calcom_reads", SingleFlight("calcom"))
+    with pytest.raises(CalcomServiceError) as info:
+        await CalcomService()._coalesce("booking:1", fail)
+    assert not isinstance(info.value, CalcomUnavailable)
@@ -0,0 +1,127 @@
+"""Slot index scripts: holds, bookings and availability sync."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import slot_index as slot_index_module
+from app.services.slot_index import HOLD_KEY, SlotIndex, SlotUnavailable
+
+EVENT = 7
+SLOT = "2030-05-14T10:00:00Z"
+
+
+@pytest.fixture
+def index(redis, monkeypatch):
+    monkeypatch.setattr(settings, "slot_index_enabled", True)
+    monkeypatch.setattr(settings, "slot_hold_ttl", 30)
+    return SlotIndex()
+
+
+async def test_concurrent_holds_of_one_slot(index):
+    results = await asyncio.gather(
+        index.hold(EVENT, SLOT),
+        # Same instant in another timezone
+        index.hold(EVENT, "2030-05-14T13:00:00+03:00"),
+        return_exceptions=True,
+    )
+
+    assert sum(isinstance(r, SlotUnavailable) for r in results) == 1
+    error = next(r for r in results if isinstance(r, SlotUnavailable))
+    assert error.reason == "held by another booking"
+    # Other event types and slots are independent
+    assert await index.hold(EVENT + 1, SLOT) is not None
+    assert await index.hold(EVENT, "2030-05-14T10:30:00Z") is not None
+
+
+async def test_confirmed_slot_is_booked(index, redis):
+    hold = await index.hold(EVENT, SLOT)
+    await index.confirm(hold)
+
+    assert not await redis.exists(HOLD_KEY.format(EVENT, SLOT))
+    with pytest.raises(SlotUnavailable) as exc_info:
+        await index.hold(EVENT, SLOT)
+    assert exc_info.value.reason == "booked"
+
+
+async def test_release_frees_only_own_hold(index):
+    stale = await index.hold(EVENT, SLOT)
+    await index.release(stale)
+    current = await index.hold(EVENT, SLOT)
+
+    # Releasing a hold again must not drop the hold taken since
+    await index.release(stale)
+    with pytest.raises(SlotUnavailable):
+        await index.hold(EVENT, SLOT)
+
+    await index.release(current)
+    assert await index.hold(EVENT, SLOT) is not None
+
+
+async def test_renew_extends_or_retakes_hold(index, redis):
+    key = HOLD_KEY.format(EVENT, SLOT)
+    hold = await index.hold(EVENT, SLOT)
+
+    await index.renew(hold, 120)
+    assert await redis.pttl(key) > 30_000
+
+    await redis.delete(key)  # expired
+    await index.renew(hold, 60)
+    assert await redis.get(key) == hold.token
+
+    await redis.delete(key)
+    await index.hold(EVENT, SLOT)
+    with pytest.raises(SlotUnavailable):
+        await index.renew(hold, 60)
+
+
+async def test_synced_day_allows_only_offered_slots(index):
+    await index.sync(
+        EVENT,
+        "2030-05-13",
+        "2030-05-16",
+        [
+            {"time": SLOT},
+            {"time": "2030-05-15T09:00:00Z", "available": False},
+            {"time": "2030-05-16T09:00:00Z"},
+        ],
+    )
+
+    assert await index.hold(EVENT, SLOT) is not None
+    for slot in ("2030-05-14T11:00:00Z", "2030-05-15T09:00:00Z"):
+        with pytest.raises(SlotUnavailable) as exc_info:
+            await index.hold(EVENT, slot)
+        assert exc_info.value.reason == "unavailable"
+    # Edge days of the range stay unknown
+    assert await index.hold(EVENT, "2030-05-13T08:00:00Z") is not None
+    assert await index.hold(EVENT, "2030-05-16T08:00:00Z") is not None
+
+
+async def test_sync_clears_slots_offered_again(index):
+    await index.mark_booked(EVENT, SLOT)
+    await index.sync(EVENT, "2030-05-13", "2030-05-15", [{"time": SLOT}])
+
+    assert await index.hold(EVENT, SLOT) is not None
+
+
+async def test_mark_free_forgets_booking_and_day(index):
+    await index.sync(EVENT, "2030-05-13", "2030-05-15", [{"time": "2030-05-14T11:00:00Z"}])
+    await index.mark_booked(EVENT, SLOT)
+    with pytest.raises(SlotUnavailable):
+        await index.hold(EVENT, SLOT)
+
+    await index.mark_free(EVENT, SLOT)
+
+    assert await index.hold(EVENT, SLOT) is not None
+
+
+async def test_bookings_skip_holds_without_redis(index, monkeypatch):
+    def unavailable():
+        raise ConnectionError("Redis down")
+
+    monkeypatch.setattr(slot_index_module, "get_redis", unavailable)
+
+    assert await index.hold(EVENT, SLOT) is None
+    await index.confirm(None)
+    await index.mark_booked(EVENT, SLOT)
@@ -0,0 +1,71 @@
+"""SMS batch sending: mapping SMSC per-recipient results."""
+
+from unittest import mock
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from app.services import sms_service
+from app.services.sms_service import SMSService
+
+
+@pytest.fixture
+def smsc(monkeypatch):
+    """Stub SMSC answering with the "phones" entries built by ``respond``."""
+    state = {"respond": lambda phones: [{"phone": p, "status": "0"} for p in phones]}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        form = parse_qs(request.content.decode())
+        if "list" in form:
+            phones = [line.split(":", 1)[0] for line in form["list"][0].split("\n")]
+        else:
+            phones = form["phones"][0].split(",")
+        return httpx.Response(200, json={"id": 77, "cnt": len(phones), "phones": state["respond"](phones)})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    monkeypatch.setattr(sms_service, "get_http_client", lambda provider: client)
+    monkeypatch.setattr(sms_service.rate_governor, "acquire", mock.AsyncMock())
+    return state
+
+
+def batch(count: int, text: str = "Reminder"):
+    return [{"phone": f"+7999000000{i}", "message": text} for i in range(count)]
+
+
+async def test_all_recipients_sent(smsc):
+    results = await SMSService().send_sms_batch(batch(3))
+
+    assert [r["success"] for r in results] == [True] * 3
+    assert {r["message_id"] for r in results} == {77}
+
+
+async def test_phones_in_response_are_matched_by_digits(smsc):
+    smsc["respond"] = lambda phones: [{"phone": f"+{p}", "status": "0"} for p in phones]
+
+    results = await SMSService().send_sms_batch(batch(2))
+
+    assert [r["success"] for r in results] == [True, True]
+
+
+async def test_recipients_missing_from_response_are_retryable(smsc):
+    # Truncated response: the last recipient has no entry
+    smsc["respond"] = lambda phones: [{"phone": p, "status": "0"} for p in phones[:-1]]
+
+    results = await SMSService().send_sms_batch(batch(3))
+
+    assert [r["success"] for r in results] == [True, True, False]
+    assert results[2]["retryable"]
+    assert "No result from SMSC" in results[2]["error"]
+
+
+async def test_recipient_errors_are_not_retried(smsc):
+    smsc["respond"] = lambda phones: [
+        {"phone": p, "status": "0", **({"error": "invalid number"} if i == 0 else {})}
+        for i, p in enumerate(phones)
+    ]
+
+    results = await SMSService().send_sms_batch(batch(2))
+
+    assert [r["success"] for r in results] == [False, True]
+    assert not results[0]["retryable"]
@@ -0,0 +1,100 @@
+"""Tenant resolver caching and invalidation on tenant changes."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 (configures mappers)
+from app.models.tenant import Tenant
+from app.services import tenant_service
+from app.services.tenant_service import REDIS_KEY_BY_ID, TenantResolver
+
+
+@pytest.fixture
+def session_maker(event_loop, monkeypatch):
+    """SQLite database with the tenants table, used by the resolver."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Tenant.__table__.create(sync_conn))
+
+    event_loop.run_until_complete(create())
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(tenant_service, "async_session_maker", maker)
+    yield maker
+    event_loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    resolver = TenantResolver()
+    monkeypatch.setattr(tenant_service, "tenant_resolver", resolver)
+    return resolver
+
+
+async def add_tenant(session_maker, **values) -> Tenant:
+    async with session_maker() as session:
+        tenant = Tenant(name="Acme", slug="acme", **values)
+        session.add(tenant)
+        await session.commit()
+        return tenant
+
+
+async def invalidations_done() -> None:
+    await asyncio.gather(*tenant_service._pending_invalidations)
+
+
+async def test_resolves_through_cache_tiers(redis, session_maker, resolver):
+    tenant = await add_tenant(session_maker)
+
+    context = await resolver.get_by_id(tenant.id)
+
+    assert context.slug == "acme"
+    assert await redis.get(REDIS_KEY_BY_ID.format(tenant.id)) is not None
+    assert resolver.local.get(("id", tenant.id)) == context
+
+
+async def test_unknown_tenant_is_cached_as_missing(redis, session_maker, resolver):
+    assert await resolver.get_by_id(404) is None
+    assert await redis.get(REDIS_KEY_BY_ID.format(404)) == "missing"
+
+
+async def test_committed_change_invalidates_cache(redis, session_maker, resolver):
+    tenant = await add_tenant(session_maker)
+    assert (await resolver.get_by_id(tenant.id)).is_active
+
+    async with session_maker() as session:
+        (await session.get(Tenant, tenant.id)).is_active = False
+        await session.commit()
+    await invalidations_done()
+
+    assert await redis.get(REDIS_KEY_BY_ID.format(tenant.id)) is None
+    assert not (await resolver.get_by_id(tenant.id)).is_active
+
+
+async def test_rotated_public_key_stops_resolving(redis, session_maker, resolver):
+    tenant = await add_tenant(session_maker, public_key="pk_old")
+    assert await resolver.get_by_public_key("pk_old") is not None
+
+    async with session_maker() as session:
+        (await session.get(Tenant, tenant.id)).public_key = "pk_new"
+        await session.commit()
+    await invalidations_done()
+
+    assert await resolver.get_by_public_key("pk_old") is None
+    assert (await resolver.get_by_public_key("pk_new")).id == tenant.id
+
+
+async def test_rolled_back_change_keeps_cache(redis, session_maker, resolver):
+    tenant = await add_tenant(session_maker)
+    await resolver.get_by_id(tenant.id)
+
+    async with session_maker() as session:
+        (await session.get(Tenant, tenant.id)).is_active = False
+        await session.flush()
+        await session.rollback()
+
+    assert not tenant_service._pending_invalidations
+    assert resolver.local.get(("id", tenant.id)) is not None
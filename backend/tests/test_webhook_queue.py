@@ -0,0 +1,164 @@
+"""Webhook streams: ordered consumption, retries, dead letters and leases."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.config import settings
+from app.services import webhook_queue as queue_module
+from app.services.webhook_queue import DLQ_KEY, GROUP, LEASE_KEY, STREAM_KEY, WebhookQueue
+
+STREAM = STREAM_KEY.format(0)
+LEASE = LEASE_KEY.format(0)
+
+
+class Handler:
+    """Webhook handler recording events, failing the first ``failures`` calls."""
+
+    def __init__(self, failures: int = 0, delay: float = 0):
+        self.failures = failures
+        self.delay = delay
+        self.events = []
+        self.cancelled = False
+
+    async def __call__(self, db, payload):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is down")
+        self.events.append(payload)
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = Handler()
+
+    @asynccontextmanager
+    async def session_maker():
+        yield None
+
+    monkeypatch.setattr(queue_module, "WEBHOOK_HANDLERS", {"test": handler})
+    monkeypatch.setattr(queue_module, "async_session_maker", session_maker)
+    return handler
+
+
+@pytest.fixture
+def queue(redis, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_queue_enabled", True)
+    monkeypatch.setattr(settings, "webhook_stream_partitions", 1)
+    monkeypatch.setattr(settings, "webhook_max_attempts", 3)
+    monkeypatch.setattr(settings, "webhook_retry_backoff", 0.01)
+    monkeypatch.setattr(settings, "redis_socket_timeout", 0.2)
+    return WebhookQueue()
+
+
+async def publish(queue: WebhookQueue, *numbers: int) -> None:
+    for number in numbers:
+        assert await queue.publish("test", "booking-1", json.dumps({"n": number}))
+
+
+async def consume_until(queue: WebhookQueue, condition, timeout: float = 3) -> None:
+    """Consume partition 0 until ``condition()`` holds, then stop the consumer."""
+    stop_event = asyncio.Event()
+    consumer = asyncio.create_task(queue._consume(0, stop_event))
+    deadline = asyncio.get_running_loop().time() + timeout
+    try:
+        while not condition():
+            if asyncio.get_running_loop().time() > deadline:
+                raise asyncio.TimeoutError
+            await asyncio.sleep(0.01)
+    finally:
+        stop_event.set()
+        await asyncio.wait_for(consumer, timeout)
+
+
+async def test_events_are_applied_in_order_and_removed(queue, handler, redis):
+    await publish(queue, 1, 2, 3)
+
+    await consume_until(queue, lambda: len(handler.events) == 3)
+
+    assert handler.events == [{"n": 1}, {"n": 2}, {"n": 3}]
+    assert await redis.xlen(STREAM) == 0
+    assert (await redis.xpending(STREAM, GROUP))["pending"] == 0
+    # Lease handed over on stop
+    assert not await redis.exists(LEASE)
+
+
+async def test_failed_event_is_retried_in_place(queue, handler):
+    handler.failures = 2
+    await publish(queue, 1, 2)
+
+    await consume_until(queue, lambda: len(handler.events) == 2)
+
+    assert handler.events == [{"n": 1}, {"n": 2}]
+
+
+async def test_event_failing_all_attempts_is_dead_lettered(queue, handler, redis):
+    handler.failures = 3
+    await publish(queue, 1, 2)
+
+    await consume_until(queue, lambda: len(handler.events) == 1)
+
+    assert handler.events == [{"n": 2}]
+    [(_, dead)] = await queue.get_dead_letters()
+    assert json.loads(dead["body"]) == {"n": 1}
+    assert dead["error"] == "database is down"
+    assert dead["attempts"] == "3"
+
+    assert await queue.replay_dead_letters() == 1
+    assert await redis.xlen(DLQ_KEY) == 0
+    await consume_until(queue, lambda: len(handler.events) == 2)
+    assert handler.events[-1] == {"n": 1}
+
+
+async def test_new_owner_applies_unacknowledged_events(queue, handler, redis):
+    await publish(queue, 1, 2)
+    # A previous owner read the events and stopped before acknowledging
+    await queue._ensure_group(STREAM)
+    await redis.xreadgroup(GROUP, "p0", {STREAM: ">"}, count=10)
+
+    await consume_until(queue, lambda: len(handler.events) == 2)
+
+    assert handler.events == [{"n": 1}, {"n": 2}]
+
+
+async def test_partition_leased_by_another_consumer_is_skipped(queue, handler, redis):
+    await redis.set(LEASE, "other", px=10_000)
+    await publish(queue, 1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await consume_until(queue, lambda: handler.events, timeout=0.3)
+
+    assert handler.events == []
+    assert await redis.get(LEASE) == "other"
+
+
+async def test_handler_is_cancelled_when_lease_is_lost(queue, handler, redis, monkeypatch):
+    monkeypatch.setattr(queue_module, "LEASE_TTL", 0.3)
+    handler.delay = 5
+    await redis.set(LEASE, "ours", px=300)
+
+    apply = asyncio.create_task(queue._apply(handler, "{}", LEASE, "ours"))
+    await asyncio.sleep(0.2)
+    # Lease renewed while the handler runs
+    assert await redis.pttl(LEASE) > 150
+
+    await redis.set(LEASE, "other")
+
+    assert await asyncio.wait_for(apply, 1) is False
+    assert handler.cancelled
+
+
+async def test_publish_reports_unavailable_queue(queue, monkeypatch):
+    def unavailable():
+        raise ConnectionError("Redis down")
+
+    monkeypatch.setattr(queue_module, "get_redis", unavailable)
+
+    assert await queue.publish("test", "booking-1", "{}") is False